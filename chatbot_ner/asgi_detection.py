@@ -0,0 +1,29 @@
+"""
+ASGI config for detection only deployments of chatbot_ner.
+
+It exposes the ASGI callable as a module-level variable named ``application``. Detection views run on a bounded thread
+pool (`chatbot_ner/executor.py`) and literal paths are dispatched through a route table (`chatbot_ner/route_table.py`).
+Use it together with the ASGI settings and an ASGI server, e.g.
+
+    DJANGO_SETTINGS_MODULE=chatbot_ner.settings_asgi uvicorn chatbot_ner.asgi_detection:application ...
+
+See `docker/supervisord_asgi.conf`.
+"""
+
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatbot_ner.settings_asgi')
+
+django.setup(set_prefix=False)
+
+from chatbot_ner.route_table import RouteTableASGIHandler  # noqa: E402
+
+application = RouteTableASGIHandler()
+
+# Load configured heavy resources now. uvicorn starts its workers with `spawn`, so each worker loads them itself at
+# start up instead of on its first requests
+from chatbot_ner.warmup import prefork_warm_up  # noqa: E402
+
+prefork_warm_up()
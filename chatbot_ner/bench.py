@@ -0,0 +1,270 @@
+"""
+Benchmarks for the detectors, replaying the test corpora (`ner_v2/tests/**/*_ner_tests.yaml` and the person name csv)
+per detector and language.
+
+Each message is detected the way the API does it, a new detector is created for every message. For every
+(suite, language) the harness reports latency percentiles, throughput and the peak memory allocated while detecting
+(measured in a separate pass with `tracemalloc`, which slows python down). Results are plain dicts so they can be
+written as JSON and compared against a stored baseline with `find_regressions`. Relative dates and times are
+resolved against the fixed `BENCH_NOW` so that runs detect the same values.
+
+Run with `python manage.py bench`, see `ner_v2/management/commands/bench.py`.
+"""
+
+import collections
+import csv
+import datetime
+import io
+import math
+import os
+import platform
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+from chatbot_ner.config import ner_logger
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "now" of the clock date and time detectors run with
+BENCH_NOW = datetime.datetime(2020, 1, 15, 10, 30)
+
+# Metrics compared by find_regressions, metric name -> True if larger values are better
+COMPARED_METRICS = collections.OrderedDict([('p50_ms', False), ('p95_ms', False), ('msgs_per_sec', True)])
+
+BenchCase = collections.namedtuple('BenchCase', ['language', 'message', 'params'])
+
+
+def _load_yaml_cases(relative_path: str, params: Iterable[str] = ()) -> List[BenchCase]:
+    with io.open(os.path.join(BASE_DIR, relative_path), 'r', encoding='utf-8') as f:
+        test_data = yaml.load(f, Loader=yaml.SafeLoader)
+    args = test_data.get('args') or {}
+    cases = []
+    for language, testcases in test_data['tests'].items():
+        for testcase in testcases:
+            case_params = dict(args)
+            case_params.update({param: testcase.get(param) for param in params})
+            cases.append(BenchCase(language=language, message=testcase['message'], params=case_params))
+    return cases
+
+
+def _load_person_name_cases() -> List[BenchCase]:
+    csv_path = os.path.join(BASE_DIR, 'ner_v1', 'detectors', 'textual', 'name', 'tests', 'test_cases_person_name.csv')
+    with io.open(csv_path, 'r', encoding='utf-8') as f:
+        return [BenchCase(language=row['language'], message=row['message'],
+                          params={'bot_message': row['bot_message']})
+                for row in csv.DictReader(f)]
+
+
+def _detect_number(case: BenchCase) -> Any:
+    from ner_v2.detectors.numeral.number.number_detection import NumberDetector
+    detector = NumberDetector(entity_name='number', language=case.language, unit_type=case.params.get('unit_type'))
+    return detector.detect_entity(case.message)
+
+
+def _detect_number_range(case: BenchCase) -> Any:
+    from ner_v2.detectors.numeral.number_range.number_range_detection import NumberRangeDetector
+    detector = NumberRangeDetector(entity_name='number_range', language=case.language,
+                                   unit_type=case.params.get('unit_type'))
+    return detector.detect_entity(case.message)
+
+
+def _detect_time(case: BenchCase) -> Any:
+    from ner_v2.detectors.temporal.time.time_detection import TimeDetector
+    from ner_v2.detectors.temporal.utils import Clock
+    clock = Clock(timezone=case.params.get('timezone') or 'UTC', now=BENCH_NOW)
+    detector = TimeDetector(entity_name='time', language=case.language, clock=clock)
+    return detector.detect_entity(case.message, range_enabled=bool(case.params.get('range_enabled')))
+
+
+def _detect_phone_number(case: BenchCase) -> Any:
+    from ner_v2.detectors.pattern.phone_number.phone_number_detection import PhoneDetector
+    detector = PhoneDetector(entity_name='phone_number', language=case.language, locale=case.params.get('locale'))
+    return detector.detect_entity(case.message)
+
+
+def _detect_person_name(case: BenchCase) -> Any:
+    from ner_v1.detectors.textual.name.name_detection import NameDetector
+    detector = NameDetector(entity_name='person_name', language=case.language)
+    return detector.detect_entity(text=case.message, bot_message=case.params.get('bot_message'))
+
+
+BenchSuite = collections.namedtuple('BenchSuite', ['load_cases', 'detect'])
+
+BENCH_SUITES: Dict[str, BenchSuite] = collections.OrderedDict([
+    ('number', BenchSuite(lambda: _load_yaml_cases('ner_v2/tests/numeral/number/en/number_ner_tests.yaml',
+                                                   params=['unit_type']), _detect_number)),
+    ('number_range', BenchSuite(lambda: _load_yaml_cases('ner_v2/tests/numeral/number_range/'
+                                                         'number_range_ner_tests.yaml', params=['unit_type']),
+                                _detect_number_range)),
+    ('time', BenchSuite(lambda: _load_yaml_cases('ner_v2/tests/temporal/time/time_ner_tests.yaml',
+                                                 params=['range_enabled']), _detect_time)),
+    ('phone_number', BenchSuite(lambda: _load_yaml_cases('ner_v2/tests/pattern/phone_number/'
+                                                         'phone_number_ner_tests.yaml', params=['locale']),
+                                _detect_phone_number)),
+    ('person_name', BenchSuite(_load_person_name_cases, _detect_person_name)),
+])
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """
+    Nearest rank percentile
+
+    Args:
+        sorted_values (List[float]): values sorted in ascending order, must not be empty
+        fraction (float): percentile as a fraction, e.g. 0.95
+
+    Returns:
+        float: smallest value such that at least `fraction` of the values are less than or equal to it
+    """
+    rank = max(int(math.ceil(fraction * len(sorted_values))), 1)
+    return sorted_values[rank - 1]
+
+
+def _run_cases(detect: Callable[[BenchCase], Any], cases: List[BenchCase]) -> Tuple[List[float], List[str]]:
+    latencies, errors = [], []
+    for case in cases:
+        start_time = time.perf_counter()
+        try:
+            detect(case)
+        except Exception as e:
+            errors.append(f'{type(e).__name__}: {e}')
+        latencies.append(time.perf_counter() - start_time)
+    return latencies, errors
+
+
+def bench_cases(detect: Callable[[BenchCase], Any], cases: List[BenchCase], repeat: int = 5,
+                measure_memory: bool = True) -> Dict[str, Any]:
+    """
+    Benchmark detection of cases. All cases are detected once to warm up, then `repeat` times while timing each
+    detection and, if `measure_memory`, once more while tracing memory allocations
+
+    Args:
+        detect (Callable[[BenchCase], Any]): detects entities in one case
+        cases (List[BenchCase]): cases to detect, must not be empty
+        repeat (int): number of timed passes over the cases
+        measure_memory (bool): whether to measure peak memory
+
+    Returns:
+        Dict[str, Any]: `messages`, `iterations`, `errors` (failed detections per pass), `error` (first error
+            message, if any), `p50_ms`, `p95_ms`, `p99_ms`, `mean_ms`, `msgs_per_sec` and `peak_memory_kb` (None if
+            not measured)
+    """
+    _, errors = _run_cases(detect, cases)
+
+    latencies = []
+    for _ in range(repeat):
+        latencies.extend(_run_cases(detect, cases)[0])
+
+    peak_memory_kb = None
+    if measure_memory:
+        tracemalloc.start()
+        try:
+            _run_cases(detect, cases)
+            peak_memory_kb = tracemalloc.get_traced_memory()[1] // 1024
+        finally:
+            tracemalloc.stop()
+
+    total_seconds = sum(latencies)
+    sorted_latencies = sorted(latencies)
+    return collections.OrderedDict([
+        ('messages', len(cases)),
+        ('iterations', repeat),
+        ('errors', len(errors)),
+        ('error', errors[0] if errors else None),
+        ('p50_ms', percentile(sorted_latencies, 0.50) * 1000),
+        ('p95_ms', percentile(sorted_latencies, 0.95) * 1000),
+        ('p99_ms', percentile(sorted_latencies, 0.99) * 1000),
+        ('mean_ms', total_seconds / len(latencies) * 1000),
+        ('msgs_per_sec', len(latencies) / total_seconds if total_seconds else None),
+        ('peak_memory_kb', peak_memory_kb),
+    ])
+
+
+def run_benchmarks(suites: Optional[Iterable[str]] = None, languages: Optional[Iterable[str]] = None,
+                   repeat: int = 5, limit: Optional[int] = None, measure_memory: bool = True) -> Dict[str, Any]:
+    """
+    Benchmark suites per language
+
+    Args:
+        suites (Optional[Iterable[str]]): names of suites to run, keys of `BENCH_SUITES`. Defaults to all suites
+        languages (Optional[Iterable[str]]): only benchmark cases in these languages. Defaults to all languages
+        repeat (int): number of timed passes over the cases, see `bench_cases`
+        limit (Optional[int]): benchmark at most this many cases per suite and language
+        measure_memory (bool): whether to measure peak memory, see `bench_cases`
+
+    Returns:
+        Dict[str, Any]: `meta` (python version, time and arguments of the run) and `results`, one dict per suite and
+            language with `suite`, `language` and the metrics returned by `bench_cases`
+
+    Raises:
+        KeyError: if an unknown suite name is given
+    """
+    suites = list(suites or BENCH_SUITES)
+    results = []
+    for suite_name in suites:
+        suite = BENCH_SUITES[suite_name]
+        cases_by_language = collections.OrderedDict()
+        for case in suite.load_cases():
+            if languages and case.language not in languages:
+                continue
+            cases_by_language.setdefault(case.language, []).append(case)
+
+        for language, cases in cases_by_language.items():
+            cases = cases[:limit] if limit else cases
+            result = collections.OrderedDict([('suite', suite_name), ('language', language)])
+            result.update(bench_cases(suite.detect, cases, repeat=repeat, measure_memory=measure_memory))
+            if result['errors']:
+                ner_logger.warning(f'[bench] {result["errors"]} of {len(cases)} {suite_name} ({language}) messages '
+                                   f'failed, first error: {result["error"]}')
+            results.append(result)
+
+    return collections.OrderedDict([
+        ('meta', collections.OrderedDict([
+            ('python', platform.python_version()),
+            ('timestamp', datetime.datetime.utcnow().isoformat()),
+            ('suites', suites),
+            ('languages', list(languages) if languages else None),
+            ('repeat', repeat),
+            ('limit', limit),
+        ])),
+        ('results', results),
+    ])
+
+
+def find_regressions(baseline: Dict[str, Any], current: Dict[str, Any],
+                     max_regression: float = 0.2) -> List[Dict[str, Any]]:
+    """
+    Compare benchmark results against a baseline run. Suites and languages missing from either run are ignored
+
+    Args:
+        baseline (Dict[str, Any]): output of `run_benchmarks` to compare against
+        current (Dict[str, Any]): output of `run_benchmarks` to check
+        max_regression (float): allowed relative change for the worse of each metric in `COMPARED_METRICS`,
+            e.g. 0.2 allows p50 latency to grow by 20%
+
+    Returns:
+        List[Dict[str, Any]]: one dict per regressed metric with `suite`, `language`, `metric`, `baseline`, `current`
+            and `change` (relative change, positive when worse)
+    """
+    baseline_results = {(result['suite'], result['language']): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        baseline_result = baseline_results.get((result['suite'], result['language']))
+        if baseline_result is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            baseline_value, current_value = baseline_result.get(metric), result.get(metric)
+            if not baseline_value or current_value is None:
+                continue
+            change = (current_value - baseline_value) / baseline_value
+            if higher_is_better:
+                change = -change
+            if change > max_regression:
+                regressions.append(collections.OrderedDict([
+                    ('suite', result['suite']), ('language', result['language']), ('metric', metric),
+                    ('baseline', baseline_value), ('current', current_value), ('change', change),
+                ]))
+    return regressions
@@ -22,6 +22,31 @@ ES_AUTH_PASSWORD = os.environ.get('ES_AUTH_PASSWORD')
 ES_BULK_MSG_SIZE = int((os.environ.get('ES_BULK_MSG_SIZE') or '').strip() or '1000')
 ES_SEARCH_SIZE = int((os.environ.get('ES_SEARCH_SIZE') or '').strip() or '1000')
 ES_REQUEST_TIMEOUT = int((os.environ.get('ES_REQUEST_TIMEOUT') or '').strip() or '20')
+ES_DELETE_BY_QUERY_SLICES = int((os.environ.get('ES_DELETE_BY_QUERY_SLICES') or '').strip() or '5')
+# Share one in flight ES query between concurrent identical text lookups of a worker, see datastore/single_flight.py
+ES_SINGLE_FLIGHT = (os.environ.get('ES_SINGLE_FLIGHT') or 'true').strip().lower() in ('true', '1', 'yes')
+# Merge the msearch requests of concurrent v2 text detections of a worker: max milliseconds a request waits for others
+# to join its msearch (0 disables batching) and max queries per msearch,
+# see ner_v2/detectors/textual/msearch_batching.py
+ES_MSEARCH_BATCH_WAIT_MS = float((os.environ.get('ES_MSEARCH_BATCH_WAIT_MS') or '').strip() or '0')
+ES_MSEARCH_BATCH_MAX_QUERIES = int((os.environ.get('ES_MSEARCH_BATCH_MAX_QUERIES') or '').strip() or '200')
+# Circuit breaker of the ES text lookups, see datastore/circuit_breaker.py. It opens for ES_BREAKER_OPEN_SECONDS when
+# at least ES_BREAKER_MIN_CALLS queries ran in the last ES_BREAKER_WINDOW_SECONDS and ES_BREAKER_FAILURE_RATIO of them
+# failed or took ES_BREAKER_SLOW_CALL_SECONDS or longer
+ES_BREAKER_ENABLED = (os.environ.get('ES_BREAKER_ENABLED') or 'true').strip().lower() in ('true', '1', 'yes')
+ES_BREAKER_WINDOW_SECONDS = int((os.environ.get('ES_BREAKER_WINDOW_SECONDS') or '').strip() or '30')
+ES_BREAKER_MIN_CALLS = int((os.environ.get('ES_BREAKER_MIN_CALLS') or '').strip() or '20')
+ES_BREAKER_FAILURE_RATIO = float((os.environ.get('ES_BREAKER_FAILURE_RATIO') or '').strip() or '0.5')
+ES_BREAKER_SLOW_CALL_SECONDS = float((os.environ.get('ES_BREAKER_SLOW_CALL_SECONDS') or '').strip() or '5')
+ES_BREAKER_OPEN_SECONDS = float((os.environ.get('ES_BREAKER_OPEN_SECONDS') or '').strip() or '30')
+# Connections kept open per ES node by the shared clients, see datastore/elastic_search/transport.py. Should be at
+# least the number of threads of a worker that query ES
+ES_POOL_MAXSIZE = int((os.environ.get('ES_POOL_MAXSIZE') or '').strip() or '10')
+# Send ES request bodies of at least this many bytes (large msearch bodies) gzip compressed, 0 disables compression
+ES_COMPRESS_MIN_BYTES = int((os.environ.get('ES_COMPRESS_MIN_BYTES') or '').strip() or '0')
+# Fetch the normalized variants stored with the entity data (see `python manage.py backfill_normalized_variants`) with
+# text lookups, so that detectors don't tokenize the variants in the results
+ES_NORMALIZED_VARIANTS = (os.environ.get('ES_NORMALIZED_VARIANTS') or 'false').strip().lower() in ('true', '1', 'yes')
 
 ELASTICSEARCH_CRF_DATA_INDEX_NAME = os.environ.get('ELASTICSEARCH_CRF_DATA_INDEX_NAME')
 ELASTICSEARCH_CRF_DATA_DOC_TYPE = os.environ.get('ELASTICSEARCH_CRF_DATA_DOC_TYPE')
@@ -99,3 +124,36 @@ GOOGLE_TRANSLATE_API_KEY = os.environ.get('GOOGLE_TRANSLATE_API_KEY')
 if not GOOGLE_TRANSLATE_API_KEY:
     ner_logger.warning('Google Translate API key is null or not set')
     GOOGLE_TRANSLATE_API_KEY = ''
+
+# Comma separated names of lazily loaded NLP resources to load while the application is being loaded,
+# see chatbot_ner/warmup.py for valid names
+NER_WARMUP_COMPONENTS = [component.strip() for component in (os.environ.get('NER_WARMUP_COMPONENTS') or '').split(',')
+                         if component.strip()]
+# Move objects alive after warm up to the permanent gc generation so that gc passes in forked workers don't write to
+# (and hence copy) the memory pages shared with the master. Needs python 3.7+
+NER_WARMUP_GC_FREEZE = (os.environ.get('NER_WARMUP_GC_FREEZE') or 'true').strip().lower() in ('true', '1', 'yes')
+# Comma separated language codes whose detector language modules the `language_modules` warm up component resolves,
+# empty for all languages with language data
+NER_WARMUP_LANGUAGES = [language.strip() for language in (os.environ.get('NER_WARMUP_LANGUAGES') or '').split(',')
+                        if language.strip()]
+# Number of worker processes used to detect phone numbers in large bulk requests, 1 disables the process pool
+PHONE_BULK_PROCESSES = int((os.environ.get('PHONE_BULK_PROCESSES') or '').strip() or '1')
+# Bulk requests with fewer messages (that may contain a phone number) than this are processed in the request process
+PHONE_BULK_PROCESS_MIN_MESSAGES = int((os.environ.get('PHONE_BULK_PROCESS_MIN_MESSAGES') or '').strip() or '2000')
+# Processes spacy uses to pos tag the messages of bulk person name requests (1 tags them in the request process)
+SPACY_BULK_PROCESSES = int((os.environ.get('SPACY_BULK_PROCESSES') or '').strip() or '1')
+# Fraction of requests whose payloads (messages, entity data, detection output) are logged on hot paths, the logger
+# level applies on top of it, see chatbot_ner/payload_logging.py
+NER_LOG_SAMPLE_RATE = float((os.environ.get('NER_LOG_SAMPLE_RATE') or '').strip() or '1.0')
+# Logged payloads are cut to this many characters, 0 to log them in full
+NER_LOG_PAYLOAD_MAX_CHARS = int((os.environ.get('NER_LOG_PAYLOAD_MAX_CHARS') or '').strip() or '5000')
+# Comma separated entity names whose payloads and datastore results are always logged in full at info level
+NER_LOG_DEBUG_ENTITIES = [entity_name.strip() for entity_name in
+                          ((os.environ.get('NER_LOG_DEBUG_ENTITIES') or '').strip()
+                           or 'nsdc_language_select,nsdc_choose_topik,test_giftcard_user_amount,'
+                              'pvr_giftcard_user_amount').split(',')
+                          if entity_name.strip()]
+# Threads that run detection views of ASGI deployments, and max number of requests waiting for one of them (further
+# requests get a 503), see chatbot_ner/executor.py
+NER_ASYNC_MAX_WORKERS = int((os.environ.get('NER_ASYNC_MAX_WORKERS') or '').strip() or '8')
+NER_ASYNC_MAX_QUEUE = int((os.environ.get('NER_ASYNC_MAX_QUEUE') or '').strip() or '64')
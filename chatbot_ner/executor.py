@@ -0,0 +1,173 @@
+"""
+Bounded thread pool for detection work of async views (ASGI deployments, see `chatbot_ner/asgi_detection.py`).
+
+Detectors and the Elasticsearch client are synchronous. Under ASGI, Django runs synchronous views one at a time per
+process (`sync_to_async` with `thread_sensitive=True`), so a slow datastore call blocks every other request of the
+process. `async_view` turns a synchronous detection view into an async one that runs it on `detection_executor`, a
+thread pool of `NER_ASYNC_MAX_WORKERS` threads. At most `NER_ASYNC_MAX_QUEUE` calls wait for a free thread, requests
+beyond that are answered with 503 right away instead of piling up in the event loop.
+
+`BoundedExecutor.stats` reports the queue depth, busy threads and the time calls waited for a thread, see
+`executor_stats` for the API.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from django.http import JsonResponse
+
+from chatbot_ner.config import ner_logger, NER_ASYNC_MAX_QUEUE, NER_ASYNC_MAX_WORKERS
+from chatbot_ner.setup_logs import bind_request_context
+
+
+class ExecutorQueueFullException(Exception):
+    """
+    Raised when a call is submitted to a `BoundedExecutor` whose queue is full
+    """
+    pass
+
+
+class BoundedExecutor(object):
+    """
+    Thread pool with a bounded queue of waiting calls, and metrics of the queue depth
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, thread_name_prefix: str = ''):
+        """
+        Args:
+            max_workers (int): number of threads
+            max_queue (int): max number of calls waiting for a thread, further calls are rejected
+            thread_name_prefix (str): prefix of the thread names
+        """
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._max_queued = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    def _call(self, submitted_at: float, func: Callable, *args, **kwargs) -> Any:
+        waited = time.monotonic() - submitted_at
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_seconds += waited
+            self._max_wait_seconds = max(self._max_wait_seconds, waited)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+
+    async def run(self, func: Callable, *args, **kwargs) -> Any:
+        """
+        Run a function on a thread of the pool and wait for its result without blocking the event loop
+
+        Args:
+            func (Callable): function to run
+            *args: positional arguments of `func`
+            **kwargs: keyword arguments of `func`
+
+        Returns:
+            Any: return value of `func`
+
+        Raises:
+            ExecutorQueueFullException: if `max_queue` calls are already waiting for a thread
+        """
+        with self._lock:
+            in_flight = self._queued + self._running
+            if in_flight >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise ExecutorQueueFullException(f'{in_flight - self.max_workers} calls are waiting for a '
+                                                 f'detection thread')
+            self._queued += 1
+            self._max_queued = max(self._max_queued, in_flight + 1 - self.max_workers)
+        call = functools.partial(self._call, time.monotonic(), func, *args, **kwargs)
+        # get_running_loop is python 3.7+, within a coroutine get_event_loop returns the running loop
+        return await asyncio.get_event_loop().run_in_executor(self._executor, call)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Current state and counters of the executor
+
+        Returns:
+            Dict[str, Any]: with keys
+                max_workers, max_queue: configured sizes
+                running: calls running on a thread
+                queued: calls waiting for a thread
+                max_queued: most calls that waited for a thread at the same time
+                completed: finished calls
+                rejected: calls rejected because the queue was full
+                avg_wait_ms, max_wait_ms: time calls waited for a thread, average and max
+        """
+        with self._lock:
+            started = self._completed + self._running
+            return {
+                'max_workers': self.max_workers,
+                'max_queue': self.max_queue,
+                'running': self._running,
+                'queued': self._queued,
+                'max_queued': self._max_queued,
+                'completed': self._completed,
+                'rejected': self._rejected,
+                'avg_wait_ms': round(self._wait_seconds * 1000 / started, 3) if started else 0.0,
+                'max_wait_ms': round(self._max_wait_seconds * 1000, 3),
+            }
+
+
+detection_executor = BoundedExecutor(max_workers=NER_ASYNC_MAX_WORKERS, max_queue=NER_ASYNC_MAX_QUEUE,
+                                     thread_name_prefix='ner-detection')
+
+
+def _run_view(view: Callable, request, *args, **kwargs) -> Any:
+    # the logger context is thread local, bind the request id on the executor thread that runs the view
+    with bind_request_context(request):
+        return view(request, *args, **kwargs)
+
+
+def async_view(view: Callable, executor: BoundedExecutor = detection_executor) -> Callable:
+    """
+    Make an async view that runs a synchronous view on a bounded executor, with the request id bound to the logger
+    context of the executor thread. Responds with 503 if the queue of the executor is full. The view keeps its
+    `csrf_exempt` mark (`django.views.decorators.csrf.csrf_exempt` would make the async view synchronous again)
+
+    Args:
+        view (Callable): synchronous view function
+        executor (BoundedExecutor): executor to run the view on
+
+    Returns:
+        Callable: async view function
+    """
+
+    @functools.wraps(view)
+    async def wrapped_view(request, *args, **kwargs):
+        try:
+            return await executor.run(_run_view, view, request, *args, **kwargs)
+        except ExecutorQueueFullException as err:
+            ner_logger.warning(f'Rejected {request.path}, error: {err}')
+            return JsonResponse({'success': False, 'error': str(err)}, status=503)
+
+    return wrapped_view
+
+
+async def executor_stats(request):
+    """
+    Queue depth and counters of the detection executor, see `BoundedExecutor.stats`
+
+    Args:
+        request (django.http.request.HttpRequest): HttpRequest object
+
+    Returns:
+        response (django.http.response.JsonResponse): JsonResponse with the stats as `data`
+    """
+    return JsonResponse({'success': True, 'error': None, 'data': detection_executor.stats()}, status=200)
@@ -0,0 +1,140 @@
+"""
+Logging of request payloads (messages, entity data, detection output, datastore results) on hot paths.
+
+Formatting a payload of a bulk request into a log line costs more than many detections, and most deployments run
+with the `chatbot_ner` logger at warning level where the line is dropped right after it was formatted. `PayloadLogger`
+checks the level first and formats lazily, only for lines that are emitted:
+
+    - level guard: nothing is formatted when the level is disabled for the logger
+    - sampling: only a fraction (`NER_LOG_SAMPLE_RATE`) of requests log their payloads. The decision is a hash of the
+      request id bound to the logger context (or of an explicit key), so a request logs all of its payloads or none.
+      The request id is bound by django_structlog's RequestMiddleware, or by `setup_logs.bind_request_context` in the
+      detection only WSGI handler and on the threads of the ASGI detection executor. Calls outside of a request are
+      sampled one by one
+    - truncation: payloads are cut to `NER_LOG_PAYLOAD_MAX_CHARS` characters
+    - debug allow-list: payloads of requests for the entities in `NER_LOG_DEBUG_ENTITIES` are logged in full at info
+      level, whatever the sample rate, see `PayloadLogger.debug_entities_in`
+
+Payloads are logged as the `payload` key of the structured log event.
+"""
+
+import itertools
+import logging
+import zlib
+from typing import Any, Iterable, Optional
+
+import structlog
+
+from chatbot_ner.config import (ner_logger, NER_LOG_DEBUG_ENTITIES, NER_LOG_PAYLOAD_MAX_CHARS,
+                                NER_LOG_SAMPLE_RATE)
+
+_SAMPLE_BUCKETS = 10000
+
+
+class PayloadLogger(object):
+    """
+    Level guarded, sampled and truncated logging of payloads, see module docstring
+    """
+
+    def __init__(self, logger: Any, logger_name: str, sample_rate: float = 1.0, max_chars: Optional[int] = None,
+                 debug_entities: Iterable[str] = ()):
+        """
+        Args:
+            logger (Any): structlog logger to emit with
+            logger_name (str): name of the stdlib logger behind `logger`, used for the level guard
+            sample_rate (float): fraction of requests whose payloads are logged, between 0 and 1
+            max_chars (int, optional): payloads are cut to this many characters, None to never cut
+            debug_entities (Iterable[str]): names of entities whose payloads are always logged in full
+        """
+        self.logger = logger
+        self.stdlib_logger = logging.getLogger(logger_name)
+        self.sample_rate = sample_rate
+        self.max_chars = max_chars
+        self.debug_entities = frozenset(debug_entities)
+        self._unkeyed_calls = itertools.count()
+
+    def _request_id(self) -> Optional[str]:
+        try:
+            return structlog.get_context(self.logger.bind()).get('request_id')
+        except Exception:
+            return None
+
+    def is_sampled(self, sample_key: Optional[Any] = None) -> bool:
+        """
+        Whether payloads of the current request are logged at the sample rate
+
+        Args:
+            sample_key (Any, optional): key to sample on, defaults to the request id bound to the logger context.
+                Without either every n-th call is sampled
+
+        Returns:
+            bool: True if payloads should be logged
+        """
+        if self.sample_rate >= 1:
+            return True
+        if self.sample_rate <= 0:
+            return False
+        if sample_key is None:
+            sample_key = self._request_id()
+        if sample_key is None:
+            sample_key = next(self._unkeyed_calls)
+        bucket = zlib.crc32(str(sample_key).encode('utf-8')) % _SAMPLE_BUCKETS
+        return bucket < self.sample_rate * _SAMPLE_BUCKETS
+
+    def truncate(self, payload: Any, max_chars: Optional[int] = None) -> str:
+        """
+        Format a payload for logging
+
+        Args:
+            payload (Any): payload to format with `str`
+            max_chars (int, optional): max characters to keep, defaults to the configured max
+
+        Returns:
+            str: formatted payload, cut with a note of the full length if it is longer than `max_chars`
+        """
+        max_chars = self.max_chars if max_chars is None else max_chars
+        text = str(payload)
+        if max_chars is not None and len(text) > max_chars:
+            return f'{text[:max_chars]}... ({len(text)} chars)'
+        return text
+
+    def debug_entities_in(self, entity_names: Iterable[str]) -> bool:
+        """
+        Whether any of the entities is on the debug allow-list
+
+        Args:
+            entity_names (Iterable[str]): entity names of the request
+
+        Returns:
+            bool: True if payloads should be logged in full
+        """
+        return bool(self.debug_entities) and not self.debug_entities.isdisjoint(entity_names)
+
+    def log(self, level: int, event: str, payload: Any, sample_key: Optional[Any] = None,
+            full: bool = False) -> None:
+        """
+        Log a payload if the level is enabled and the request is sampled
+
+        Args:
+            level (int): stdlib log level
+            event (str): log event
+            payload (Any): payload to log, formatted only if the line is emitted
+            sample_key (Any, optional): key to sample on, see `is_sampled`
+            full (bool): log without sampling and truncation, e.g. for allow-listed entities
+        """
+        if not self.stdlib_logger.isEnabledFor(level):
+            return
+        if full:
+            self.logger.log(level, event, payload=str(payload))
+        elif self.is_sampled(sample_key):
+            self.logger.log(level, event, payload=self.truncate(payload))
+
+    def debug(self, event: str, payload: Any, sample_key: Optional[Any] = None, full: bool = False) -> None:
+        self.log(logging.DEBUG, event, payload, sample_key=sample_key, full=full)
+
+    def info(self, event: str, payload: Any, sample_key: Optional[Any] = None, full: bool = False) -> None:
+        self.log(logging.INFO, event, payload, sample_key=sample_key, full=full)
+
+
+payload_logger = PayloadLogger(ner_logger, 'chatbot_ner', sample_rate=NER_LOG_SAMPLE_RATE,
+                               max_chars=NER_LOG_PAYLOAD_MAX_CHARS or None, debug_entities=NER_LOG_DEBUG_ENTITIES)
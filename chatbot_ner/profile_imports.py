@@ -0,0 +1,150 @@
+"""
+Import time and memory profiler for worker boot.
+
+Imports the given modules (by default everything a worker imports to serve requests) in a fresh interpreter started
+with `python -X importtime` and reports the slowest imports along with the peak RSS of that interpreter.
+
+Usage:
+    python -m chatbot_ner.profile_imports
+    python -m chatbot_ner.profile_imports --top 40 --warm-up nltk_tokenizer,pos_tagger
+    python -m chatbot_ner.profile_imports --modules lib.nlp.const --json-output /tmp/importtime.json
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, NamedTuple, Optional
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULES = ['chatbot_ner.wsgi']
+
+_IMPORTTIME_LINE_RE = re.compile(r'^import time:\s+(?P<self>\d+)\s+\|\s+(?P<cumulative>\d+)\s+\|(?P<name>.*)$')
+_MAXRSS_MARKER = '__maxrss_kb__'
+
+
+class ImportTiming(NamedTuple):
+    module: str
+    depth: int
+    self_us: int
+    cumulative_us: int
+
+
+def _child_script(modules: List[str], warm_up_components: List[str]) -> str:
+    lines = [
+        'import os, resource',
+        "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatbot_ner.settings')",
+        'import django',
+        'django.setup()',
+    ]
+    lines.extend(f'import {module}' for module in modules)
+    if warm_up_components:
+        lines.append('from chatbot_ner.warmup import warm_up')
+        lines.append(f'warm_up({warm_up_components!r})')
+    # ru_maxrss is in kilobytes on linux
+    lines.append(f"print('{_MAXRSS_MARKER}', resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)")
+    return '\n'.join(lines)
+
+
+def parse_importtime(stderr: str) -> List[ImportTiming]:
+    """
+    Parse the output of `python -X importtime`
+
+    Args:
+        stderr (str): stderr of the interpreter run with `-X importtime`
+
+    Returns:
+        List[ImportTiming]: one entry per imported module, depth is the nesting level of the import
+    """
+    timings = []
+    for line in stderr.splitlines():
+        match = _IMPORTTIME_LINE_RE.match(line)
+        if not match:
+            continue
+        name = match.group('name')
+        stripped_name = name.lstrip()
+        depth = (len(name) - len(stripped_name) - 1) // 2
+        timings.append(ImportTiming(module=stripped_name.strip(), depth=depth,
+                                    self_us=int(match.group('self')),
+                                    cumulative_us=int(match.group('cumulative'))))
+    return timings
+
+
+def profile_imports(modules: List[str], warm_up_components: Optional[List[str]] = None) -> Dict:
+    """
+    Import the modules in a fresh interpreter and collect import times and peak memory
+
+    Args:
+        modules (List[str]): dotted module paths to import after django setup
+        warm_up_components (Optional[List[str]]): components to load with `chatbot_ner.warmup.warm_up` after
+            importing the modules
+
+    Returns:
+        Dict: report with total import time, peak rss and per module timings
+    """
+    script = _child_script(modules=modules, warm_up_components=warm_up_components or [])
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', script], cwd=BASE_DIR,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+    if process.returncode != 0:
+        raise RuntimeError(f'Importing {modules} failed:\n{process.stderr[-5000:]}')
+
+    max_rss_kb = None
+    for line in process.stdout.splitlines():
+        if line.startswith(_MAXRSS_MARKER):
+            max_rss_kb = int(line.split()[1])
+
+    timings = parse_importtime(process.stderr)
+    return {
+        'modules': modules,
+        'warm_up_components': warm_up_components or [],
+        'total_import_us': sum(timing.cumulative_us for timing in timings if timing.depth == 0),
+        'max_rss_kb': max_rss_kb,
+        'imports': [timing._asdict() for timing in timings],
+    }
+
+
+def _format_report(report: Dict, top: int) -> str:
+    lines = [
+        f"Modules: {', '.join(report['modules'])}",
+        f"Warm up: {', '.join(report['warm_up_components']) or '-'}",
+        f"Total import time: {report['total_import_us'] / 1000.0:.1f} ms",
+        f"Peak RSS: {(report['max_rss_kb'] or 0) / 1024.0:.1f} MB",
+        '',
+        f'Top {top} imports by cumulative time:',
+        f"{'cumulative ms':>14} {'self ms':>9}  module",
+    ]
+    top_level = [timing for timing in report['imports'] if timing['depth'] == 0]
+    for timing in sorted(top_level, key=lambda t: t['cumulative_us'], reverse=True)[:top]:
+        lines.append(f"{timing['cumulative_us'] / 1000.0:>14.1f} {timing['self_us'] / 1000.0:>9.1f}  "
+                     f"{timing['module']}")
+    lines.append('')
+    lines.append(f'Top {top} imports by self time:')
+    for timing in sorted(report['imports'], key=lambda t: t['self_us'], reverse=True)[:top]:
+        lines.append(f"{timing['cumulative_us'] / 1000.0:>14.1f} {timing['self_us'] / 1000.0:>9.1f}  "
+                     f"{timing['module']}")
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Profile import time and memory of chatbot_ner modules')
+    parser.add_argument('--modules', default=','.join(DEFAULT_MODULES),
+                        help='comma separated modules to import. Default: %(default)s')
+    parser.add_argument('--warm-up', default='',
+                        help='comma separated components to load with chatbot_ner.warmup.warm_up after import')
+    parser.add_argument('--top', type=int, default=25, help='number of slowest imports to show')
+    parser.add_argument('--json-output', default=None, help='path to write the full report as json')
+    args = parser.parse_args(argv)
+
+    modules = [module.strip() for module in args.modules.split(',') if module.strip()]
+    warm_up_components = [component.strip() for component in args.warm_up.split(',') if component.strip()]
+    report = profile_imports(modules=modules, warm_up_components=warm_up_components)
+    print(_format_report(report, top=args.top))
+    if args.json_output:
+        with open(args.json_output, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
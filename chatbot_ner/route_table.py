@@ -0,0 +1,82 @@
+"""
+Exact path dispatch for the url conf.
+
+Django resolves a request by trying the url patterns of the url conf one regex at a time. All detection routes are
+literal paths (`^v2/number/$`), so `RouteTableWSGIHandler` looks them up in a dict built once when the application is
+loaded and only falls back to the regular resolver for the other patterns (e.g. ones with captured arguments).
+Middleware, exception handling and request signals are the same as with `django.core.handlers.wsgi.WSGIHandler`
+(`RouteTableASGIHandler`: `django.core.handlers.asgi.ASGIHandler`).
+"""
+
+import re
+from typing import Dict, Iterable
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.urls import ResolverMatch, URLPattern, get_resolver
+from django.urls.resolvers import RegexPattern
+
+from chatbot_ner.setup_logs import bind_request_context
+
+# a url regex that matches exactly one path: anchored at both ends, without special characters other than an escaped
+# '.' or '-'
+_LITERAL_REGEX = re.compile(r'^\^((?:[\w/-]|\\[.-])*)\$$')
+
+
+def build_route_table(urlpatterns: Iterable) -> Dict[str, URLPattern]:
+    """
+    Map the paths of the literal url patterns of a url conf to the patterns. Includes and patterns matching more than
+    one path are skipped. When two patterns match the same path the first one wins, like with the url resolver
+
+    Args:
+        urlpatterns (Iterable): top level url patterns of a url conf
+
+    Returns:
+        Dict[str, URLPattern]: request path (`path_info`, with the leading slash) to url pattern
+    """
+    routes = {}
+    for urlpattern in urlpatterns:
+        if not isinstance(urlpattern, URLPattern) or not isinstance(urlpattern.pattern, RegexPattern):
+            continue
+        literal_match = _LITERAL_REGEX.match(str(urlpattern.pattern))
+        if literal_match is None:
+            continue
+        routes.setdefault('/' + re.sub(r'\\(.)', r'\1', literal_match.group(1)), urlpattern)
+    return routes
+
+
+class RouteTableMixin(object):
+    """
+    Handler mixin that resolves literal paths of the root url conf with a dict lookup, see `build_route_table`
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.routes = build_route_table(get_resolver().url_patterns)
+
+    def resolve_request(self, request):
+        urlpattern = None if hasattr(request, 'urlconf') else self.routes.get(request.path_info)
+        if urlpattern is None:
+            return super().resolve_request(request)
+        resolver_match = ResolverMatch(urlpattern.callback, (), dict(urlpattern.default_args),
+                                       url_name=urlpattern.name, route=str(urlpattern.pattern))
+        request.resolver_match = resolver_match
+        return resolver_match
+
+
+class RouteTableWSGIHandler(RouteTableMixin, WSGIHandler):
+    """
+    WSGI handler that resolves literal paths of the root url conf with a dict lookup. The request id is bound to the
+    logger context for the whole request, the detection only settings have no request logging middleware to do it
+    """
+
+    def get_response(self, request):
+        with bind_request_context(request):
+            return super().get_response(request)
+
+
+class RouteTableASGIHandler(RouteTableMixin, ASGIHandler):
+    """
+    ASGI handler that resolves literal paths of the root url conf with a dict lookup
+    """
+    pass
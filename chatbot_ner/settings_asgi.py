@@ -0,0 +1,17 @@
+"""
+Django settings for ASGI detection deployments of chatbot_ner.
+
+Same as the detection only settings (`chatbot_ner/settings_detection.py`), with the detection views served as async
+views that run on a bounded thread pool (`chatbot_ner/executor.py`). Synchronous middleware would run every request
+on Django's single thread for synchronous code, so there is no middleware, not even the APM one (elastic-apm has no
+async Django support). Use with `DJANGO_SETTINGS_MODULE=chatbot_ner.settings_asgi` and `chatbot_ner/asgi_detection.py`.
+"""
+from __future__ import absolute_import
+
+from chatbot_ner.settings_detection import *  # noqa: F401,F403
+
+MIDDLEWARE = []
+
+ROOT_URLCONF = 'chatbot_ner.urls_async'
+
+ASGI_APPLICATION = 'chatbot_ner.asgi_detection.application'
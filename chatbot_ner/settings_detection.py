@@ -0,0 +1,43 @@
+"""
+Django settings for detection only deployments of chatbot_ner.
+
+The detection APIs have no sessions, users, templates or database, yet `chatbot_ner/settings.py` runs every request
+through the session, auth, messages, csrf, clickjacking and request logging middleware. This profile keeps the
+detection routes (`chatbot_ner/urls_detection.py`) and drops everything else. APM tracing is kept if enabled.
+
+Differences to the full settings:
+    - no entity data APIs (`entities/*`)
+    - no redirect of paths without the trailing slash (CommonMiddleware), `/v2/number` is a 404
+    - no security headers (SecurityMiddleware) and no audit log of requests (django_structlog). The request id is
+      still bound to the logger context by the route table handler (`chatbot_ner/route_table.py`)
+
+Use with `DJANGO_SETTINGS_MODULE=chatbot_ner.settings_detection` and `chatbot_ner/wsgi_detection.py`.
+"""
+from __future__ import absolute_import
+
+from chatbot_ner.settings import *  # noqa: F401,F403
+from chatbot_ner.settings import INSTALLED_APPS, MIDDLEWARE
+
+_UNUSED_APPS = {
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+    'django_nose',
+}
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in _UNUSED_APPS]
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware.startswith('elasticapm.')]
+
+ROOT_URLCONF = 'chatbot_ner.urls_detection'
+
+WSGI_APPLICATION = 'chatbot_ner.wsgi_detection.application'
+
+TEMPLATES = []
+
+DATABASES = {}
+
+AUTH_PASSWORD_VALIDATORS = []
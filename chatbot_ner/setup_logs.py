@@ -3,7 +3,9 @@ This module contains functions and classes required for configuring structlog
 """
 
 import collections
-from typing import Dict, Any, NamedTuple, List
+import contextlib
+import uuid
+from typing import Dict, Any, Iterator, NamedTuple, List
 
 import logging
 import structlog
@@ -57,7 +59,8 @@ def add_module_and_lineno(logger: logging.Logger, name: str, event_dict: Dict[st
     Returns:
         event_dict (dict)
     """
-    frame, module_str = structlog._frames._find_first_app_frame_and_name(additional_ignores=[__name__, 'logging'])
+    frame, module_str = structlog._frames._find_first_app_frame_and_name(
+        additional_ignores=[__name__, 'logging', 'chatbot_ner.payload_logging'])
     event_dict['modline'] = f'{module_str}:{frame.f_lineno}'
     return event_dict
 
@@ -93,6 +96,32 @@ def update_request_metadata(
     unbind_extras(logger)
 
 
+@contextlib.contextmanager
+def bind_request_context(request: HttpRequest) -> Iterator[None]:
+    """
+    Bind the request id and the other logging keys found in the request headers to the logger context of the current
+    thread for the duration of the block, like django_structlog's RequestMiddleware does. The request id is
+    generated if the request has no `x-request-id` header.
+
+    For entry points that run without that middleware (`chatbot_ner/settings_detection.py`,
+    `chatbot_ner/settings_asgi.py`) or run views on other threads (`chatbot_ner/executor.py`), the payload logging
+    samples requests by this id.
+
+    Args:
+        request: django HttpRequest instance
+    """
+    logger = structlog.get_logger(__name__)
+    with structlog.threadlocal.tmp_bind(logger):
+        context = {}
+        for loggingkey in LoggingKeys.members():
+            request_header = get_request_header(request, loggingkey.header_key, loggingkey.meta_key)
+            if request_header:
+                context[loggingkey.bind_key] = request_header
+        context.setdefault(LoggingKeys.REQUEST_ID.bind_key, str(uuid.uuid4()))
+        logger.bind(**context)
+        yield
+
+
 def setup_logs():
     # configuring struct log
     structlog.configure(
@@ -0,0 +1,18 @@
+"""
+URLs of ASGI detection deployments (see `chatbot_ner/settings_asgi.py`). The detection routes of
+`chatbot_ner/urls_detection.py`, with every view run on the bounded detection executor (`chatbot_ner/executor.py`),
+and the stats of the executor.
+"""
+from __future__ import absolute_import
+
+from django.urls import re_path
+
+from chatbot_ner import urls_detection
+from chatbot_ner.executor import async_view, executor_stats
+
+urlpatterns = [re_path(str(urlpattern.pattern), async_view(urlpattern.callback))
+               for urlpattern in urls_detection.urlpatterns]
+
+urlpatterns += [
+    re_path(r'^metrics/executor/$', executor_stats),
+]
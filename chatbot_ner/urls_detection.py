@@ -0,0 +1,51 @@
+"""
+URLs of the detection APIs (v1 and v2). This is the whole url conf of detection only deployments (see
+`chatbot_ner/settings_detection.py`), `chatbot_ner/urls.py` adds the entity data APIs to it.
+"""
+from __future__ import absolute_import
+
+from django.urls import re_path
+
+from ner_v1 import api as api_v1
+from ner_v2 import api as api_v2
+
+urlpatterns = [
+    re_path(r'^v1/text_bulk/$', api_v1.text),
+    re_path(r'^v1/text/$', api_v1.text),
+    re_path(r'^v1/location/$', api_v1.location),
+    re_path(r'^v1/phone_number/$', api_v1.phone_number),
+    re_path(r'^v1/email/$', api_v1.email),
+    re_path(r'^v1/city/$', api_v1.city),
+    re_path(r'^v1/pnr/$', api_v1.pnr),
+    re_path(r'^v1/shopping_size/$', api_v1.shopping_size),
+    re_path(r'^v1/passenger_count/$', api_v1.passenger_count),
+    re_path(r'^v1/number/$', api_v1.number),
+    re_path(r'^v1/time/$', api_v1.time),
+    re_path(r'^v1/time_with_range/$', api_v1.time_with_range),
+    re_path(r'^v1/date/$', api_v1.date),
+    re_path(r'^v1/budget/$', api_v1.budget),
+    re_path(r'^v1/ner/$', api_v1.ner),
+    re_path(r'^v1/combine_output/$', api_v1.combine_output),
+    re_path(r'^v1/person_name/$', api_v1.person_name),
+    re_path(r'^v1/regex/$', api_v1.regex),
+
+    # V2 detectors
+    re_path(r'^v2/date/$', api_v2.date),
+    re_path(r'^v2/time/$', api_v2.time),
+    re_path(r'^v2/number/$', api_v2.number),
+    re_path(r'^v2/phone_number/$', api_v2.phone_number),
+    re_path(r'^v2/number_range/$', api_v2.number_range),
+    re_path(r'^v2/text/$', api_v2.text),
+
+    # V2 bulk detectors
+    re_path(r'^v2/date_bulk/$', api_v2.date),
+    re_path(r'^v2/time_bulk/$', api_v2.time),
+    re_path(r'^v2/number_bulk/$', api_v2.number),
+    re_path(r'^v2/number_range_bulk/$', api_v2.number_range),
+    re_path(r'^v2/phone_number_bulk/$', api_v2.phone_number),
+
+    # Metrics
+    re_path(r'^metrics/msearch_batches/$', api_v2.msearch_batch_stats),
+    re_path(r'^metrics/es_circuit_breaker/$', api_v2.es_circuit_breaker_stats),
+    re_path(r'^metrics/es_pool/$', api_v2.es_pool_stats),
+]
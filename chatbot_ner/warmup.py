@@ -0,0 +1,208 @@
+"""
+This module contains the optional warm up hook for lazily loaded NLP resources.
+
+Heavy resources (nltk punkt tokenizer, perceptron tagger, spacy models, ...) are loaded on first use so that workers
+which never need them don't pay for them. Deployments that do need them can list them in `NER_WARMUP_COMPONENTS`
+so that they are loaded once while the wsgi application is being loaded. With uwsgi (without `--lazy-apps`) this
+happens in the master process before workers are forked, so workers share these objects copy-on-write. To keep those
+pages shared, objects alive after warm up are moved out of the reach of the garbage collector with `gc.freeze()`
+(see `NER_WARMUP_GC_FREEZE`) and the memory usage of the master and of each forked worker is logged.
+"""
+
+import collections
+import gc
+import os
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+from chatbot_ner.config import ner_logger, NER_WARMUP_COMPONENTS, NER_WARMUP_GC_FREEZE, NER_WARMUP_LANGUAGES
+
+
+def _load_nltk_tokenizer() -> None:
+    from lib.nlp.const import nltk_tokenizer
+    nltk_tokenizer.get_tokenizer()
+
+
+def _load_stemmer() -> None:
+    from lib.nlp.const import stemmer
+    stemmer.get_stemmer()
+
+
+def _load_stop_words() -> None:
+    from lib.nlp.const import stop_words
+    len(stop_words)
+
+
+def _load_pos_tagger() -> None:
+    from lib.nlp.pos import APTaggerUtils
+    APTaggerUtils.get_tagger()
+
+
+def _load_language_data() -> None:
+    from ner_v2.detectors.language_data import find_language_data_files, load_csv_records
+    for csv_path in find_language_data_files():
+        load_csv_records(csv_path)
+
+
+def _resolve_language_modules() -> None:
+    from ner_v2.detectors.language_registry import warm_up_language_registry
+    language_modules = warm_up_language_registry(languages=NER_WARMUP_LANGUAGES or None)
+    ner_logger.debug(f'[warm_up] Languages with their own detector modules: {dict(language_modules)}')
+
+
+def _compile_detector_regexes() -> None:
+    # Detectors import their language modules and compile their patterns on every instantiation. Instantiating each
+    # once per language imports those modules and fills the `re` / `regex` pattern caches before fork
+    from ner_v2.detectors.numeral.number.number_detection import NumberDetector, get_shared_number_detector
+    from ner_v2.detectors.numeral.number_range.number_range_detection import NumberRangeDetector
+    from ner_v2.detectors.temporal.date.date_detection import DateAdvancedDetector
+    from ner_v2.detectors.temporal.time.time_detection import TimeDetector
+
+    for detector_class, entity_name in ((NumberDetector, 'number'), (NumberRangeDetector, 'number_range'),
+                                        (DateAdvancedDetector, 'date'), (TimeDetector, 'time')):
+        for language in detector_class.get_supported_languages():
+            try:
+                detector_class(entity_name=entity_name, language=language)
+            except Exception as e:
+                ner_logger.debug(f'[warm_up] Could not create {detector_class.__name__} for {language}: {e}')
+
+    # number range, phone and asr normalization detect numbers with the shared number detectors
+    for language in NumberDetector.get_supported_languages():
+        try:
+            get_shared_number_detector(language=language)
+        except Exception as e:
+            ner_logger.debug(f'[warm_up] Could not create shared number detector for {language}: {e}')
+
+
+def _spacy_model_loader(language: str) -> Callable[[], None]:
+    def _load_spacy_model() -> None:
+        from lib.nlp.spacy_utils import spacy_utils
+        spacy_utils.get_model(language)
+
+    return _load_spacy_model
+
+
+WARMUP_LOADERS: Dict[str, Callable[[], None]] = collections.OrderedDict([
+    ('nltk_tokenizer', _load_nltk_tokenizer),
+    ('stemmer', _load_stemmer),
+    ('stop_words', _load_stop_words),
+    ('pos_tagger', _load_pos_tagger),
+    ('language_data', _load_language_data),
+    ('language_modules', _resolve_language_modules),
+    ('detector_regexes', _compile_detector_regexes),
+    ('spacy_en', _spacy_model_loader('en')),
+    ('spacy_de', _spacy_model_loader('de')),
+    ('spacy_fr', _spacy_model_loader('fr')),
+    ('spacy_nl', _spacy_model_loader('nl')),
+    ('spacy_es', _spacy_model_loader('es')),
+])
+
+
+def warm_up(components: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Load the given lazily loaded resources ahead of the first request that needs them.
+    Unknown component names are logged and skipped, failures are logged and do not stop other components.
+
+    Args:
+        components (Optional[Iterable[str]]): names of components to load, one of the keys of `WARMUP_LOADERS`.
+            Defaults to the components configured with `NER_WARMUP_COMPONENTS`
+
+    Returns:
+        Dict[str, float]: mapping of successfully loaded component name to seconds it took to load
+    """
+    if components is None:
+        components = NER_WARMUP_COMPONENTS
+    timings = collections.OrderedDict()
+    for component in components:
+        loader = WARMUP_LOADERS.get(component)
+        if loader is None:
+            ner_logger.warning(f'[warm_up] Unknown component {component}, valid choices are {list(WARMUP_LOADERS)}')
+            continue
+        start_time = time.time()
+        try:
+            loader()
+        except Exception as e:
+            ner_logger.exception(f'[warm_up] Failed to load {component}: {e}')
+            continue
+        timings[component] = time.time() - start_time
+    if timings:
+        ner_logger.info(f'[warm_up] Loaded components (seconds taken): {dict(timings)}')
+    return timings
+
+
+def get_memory_usage() -> Dict[str, int]:
+    """
+    Get memory usage of the current process from /proc. Only available on linux
+
+    Returns:
+        Dict[str, int]: `rss_kb`, `shared_kb` (resident pages shared with other processes, e.g. forked workers),
+            `private_kb` and, when the kernel exposes /proc/self/smaps_rollup, `pss_kb` (proportional set size).
+            Empty dict if /proc is not available
+    """
+    usage = {}
+    try:
+        with open('/proc/self/statm') as f:
+            _, resident, shared = [int(value) for value in f.read().split()[:3]]
+    except (IOError, OSError, ValueError):
+        return usage
+    page_size_kb = os.sysconf('SC_PAGE_SIZE') // 1024
+    usage['rss_kb'] = resident * page_size_kb
+    usage['shared_kb'] = shared * page_size_kb
+    usage['private_kb'] = usage['rss_kb'] - usage['shared_kb']
+    try:
+        with open('/proc/self/smaps_rollup') as f:
+            for line in f:
+                if line.startswith('Pss:'):
+                    usage['pss_kb'] = int(line.split()[1])
+                    break
+    except (IOError, OSError, ValueError):
+        pass
+    return usage
+
+
+def freeze_gc() -> bool:
+    """
+    Collect garbage and move all surviving objects to the permanent generation so that later collections don't touch
+    them. Called in the master after warm up, this stops gc in forked workers from writing to (and hence copying)
+    memory pages shared with the master.
+
+    Returns:
+        bool: True if objects were frozen, False if disabled with `NER_WARMUP_GC_FREEZE` or not supported by the
+            python version (gc.freeze needs python 3.7+)
+    """
+    if not NER_WARMUP_GC_FREEZE or not hasattr(gc, 'freeze'):
+        return False
+    gc.collect()
+    gc.freeze()
+    ner_logger.info(f'[warm_up] Froze {gc.get_freeze_count()} objects')
+    return True
+
+
+def _log_worker_memory_usage() -> None:
+    import uwsgi
+    ner_logger.info(f'[warm_up] Worker {uwsgi.worker_id()} memory usage after fork: {get_memory_usage()}')
+
+
+def prefork_warm_up(components: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Warm up to be run while the application is loaded in the uwsgi master: loads the configured components, freezes
+    them with `freeze_gc` and logs memory usage before and after warm up, and in every worker after it is forked.
+
+    Args:
+        components (Optional[Iterable[str]]): see `warm_up`
+
+    Returns:
+        Dict[str, float]: see `warm_up`
+    """
+    ner_logger.info(f'[warm_up] Memory usage before warm up: {get_memory_usage()}')
+    timings = warm_up(components=components)
+    freeze_gc()
+    ner_logger.info(f'[warm_up] Memory usage after warm up: {get_memory_usage()}')
+    try:
+        from uwsgidecorators import postfork
+    except ImportError:
+        # not running under uwsgi
+        pass
+    else:
+        postfork(_log_worker_memory_usage)
+    return timings
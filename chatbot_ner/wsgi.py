@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatbot_ner.settings')
 
 application = get_wsgi_application()
+
+# Load configured heavy resources now. Unless uwsgi runs with `--lazy-apps` this happens in the master before fork
+from chatbot_ner.warmup import prefork_warm_up  # noqa: E402
+
+prefork_warm_up()
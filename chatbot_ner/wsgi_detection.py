@@ -0,0 +1,28 @@
+"""
+WSGI config for detection only deployments of chatbot_ner.
+
+It exposes the WSGI callable as a module-level variable named ``application``. Requests to literal paths (all
+detection routes) are dispatched through a route table built at load time, see `chatbot_ner/route_table.py`. Use it
+together with the detection only settings, e.g.
+
+    DJANGO_SETTINGS_MODULE=chatbot_ner.settings_detection uwsgi --wsgi-file chatbot_ner/wsgi_detection.py ...
+
+With the full settings it serves all APIs, only the route table is used then.
+"""
+
+import os
+
+import django
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatbot_ner.settings_detection')
+
+django.setup(set_prefix=False)
+
+from chatbot_ner.route_table import RouteTableWSGIHandler  # noqa: E402
+
+application = RouteTableWSGIHandler()
+
+# Load configured heavy resources now. Unless uwsgi runs with `--lazy-apps` this happens in the master before fork
+from chatbot_ner.warmup import prefork_warm_up  # noqa: E402
+
+prefork_warm_up()
@@ -0,0 +1,234 @@
+"""
+Circuit breaker for datastore queries.
+
+When Elasticsearch slows down or fails, every text detection waits up to the request timeout for it, workers pile up
+on the datastore and requests for other entities (date, number, ...) on the same workers time out too. `CircuitBreaker`
+keeps a rolling window of the outcomes of the queries: a query fails if it cannot reach Elasticsearch, gets a server
+error (see `is_es_failure`) or takes longer than `slow_call_seconds`. Client errors (e.g. a malformed query or a
+missing index) are raised without counting in the window. Once at least `min_calls` queries ran in the window and
+`failure_ratio` of them failed, the breaker opens and queries are rejected right away with
+`CircuitBreakerOpenException` for `open_seconds`, callers are expected to degrade (text detection then finds nothing in
+the datastore and returns fallback values). After that a single probe query is let through: the breaker closes if it
+succeeds and opens again if it fails.
+"""
+from __future__ import absolute_import
+
+import collections
+import threading
+import time
+
+from elasticsearch import exceptions as es_exceptions
+
+from chatbot_ner.config import (ner_logger, ES_BREAKER_ENABLED, ES_BREAKER_FAILURE_RATIO, ES_BREAKER_MIN_CALLS,
+                                ES_BREAKER_OPEN_SECONDS, ES_BREAKER_SLOW_CALL_SECONDS, ES_BREAKER_WINDOW_SECONDS)
+from datastore.exceptions import CircuitBreakerOpenException
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def is_es_failure(error):
+    """
+    Whether an error of a query means that Elasticsearch is unavailable: connection errors, timeouts and 5xx responses
+
+    Args:
+        error (Exception): error raised by the query
+
+    Returns:
+        bool: True if the error counts as a failed query
+    """
+    if isinstance(error, es_exceptions.ConnectionError):
+        # includes ConnectionTimeout
+        return True
+    if isinstance(error, es_exceptions.TransportError):
+        return isinstance(error.status_code, int) and error.status_code >= 500
+    return False
+
+
+class CircuitBreaker(object):
+    """
+    Rolling window circuit breaker, see module docstring
+    """
+
+    def __init__(self, name, window_seconds=30, min_calls=20, failure_ratio=0.5, slow_call_seconds=5.0,
+                 open_seconds=30, clock=time.monotonic, is_failure=is_es_failure):
+        """
+        Args:
+            name (str): name used in logs and errors
+            window_seconds (int): length of the rolling window of query outcomes
+            min_calls (int): min number of queries in the window for the breaker to open
+            failure_ratio (float): fraction of failed queries in the window at which the breaker opens
+            slow_call_seconds (float): queries that take at least this long count as failed
+            open_seconds (float): time the breaker stays open before a probe query is let through
+            clock (callable): monotonic clock in seconds
+            is_failure (callable): whether an exception raised by a query counts as a failed query, other exceptions
+                are raised without counting
+        """
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = min_calls
+        self.failure_ratio = failure_ratio
+        self.slow_call_seconds = slow_call_seconds
+        self.open_seconds = open_seconds
+        self._clock = clock
+        self._is_failure = is_failure
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._opened_at = None
+        self._probe_in_flight = False
+        # [second, calls, failures] per second of the window, oldest first
+        self._buckets = collections.deque()
+        self._calls = 0
+        self._failures = 0
+        self._trips = 0
+        self._rejected = 0
+
+    def _prune(self, now):
+        while self._buckets and self._buckets[0][0] <= now - self.window_seconds:
+            _, calls, failures = self._buckets.popleft()
+            self._calls -= calls
+            self._failures -= failures
+
+    def _reset_window(self):
+        self._buckets.clear()
+        self._calls = 0
+        self._failures = 0
+
+    def _open(self, now, reason):
+        self._state = OPEN
+        self._opened_at = now
+        self._probe_in_flight = False
+        self._trips += 1
+        ner_logger.warning(f'[{self.name} circuit breaker] opened for {self.open_seconds}s, {reason}')
+
+    def _before_call(self):
+        """Raise if the query is rejected, else return whether it is the probe of a half open breaker"""
+        with self._lock:
+            now = self._clock()
+            if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._state = HALF_OPEN
+            if self._state == CLOSED:
+                return False
+            if self._state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self._rejected += 1
+        raise CircuitBreakerOpenException(f'{self.name} circuit breaker is open')
+
+    def _release_probe(self):
+        with self._lock:
+            self._probe_in_flight = False
+
+    def _after_call(self, is_probe, failed):
+        with self._lock:
+            now = self._clock()
+            if is_probe:
+                if failed:
+                    self._open(now, 'probe query failed')
+                else:
+                    self._state = CLOSED
+                    self._probe_in_flight = False
+                    self._reset_window()
+                    ner_logger.info(f'[{self.name} circuit breaker] closed, probe query succeeded')
+                return
+            if self._state != CLOSED:
+                # queries that started before the breaker opened
+                return
+            second = int(now)
+            if not self._buckets or self._buckets[-1][0] != second:
+                self._buckets.append([second, 0, 0])
+            self._buckets[-1][1] += 1
+            self._calls += 1
+            if failed:
+                self._buckets[-1][2] += 1
+                self._failures += 1
+            self._prune(now)
+            if self._calls >= self.min_calls and self._failures >= self.failure_ratio * self._calls:
+                self._open(now, f'{self._failures} of {self._calls} queries in the last {self.window_seconds}s '
+                                f'failed or took {self.slow_call_seconds}s or longer')
+                self._reset_window()
+
+    def call(self, func):
+        """
+        Run a query unless the breaker is open
+
+        Args:
+            func (callable): function without arguments that runs the query
+
+        Returns:
+            object: return value of `func`
+
+        Raises:
+            CircuitBreakerOpenException: if the breaker is open (or half open with the probe query in flight)
+            Exception: whatever `func` raised, counted as a failed query only if `is_failure` says so
+        """
+        is_probe = self._before_call()
+        start = self._clock()
+        try:
+            result = func()
+        except BaseException as error:
+            if isinstance(error, Exception) and self._is_failure(error):
+                self._after_call(is_probe, failed=True)
+            elif is_probe:
+                # the outcome says nothing about the datastore, the next query is the probe
+                self._release_probe()
+            raise
+        self._after_call(is_probe, failed=self._clock() - start >= self.slow_call_seconds)
+        return result
+
+    @property
+    def state(self):
+        """str: one of 'closed', 'open' and 'half_open'"""
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.open_seconds:
+                return HALF_OPEN
+            return self._state
+
+    def stats(self):
+        """
+        State and counters of the breaker
+
+        Returns:
+            dict: with keys
+                state: one of 'closed', 'open' and 'half_open'
+                window_calls, window_failures: queries and failed queries in the rolling window
+                trips: number of times the breaker opened
+                rejected: number of queries rejected while open
+        """
+        state = self.state
+        with self._lock:
+            self._prune(self._clock())
+            return {
+                'state': state,
+                'window_seconds': self.window_seconds,
+                'window_calls': self._calls,
+                'window_failures': self._failures,
+                'trips': self._trips,
+                'rejected': self._rejected,
+            }
+
+
+# breaker of the Elasticsearch text lookups (v1 and v2 text detection), None if disabled
+es_circuit_breaker = CircuitBreaker(name='elasticsearch', window_seconds=ES_BREAKER_WINDOW_SECONDS,
+                                    min_calls=ES_BREAKER_MIN_CALLS, failure_ratio=ES_BREAKER_FAILURE_RATIO,
+                                    slow_call_seconds=ES_BREAKER_SLOW_CALL_SECONDS,
+                                    open_seconds=ES_BREAKER_OPEN_SECONDS) if ES_BREAKER_ENABLED else None
+
+
+def es_guarded(query):
+    """
+    Run an Elasticsearch query through `es_circuit_breaker`, if it is enabled
+
+    Args:
+        query (callable): function without arguments that runs the query
+
+    Returns:
+        object: return value of `query`
+
+    Raises:
+        CircuitBreakerOpenException: if the breaker is open
+    """
+    if es_circuit_breaker is None:
+        return query()
+    return es_circuit_breaker.call(query)
@@ -2,13 +2,16 @@ from __future__ import absolute_import
 import elasticsearch
 import os
 from chatbot_ner.settings import BASE_DIR
-from chatbot_ner.config import ES_BULK_MSG_SIZE, ES_SEARCH_SIZE
+from chatbot_ner.config import ES_BULK_MSG_SIZE, ES_SEARCH_SIZE, ES_DELETE_BY_QUERY_SLICES
 
 DEFAULT_ENTITY_DATA_DIRECTORY = os.path.join(os.path.join(BASE_DIR, 'data'), 'entity_data')
 ELASTICSEARCH = 'elasticsearch'
 ELASTICSEARCH_SEARCH_SIZE = ES_SEARCH_SIZE
 ELASTICSEARCH_BULK_HELPER_MESSAGE_SIZE = ES_BULK_MSG_SIZE
 ELASTICSEARCH_VALUES_SEARCH_SIZE = 300000
+ELASTICSEARCH_DELETE_BY_QUERY_SLICES = ES_DELETE_BY_QUERY_SLICES
+# entity data field with the normalized form of every variant, see lib.nlp.token_cache.normalized_variant
+NORMALIZED_VARIANTS_FIELD = 'normalized_variants'
 
 # settings dictionary key constants
 # TODO: these should not be here, two different sources of literals
@@ -4,15 +4,21 @@ import warnings
 
 import six
 
-from chatbot_ner.config import ner_logger, CHATBOT_NER_DATASTORE
+from chatbot_ner.config import ner_logger, CHATBOT_NER_DATASTORE, ES_SINGLE_FLIGHT
 from datastore import elastic_search
+from datastore.circuit_breaker import es_guarded
 from datastore.constants import (ELASTICSEARCH, ENGINE, ELASTICSEARCH_ALIAS, ELASTICSEARCH_INDEX_1,
                                  ELASTICSEARCH_INDEX_2, ELASTICSEARCH_DOC_TYPE, ELASTICSEARCH_CRF_DATA_INDEX_NAME,
                                  ELASTICSEARCH_CRF_DATA_DOC_TYPE)
 from datastore.exceptions import (DataStoreSettingsImproperlyConfiguredException, EngineNotImplementedException,
-                                  EngineConnectionException, NonESEngineTransferException, IndexNotFoundException)
+                                  EngineConnectionException, NonESEngineTransferException, IndexNotFoundException,
+                                  CircuitBreakerOpenException)
+from datastore.single_flight import SingleFlight, single_flight_key, wait_timeout
 from lib.singleton import Singleton
 
+# concurrent identical similar dictionary lookups share one query, see datastore/single_flight.py
+_similar_dictionary_flights = SingleFlight(name='similar dictionary')
+
 
 # TODO: Bad design, rethink the API, write an abstract class DataStore implement ElasticSearchDataStore,
 # cleanup deprecated and buggy code and write tests for CRUD operations. Maybe even remove multi engine support
@@ -308,31 +314,37 @@ class DataStore(six.with_metaclass(Singleton, object)):
 
         return results_dictionary
 
-    # FIXME: Deprecated, remove
     def delete_entity(self, entity_name, **kwargs):
         """
-        Deletes the entity data for entity named entity_named from the datastore
+        Deletes the entity data for entity named entity_named from the datastore. All documents for the entity are
+        deleted on the server side in a single request, without fetching their ids or values first
 
         Args:
             entity_name: name of the entity, this is same as the file name of the csv used for this entity while
                          populating data for this entity
             kwargs:
                 For Elasticsearch:
-                    Refer http://elasticsearch-py.readthedocs.io/en/master/helpers.html#elasticsearch.helpers.bulk
+                    slices (int): number of slices to parallelize deletion into
+                    refresh (bool): refresh affected shards once deletion completes, default True
+                    wait_for_completion (bool): wait for deletion to finish, default True
+                    Refer https://elasticsearch-py.readthedocs.io/en/5.5.3/api.html#elasticsearch.Elasticsearch.delete_by_query
 
+        Returns:
+            dict: response of the underlying delete request, None for unsupported engines
         """
         if self._client_or_connection is None:
             self._connect()
 
         if self._engine == ELASTICSEARCH:
             self._check_doc_type_for_elasticsearch()
-            elastic_search.populate.delete_entity_by_name(connection=self._client_or_connection,
-                                                          index_name=self._store_name,
-                                                          doc_type=self._connection_settings[
-                                                              ELASTICSEARCH_DOC_TYPE],
-                                                          entity_name=entity_name,
-                                                          logger=ner_logger,
-                                                          **kwargs)
+            kwargs.setdefault('request_timeout', self._connection_settings.get('request_timeout', 20))
+            return elastic_search.populate.delete_entity_by_query(connection=self._client_or_connection,
+                                                                  index_name=self._store_name,
+                                                                  doc_type=self._connection_settings[
+                                                                      ELASTICSEARCH_DOC_TYPE],
+                                                                  entity_name=entity_name,
+                                                                  logger=ner_logger,
+                                                                  **kwargs)
 
     # FIXME: repopulate does not consider language of the variants
     def repopulate(self, entity_data_directory_path=None, csv_file_paths=None, **kwargs):
@@ -437,6 +449,10 @@ class DataStore(six.with_metaclass(Singleton, object)):
                      u'mumbai': u'mumbai',
                      u'pune': u'pune'}
                  ]
+
+        Concurrent calls with the same arguments in a process share one query (unless `ES_SINGLE_FLIGHT` is off),
+        see `datastore.single_flight.SingleFlight`. While the circuit breaker of the datastore is open
+        (`datastore.circuit_breaker`) no query is sent and nothing is found for any text
         """
         results_list = []
         if self._client_or_connection is None:
@@ -444,16 +460,29 @@ class DataStore(six.with_metaclass(Singleton, object)):
         if self._engine == ELASTICSEARCH:
             self._check_doc_type_for_elasticsearch()
             request_timeout = self._connection_settings.get('request_timeout', 20)
-            results_list = elastic_search.query.full_text_query(connection=self._client_or_connection,
-                                                                index_name=self._store_name,
-                                                                doc_type=self._connection_settings[
-                                                                    ELASTICSEARCH_DOC_TYPE],
-                                                                entity_name=entity_name,
-                                                                sentences=texts,
-                                                                fuzziness_threshold=fuzziness_threshold,
-                                                                search_language_script=search_language_script,
-                                                                request_timeout=request_timeout,
-                                                                **kwargs)
+
+            def _full_text_query():
+                return elastic_search.query.full_text_query(connection=self._client_or_connection,
+                                                            index_name=self._store_name,
+                                                            doc_type=self._connection_settings[ELASTICSEARCH_DOC_TYPE],
+                                                            entity_name=entity_name,
+                                                            sentences=texts,
+                                                            fuzziness_threshold=fuzziness_threshold,
+                                                            search_language_script=search_language_script,
+                                                            request_timeout=request_timeout,
+                                                            **kwargs)
+
+            try:
+                if ES_SINGLE_FLIGHT:
+                    key = single_flight_key(self._store_name, entity_name, texts, fuzziness_threshold,
+                                            search_language_script, **kwargs)
+                    results_list = _similar_dictionary_flights.do(key, lambda: es_guarded(_full_text_query),
+                                                                  timeout=wait_timeout(self._connection_settings))
+                else:
+                    results_list = es_guarded(_full_text_query)
+            except CircuitBreakerOpenException as e:
+                ner_logger.debug(f'Skipped datastore query, {e}')
+                results_list = [{} for _ in texts]
         return results_list
 
     def get_entity_supported_languages(self, entity_name, **kwargs):
@@ -586,6 +615,31 @@ class DataStore(six.with_metaclass(Singleton, object)):
 
             return results_dictionary
 
+    def backfill_normalized_variants(self, **kwargs):
+        """
+        Add the normalized variants of entity data indexed before they were stored with it, in the index the alias
+        currently points to. Safe to run again, documents that are up to date are skipped
+        Args:
+            **kwargs:
+                For Elasticsearch:
+                Refer http://elasticsearch-py.readthedocs.io/en/master/helpers.html#elasticsearch.helpers.bulk
+        Returns:
+            tuple of int: number of documents updated and number of documents that were up to date
+        """
+        if self._client_or_connection is None:
+            self._connect()
+
+        if self._engine == ELASTICSEARCH:
+            self._check_doc_type_for_elasticsearch()
+            update_index = elastic_search.connect.get_current_live_index(self._store_name)
+            return elastic_search.populate.backfill_normalized_variants(
+                connection=self._client_or_connection,
+                index_name=update_index,
+                doc_type=self._connection_settings[ELASTICSEARCH_DOC_TYPE],
+                logger=ner_logger,
+                **kwargs
+            )
+
     def transfer_entities_elastic_search(self, entity_list):
         """
         This method is used to transfer the entities from one environment to the other for elastic search engine
@@ -1,7 +1,7 @@
 from __future__ import absolute_import
-from elasticsearch import Elasticsearch
 from chatbot_ner.config import CHATBOT_NER_DATASTORE
 from datastore.elastic_search.transfer import ESTransfer
+from datastore.elastic_search.transport import get_client
 log_prefix = 'datastore.elastic_search.connect'
 
 
@@ -22,21 +22,11 @@ def connect(connection_url=None, host=None, port=None, user=None, password=None,
         Refer https://elasticsearch-py.readthedocs.io/en/master/api.html#elasticsearch.Elasticsearch
 
     Returns:
-        Elasticsearch client connection object
+        Elasticsearch client connection object or None. Clients are shared by the process,
+        see datastore.elastic_search.transport
 
     """
-    connection = None
-    if user and password:
-        kwargs = dict(kwargs, http_auth=(user, password))
-    if connection_url:
-        connection = Elasticsearch(hosts=[connection_url], **kwargs)
-    elif host and port:
-        connection = Elasticsearch(hosts=[{'host': host, 'port': int(port)}], **kwargs)
-
-    if connection and not connection.ping():
-        connection = None
-
-    return connection
+    return get_client(connection_url=connection_url, host=host, port=port, user=user, password=password, **kwargs)
 
 
 class FetchIndexForAliasException(Exception):
@@ -4,10 +4,14 @@ from typing import List, Dict, Any
 from elasticsearch import Elasticsearch
 from elasticsearch.exceptions import NotFoundError
 
+from datastore import constants
 from .utils import filter_kwargs
 
 log_prefix = 'datastore.elastic_search.create'
 
+# not searched, only returned in _source
+NORMALIZED_VARIANTS_MAPPING = {'type': 'keyword', 'index': False, 'doc_values': False}
+
 
 def exists(connection, index_name):
     # type: (Elasticsearch, str) -> bool
@@ -176,6 +180,8 @@ def create_entity_index(connection, index_name, doc_type, logger, **kwargs):
                     'analyzer': 'my_analyzer',
                     'norms': {'enabled': False},  # Needed if we want to give longer variants higher scores
                 },
+                # normalized form of each variant, only kept in _source for detectors, see populate.py
+                constants.NORMALIZED_VARIANTS_FIELD: NORMALIZED_VARIANTS_MAPPING,
                 # other removed/unused fields, kept only for backward compatibility
                 'dict_type': {
                     'type': 'text',
@@ -196,6 +202,22 @@ def create_entity_index(connection, index_name, doc_type, logger, **kwargs):
     _create_index(connection, index_name, doc_type, logger, mapping_body, **kwargs)
 
 
+def put_normalized_variants_mapping(connection, index_name, doc_type, logger):
+    # type: (Elasticsearch, str, str, logging.Logger) -> None
+    """
+    Adds the mapping of the normalized variants field to an entity index created before the field existed
+
+    Args:
+        connection: Elasticsearch client object
+        index_name: The name of the index
+        doc_type:  The type of the documents in the index
+        logger: logging object to log at debug and exception level
+    """
+    mapping_body = {doc_type: {'properties': {constants.NORMALIZED_VARIANTS_FIELD: NORMALIZED_VARIANTS_MAPPING}}}
+    connection.indices.put_mapping(body=mapping_body, index=index_name, doc_type=doc_type)
+    logger.debug('%s: Added %s mapping to index %s' % (log_prefix, constants.NORMALIZED_VARIANTS_FIELD, index_name))
+
+
 def create_crf_index(connection, index_name, doc_type, logger, **kwargs):
     # type: (Elasticsearch, str, str, logging.Logger, **Any) -> None
     """
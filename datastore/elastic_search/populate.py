@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 # std imports
 import os
+import time
 from collections import defaultdict
 
 # 3rd party imports
@@ -9,10 +10,12 @@ from elasticsearch import helpers
 
 from chatbot_ner.config import ner_logger
 from datastore import constants
+from datastore.elastic_search.create import put_normalized_variants_mapping
 from datastore.elastic_search.query import get_entity_data
 from datastore.utils import get_files_from_directory, read_csv, remove_duplicate_data
 from external_api.constants import SENTENCE, ENTITIES
 from language_utilities.constant import ENGLISH_LANG
+from lib.nlp.token_cache import normalized_variant
 from ner_constants import DICTIONARY_DATA_VARIANTS
 from six.moves import map
 
@@ -125,6 +128,19 @@ def get_variants_dictionary_value_from_key(csv_file_path, dictionary_key, logger
     return dictionary_value
 
 
+def _normalized_variants(variants):
+    """
+    Normalized forms of variants stored with them, see lib.nlp.token_cache.normalized_variant
+
+    Args:
+        variants (list of str or None): variants of an entity value
+
+    Returns:
+        list of str: normalized form of each variant
+    """
+    return [normalized_variant(variant) for variant in variants or []]
+
+
 def add_data_elastic_search(
         connection, index_name, doc_type, dictionary_key,
         dictionary_value, language_script, logger, **kwargs
@@ -153,6 +169,7 @@ def add_data_elastic_search(
          'entity_data': 'city',
          'value': 'Baripada Town'',
          'variants': ['Baripada', 'Baripada Town', '']
+         'normalized_variants': ['baripada', 'baripada town', '']
          '_op_type': 'index'
          }
 
@@ -164,6 +181,7 @@ def add_data_elastic_search(
                       'dict_type': DICTIONARY_DATA_VARIANTS,
                       'value': value,
                       'variants': dictionary_value[value],
+                      constants.NORMALIZED_VARIANTS_FIELD: _normalized_variants(dictionary_value[value]),
                       "language_script": language_script,
                       '_type': doc_type,
                       '_op_type': 'index'
@@ -196,8 +214,8 @@ def create_dictionary_data_from_file(connection, index_name, doc_type, csv_file_
     dictionary_key = os.path.splitext(base_file_name)[0]
 
     if update:
-        delete_entity_by_name(connection=connection, index_name=index_name, doc_type=doc_type,
-                              entity_name=dictionary_key, logger=logger, **kwargs)
+        delete_entity_by_query(connection=connection, index_name=index_name, doc_type=doc_type,
+                               entity_name=dictionary_key, logger=logger)
     dictionary_value = get_variants_dictionary_value_from_key(csv_file_path=csv_file_path,
                                                               dictionary_key=dictionary_key, logger=logger,
                                                               **kwargs)
@@ -211,42 +229,48 @@ def create_dictionary_data_from_file(connection, index_name, doc_type, csv_file_
         os.path.basename(csv_file_path)
 
 
-def delete_entity_by_name(connection, index_name, doc_type, entity_name, logger, **kwargs):
-    data = {
+def delete_entity_by_query(connection, index_name, doc_type, entity_name, logger,
+                           slices=constants.ELASTICSEARCH_DELETE_BY_QUERY_SLICES, refresh=True,
+                           wait_for_completion=True, **kwargs):
+    """
+    Deletes all documents for the entity in a single `_delete_by_query` request instead of scrolling through all ids
+    (or aggregating all values) and sending them back in bulk delete requests
+
+    Args:
+        connection: Elasticsearch client object
+        index_name (str): The name of the index
+        doc_type (str): The type of the documents being indexed
+        entity_name (str): name of the entity for which all the data is to be deleted
+        logger: logging object to log at debug and exception level
+        slices (int, optional): number of slices to parallelize the deletion into, ideally the number of primary
+            shards of the index. Defaults to `ES_DELETE_BY_QUERY_SLICES`
+        refresh (bool, optional): refresh all shards involved once the deletion completes so that documents indexed
+            right after (e.g. on replace) are not shadowed by deleted ones in searches. Defaults to True
+        wait_for_completion (bool, optional): if False, the request returns a task id immediately and deletion
+            continues in the background. `refresh` is ignored by ES in this case. Defaults to True
+        kwargs:
+            Refer https://elasticsearch-py.readthedocs.io/en/5.5.3/api.html#elasticsearch.Elasticsearch.delete_by_query
+
+    Returns:
+        dict: response of the `_delete_by_query` request. Contains counts of `deleted` documents, `took`, `failures`
+            when `wait_for_completion` is True, otherwise the `task` id
+    """
+    query = {
         'query': {
             'term': {
                 'entity_data': {
                     'value': entity_name
                 }
             }
-        },
-        "size": constants.ELASTICSEARCH_SEARCH_SIZE
+        }
     }
-    results = connection.search(index=index_name, doc_type=doc_type, scroll='2m', body=data)
-    sid = results['_scroll_id']
-    scroll_size = results['hits']['total']
-    delete_bulk_queries = []
-    str_query = []
-    while scroll_size > 0:
-        results = results['hits']['hits']
-        for eid in results:
-            delete_dict = {'_index': index_name,
-                           '_type': doc_type,
-                           '_id': eid["_id"],
-                           '_op_type': 'delete',
-                           }
-            str_query.append(delete_dict)
-            if len(str_query) > constants.ELASTICSEARCH_BULK_HELPER_MESSAGE_SIZE:
-                delete_bulk_queries.append(str_query)
-                str_query = []
-        results = connection.scroll(scroll_id=sid, scroll='2m')
-        sid = results['_scroll_id']
-        scroll_size = len(results['hits']['hits'])
-    if str_query:
-        delete_bulk_queries.append(str_query)
-    for delete_query in delete_bulk_queries:
-        result = helpers.bulk(connection, delete_query, stats_only=True, **kwargs)
-        logger.debug('%s: \t++ %s Entity delete status %s ++' % (log_prefix, entity_name, result))
+    start_time = time.time()
+    result = connection.delete_by_query(index=index_name, doc_type=doc_type, body=query, conflicts='proceed',
+                                        slices=slices, refresh=refresh if wait_for_completion else False,
+                                        wait_for_completion=wait_for_completion, **kwargs)
+    logger.debug('%s: \t++ %s Entity delete by query status %s, took %.3f s ++'
+                 % (log_prefix, entity_name, result, time.time() - start_time))
+    return result
 
 
 def entity_data_update(connection, index_name, doc_type, entity_data, entity_name, language_script,
@@ -264,10 +288,10 @@ def entity_data_update(connection, index_name, doc_type, entity_data, entity_nam
         **kwargs: Refer http://elasticsearch-py.readthedocs.io/en/master/helpers.html#elasticsearch.helpers.bulk
     """
     logger.debug('%s: +++ Started: external_api_entity_update() +++' % log_prefix)
-    logger.debug('%s: +++ Started: delete_entity_by_name() +++' % log_prefix)
-    delete_entity_by_name(connection=connection, index_name=index_name, doc_type=doc_type,
-                          entity_name=entity_name, logger=logger, **kwargs)
-    logger.debug('%s: +++ Completed: delete_entity_by_name() +++' % log_prefix)
+    logger.debug('%s: +++ Started: delete_entity_by_query() +++' % log_prefix)
+    delete_entity_by_query(connection=connection, index_name=index_name, doc_type=doc_type,
+                           entity_name=entity_name, logger=logger)
+    logger.debug('%s: +++ Completed: delete_entity_by_query() +++' % log_prefix)
 
     if entity_data:
         dictionary_value = {}
@@ -408,6 +432,7 @@ def delete_entity_data_by_values(connection, index_name, doc_type, entity_name,
     Returns:
         None
     """
+    start_time = time.time()
     results = get_entity_data(
         connection=connection,
         index_name=index_name,
@@ -437,6 +462,8 @@ def delete_entity_data_by_values(connection, index_name, doc_type, entity_name,
     for delete_query in delete_bulk_queries:
         result = helpers.bulk(connection, delete_query, stats_only=True, **kwargs)
         ner_logger.debug('delete_entity_data_by_values: entity_name: {0} result {1}'.format(entity_name, str(result)))
+    ner_logger.debug('delete_entity_data_by_values: entity_name: {0} deleted {1} records, took {2:.3f} s'
+                     .format(entity_name, len(results), time.time() - start_time))
 
 
 def add_entity_data(connection, index_name, doc_type, entity_name, value_variant_records, **kwargs):
@@ -464,6 +491,7 @@ def add_entity_data(connection, index_name, doc_type, entity_name, value_variant
             'language_script': record.get('language_script'),
             'value': record.get('value'),
             'variants': record.get('variants'),
+            constants.NORMALIZED_VARIANTS_FIELD: _normalized_variants(record.get('variants')),
         }
         str_query.append(query_dict)
         if len(str_query) == constants.ELASTICSEARCH_BULK_HELPER_MESSAGE_SIZE:
@@ -472,3 +500,48 @@ def add_entity_data(connection, index_name, doc_type, entity_name, value_variant
 
     if str_query:
         helpers.bulk(connection, str_query, stats_only=True, **kwargs)
+
+
+def backfill_normalized_variants(connection, index_name, doc_type, logger, **kwargs):
+    """
+    Add the normalized variants field to entity data indexed before the field existed: puts the mapping of the field
+    and updates every entity data document whose normalized variants are missing or outdated. Safe to run again
+
+    Args:
+        connection (elasticsearch.client.Elasticsearch): Elasticsearch client object
+        index_name (str): The name of the index
+        doc_type (str): The type of the documents in the index
+        logger: logging object to log at debug and exception level
+        **kwargs: Refer http://elasticsearch-py.readthedocs.io/en/master/helpers.html#elasticsearch.helpers.bulk
+
+    Returns:
+        tuple of int: number of documents updated and number of documents that were up to date
+    """
+    start_time = time.time()
+    put_normalized_variants_mapping(connection=connection, index_name=index_name, doc_type=doc_type, logger=logger)
+    query = {
+        '_source': ['variants', constants.NORMALIZED_VARIANTS_FIELD],
+        'query': {'exists': {'field': 'variants'}},
+    }
+    updated, up_to_date = 0, 0
+    str_query = []
+    for hit in helpers.scan(connection, query=query, index=index_name, doc_type=doc_type, scroll='5m'):
+        normalized_variants = _normalized_variants(hit['_source'].get('variants'))
+        if hit['_source'].get(constants.NORMALIZED_VARIANTS_FIELD) == normalized_variants:
+            up_to_date += 1
+            continue
+        str_query.append({
+            '_index': index_name,
+            '_type': doc_type,
+            '_id': hit['_id'],
+            '_op_type': 'update',
+            'doc': {constants.NORMALIZED_VARIANTS_FIELD: normalized_variants},
+        })
+        if len(str_query) >= constants.ELASTICSEARCH_BULK_HELPER_MESSAGE_SIZE:
+            updated += helpers.bulk(connection, str_query, stats_only=True, **kwargs)[0]
+            str_query = []
+    if str_query:
+        updated += helpers.bulk(connection, str_query, stats_only=True, **kwargs)[0]
+    logger.debug('%s: \t++ %s backfill updated %d documents, %d up to date, took %.3f s ++'
+                 % (log_prefix, index_name, updated, up_to_date, time.time() - start_time))
+    return updated, up_to_date
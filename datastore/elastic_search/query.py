@@ -11,11 +11,14 @@ from six import string_types
 from six.moves import range
 from six.moves import zip
 
+from chatbot_ner.config import ES_NORMALIZED_VARIANTS
 from datastore import constants
 from datastore.exceptions import DataStoreRequestException
+from datastore.utils import get_normalized_variants
 from external_api.constants import SENTENCE, ENTITIES
 from language_utilities.constant import ENGLISH_LANG
 from lib.nlp.const import TOKENIZER
+from lib.nlp.token_cache import cache_normalized_variant
 
 from elasticsearch import exceptions as es_exceptions
 
@@ -446,8 +449,12 @@ def _generate_es_search_dictionary(entity_name, text,
     }
     should_terms.append(query)
 
+    source_fields = ['value']
+    if ES_NORMALIZED_VARIANTS:
+        source_fields.extend(['variants', constants.NORMALIZED_VARIANTS_FIELD])
+
     data = {
-        '_source': ['value'],
+        '_source': source_fields,
         'query': {
             'bool': {
                 'must': must_terms,
@@ -475,7 +482,9 @@ def _generate_es_search_dictionary(entity_name, text,
 
 def _parse_es_search_results(results_list):
     """
-    Parse highlighted results returned from elasticsearch query and generate a variants to values dictionary
+    Parse highlighted results returned from elasticsearch query and generate a variants to values dictionary.
+    Normalized forms of the variants in the results (see `ES_NORMALIZED_VARIANTS`) are put in the variant token cache
+    of `lib.nlp.token_cache` so that detectors don't tokenize the variants again
 
     Args:
         results_list (list of dict): search results list of dictionaries from elasticsearch including highlights
@@ -531,7 +540,7 @@ def _parse_es_search_results(results_list):
     variants_to_values_list = []
     if results_list:
         for results in results_list:
-            entity_values, entity_variants = [], []
+            entity_values, entity_variants, entity_normalized_variants = [], [], []
             variants_to_values = collections.OrderedDict()
             if results and results['hits']['total'] > 0:
                 for hit in results['hits']['hits']:
@@ -539,17 +548,27 @@ def _parse_es_search_results(results_list):
                         continue
 
                     value = hit['_source']['value']
+                    normalized_variants = get_normalized_variants(hit['_source'])
                     for variant in hit['highlight']['variants']:
                         entity_values.append(value)
                         entity_variants.append(variant)
+                        entity_normalized_variants.append(normalized_variants)
 
-                for value, variant in zip(entity_values, entity_variants):
+                for value, variant, normalized_variants in zip(entity_values, entity_variants,
+                                                               entity_normalized_variants):
                     variant = re.sub('\s+', ' ', variant.strip())
                     variant_no_highlight_tags = variant.replace('<em>', '').replace('</em>', '').strip()
-                    if variant.count('<em>') == len(TOKENIZER.tokenize(variant_no_highlight_tags)):
+                    normalized = normalized_variants.get(variant_no_highlight_tags)
+                    if normalized is None:
+                        tokens_count = len(TOKENIZER.tokenize(variant_no_highlight_tags))
+                    else:
+                        tokens_count = len(normalized.split())
+                    if variant.count('<em>') == tokens_count:
                         variant = variant_no_highlight_tags
                         if variant not in variants_to_values:
                             variants_to_values[variant] = value
+                            if normalized is not None:
+                                cache_normalized_variant(variant, normalized)
             variants_to_values_list.append(variants_to_values)
 
     return variants_to_values_list
@@ -1,10 +1,10 @@
 from __future__ import absolute_import
-import requests
 import json
 import datetime
 from elasticsearch import Elasticsearch, RequestsHttpConnection
 from elasticsearch import helpers
 from chatbot_ner.config import CHATBOT_NER_DATASTORE, ner_logger
+from datastore.elastic_search.transport import http_session
 from datastore.exceptions import IndexNotFoundException, InvalidESURLException, \
     SourceDestinationSimilarException, \
     InternalBackupException, AliasNotFoundException, PointIndexToAliasException, \
@@ -168,7 +168,7 @@ class ESTransfer(object):
             es_url (str): The elasticsearch URL
             alias_name (str): The name of the alias to check the existence for
         """
-        response = requests.get(es_url + '/_cat/aliases?v')
+        response = http_session.get(es_url + '/_cat/aliases?v')
         if alias_name not in response.content:
             raise AliasNotFoundException(alias_name + ' does not exist in ' + es_url)
 
@@ -189,7 +189,7 @@ class ESTransfer(object):
         es_url (string): The elsticsearch URL
         index_name (string): Name of the index to check the existence for
         """
-        index_response = requests.get('{es_url}/_cat/indices?v'.format(**{"es_url": es_url}))
+        index_response = http_session.get('{es_url}/_cat/indices?v'.format(**{"es_url": es_url}))
         # check if index is present in source
         if " " + index_name + " " not in index_response.content:
             message = index_name + " does not exist in " + es_url
@@ -214,7 +214,7 @@ class ESTransfer(object):
                         "scroll": "2m",
                         "scroll_id": scroll_id
                     }
-                    r = requests.post(self.source + "/_search/scroll", json=scroll_req, timeout=30)
+                    r = http_session.post(self.source + "/_search/scroll", json=scroll_req, timeout=30)
                     results = json.loads(r.content)
                     for post in results['hits']['hits']:
                         data_new.append(post)
@@ -237,7 +237,7 @@ class ESTransfer(object):
         url = self.source + '/' + self.es_alias + "/_search"
         url = url + '?scroll=2m'
         query['size'] = 10000
-        r = requests.post(url, json=query, timeout=30)
+        r = http_session.post(url, json=query, timeout=30)
         results = json.loads(r.content)
         if 'error' not in results:
             # deriving data, with scrolling if required
@@ -301,7 +301,7 @@ class ESTransfer(object):
             query (string): The ES query to be executed
         """
         url = self.destination + '/' + index + "/_delete_by_query"
-        result = requests.post(url, json=query, timeout=30)
+        result = http_session.post(url, json=query, timeout=30)
         return result
 
     def _transfer_specific_documents(self, new_live_index, list_of_entities):
@@ -357,7 +357,7 @@ class ESTransfer(object):
         # Fetch index to backup config
         ner_logger.debug('Start get request made with index_to_backup_url '
                          'index_to_backup_url: %s' % (index_to_backup_url))
-        index_to_backup_url_response = requests.get(index_to_backup_url)
+        index_to_backup_url_response = http_session.get(index_to_backup_url)
         ner_logger.debug('End get request made with index_to_backup_url')
 
 
@@ -374,11 +374,11 @@ class ESTransfer(object):
 
         ner_logger.debug('Start delete request made with backup_index_url '
                          'backup_index_url: %s' % (backup_index_url))
-        requests.delete(backup_index_url)
+        http_session.delete(backup_index_url)
         ner_logger.debug('End delete request made with backup_index_url ')
 
         ner_logger.debug('Start put request made with backup_index_url ')
-        requests.put(backup_index_url, json=index_to_backup_config)
+        http_session.put(backup_index_url, json=index_to_backup_config)
         ner_logger.debug('End put request made with backup_index_url ')
 
         final_request_dict = {
@@ -395,7 +395,7 @@ class ESTransfer(object):
         replicas_disabled = False
 
         def update_index_settings(index_url, settings_object={}):
-            resp = requests.put(f'{index_url}/_settings', json=settings_object)
+            resp = http_session.put(f'{index_url}/_settings', json=settings_object)
             if resp.status_code == 200:
                 ner_logger.debug(f'transfer_data_internal, Index settings updated')
             else:
@@ -416,8 +416,9 @@ class ESTransfer(object):
         try:
             ner_logger.debug('Start post request made with es_url reindex'
                              'es_url: %s' % (es_url))
-            reindex_response = requests.post('{es_url}/_reindex'.format(**{'es_url': es_url}), json=final_request_dict,
-                                             params={"refresh": "true", "wait_for_completion": "true"})
+            reindex_response = http_session.post('{es_url}/_reindex'.format(**{'es_url': es_url}),
+                                                 json=final_request_dict,
+                                                 params={"refresh": "true", "wait_for_completion": "true"})
             ner_logger.debug('End post request made with es_url ')
             if reindex_response.status_code != 200:
                 message = "transfer from " + index_to_backup + "to " + backup_index + " failed"
@@ -449,7 +450,7 @@ class ESTransfer(object):
             alias_name (str): The name of the alias to assign the index to
             index_name (str): The index name
         """
-        response = requests.put(es_url + '/' + index_name + '/_alias/' + alias_name)
+        response = http_session.put(es_url + '/' + index_name + '/_alias/' + alias_name)
         if response.status_code != 200:
             raise PointIndexToAliasException('pointing ' + index_name + 'to ' + alias_name + ' failed')
 
@@ -464,7 +465,7 @@ class ESTransfer(object):
         Returns
             current_live_index (str): The current live index
         """
-        response = requests.get(es_url + '/*/_alias/' + alias_name)
+        response = http_session.get(es_url + '/*/_alias/' + alias_name)
         if response.status_code == 200:
             json_obj = json.loads(response.content)
             indices = list(json_obj.keys())
@@ -487,7 +488,7 @@ class ESTransfer(object):
             alias_name (str): The name of the alias
             index_name (str): The name of the index to be deleted from the alias
         """
-        response = requests.delete(es_url + '/' + index_name + '/_alias/' + alias_name)
+        response = http_session.delete(es_url + '/' + index_name + '/_alias/' + alias_name)
         if response.status_code != 200:
             raise DeleteIndexFromAliasException('delete ' + index_name + 'from ' + alias_name + ' failed')
 
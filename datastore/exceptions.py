@@ -3,7 +3,8 @@ __all__ = [
     'IndexForTransferException', 'AliasForTransferException', 'NonESEngineTransferException',
     'IndexNotFoundException', 'InvalidESURLException', 'SourceDestinationSimilarException',
     'InternalBackupException', 'AliasNotFoundException', 'PointIndexToAliasException',
-    'FetchIndexForAliasException', 'DeleteIndexFromAliasException', 'DataStoreRequestException'
+    'FetchIndexForAliasException', 'DeleteIndexFromAliasException', 'DataStoreRequestException',
+    'SingleFlightTimeoutException', 'CircuitBreakerOpenException'
 ]
 
 
@@ -112,3 +113,18 @@ class DataStoreRequestException(BaseDataStoreException):
         self.request = request
         self.response = response
         super().__init__(message)
+
+
+class SingleFlightTimeoutException(BaseDataStoreException):
+    """
+    This exception is raised if an identical datastore lookup in flight, whose result a request waits for, does not
+    finish in time
+    """
+    pass
+
+
+class CircuitBreakerOpenException(BaseDataStoreException):
+    """
+    This exception is raised if a datastore query is rejected because the circuit breaker of the datastore is open
+    """
+    pass
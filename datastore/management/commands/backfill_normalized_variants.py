@@ -0,0 +1,16 @@
+from __future__ import absolute_import
+
+from django.core.management.base import BaseCommand
+
+from datastore import DataStore
+
+
+class Command(BaseCommand):
+    help = 'Add the normalized variants to entity data indexed before they were stored with it, in the index the ' \
+           'datastore alias points to. Documents that are up to date are skipped, so it is safe to run again. Turn ' \
+           'on ES_NORMALIZED_VARIANTS once it has run'
+
+    def handle(self, *args, **options):
+        db = DataStore()
+        updated, up_to_date = db.backfill_normalized_variants()
+        self.stdout.write('Updated %d documents, %d were up to date' % (updated, up_to_date))
@@ -0,0 +1,114 @@
+"""
+Coalescing of concurrent identical datastore lookups.
+
+Many users of a bot often send the same message at the same time (broadcast replies like "yes" or "book now"), and
+every one of their requests runs the same datastore query. `SingleFlight.do` runs a lookup once for all threads of the
+process that ask for the same key while it is in flight: the first caller runs it, the others wait for its result (or
+its exception). Nothing is cached, a lookup that starts after the previous one finished runs again.
+"""
+from __future__ import absolute_import
+
+import copy
+import json
+import threading
+
+from datastore.exceptions import SingleFlightTimeoutException
+
+
+class _Call(object):
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def single_flight_key(*args, **kwargs):
+    """
+    Hashable key of the arguments of a lookup
+
+    Args:
+        *args: json serializable arguments (lists, dicts, strings, numbers, None)
+        **kwargs: json serializable keyword arguments
+
+    Returns:
+        str: key that is equal for equal arguments
+    """
+    return json.dumps([args, kwargs], sort_keys=True, default=str)
+
+
+def wait_timeout(connection_settings):
+    """
+    Seconds to wait for a datastore lookup in flight: the client tries a query up to `max_retries` + 1 times, each
+    within `request_timeout`
+
+    Args:
+        connection_settings (dict): datastore connection settings
+
+    Returns:
+        float: timeout for `SingleFlight.do`
+    """
+    return connection_settings.get('request_timeout', 20) * (connection_settings.get('max_retries', 3) + 1)
+
+
+class SingleFlight(object):
+    """
+    Runs concurrent calls with the same key once and shares the result, see module docstring
+    """
+
+    def __init__(self, name):
+        """
+        Args:
+            name (str): name of the lookup, used in errors
+        """
+        self.name = name
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.calls = 0
+        self.coalesced_calls = 0
+
+    def do(self, key, func, timeout=None):
+        """
+        Run `func` unless a call with the same key is in flight, in which case wait for that call instead
+
+        Args:
+            key (hashable): key of the call, see `single_flight_key`
+            func (callable): function without arguments that does the lookup
+            timeout (float, optional): seconds to wait for a call in flight, None to wait until it is done
+
+        Returns:
+            object: return value of `func`. Every caller gets a deep copy, so that every caller can modify its result
+
+        Raises:
+            SingleFlightTimeoutException: if the call in flight did not finish within `timeout`
+            Exception: whatever `func` raised, in the caller that ran it and in all callers that waited for it
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            in_flight = call is not None
+            if in_flight:
+                self.coalesced_calls += 1
+            else:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+
+        if not in_flight:
+            try:
+                call.result = func()
+                # copied before the waiters are woken up, so that the caller can modify its result while they copy
+                return copy.deepcopy(call.result)
+            except BaseException as e:
+                call.error = e
+                raise
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if not call.done.wait(timeout):
+            raise SingleFlightTimeoutException(f'Timed out after {timeout}s waiting for an identical {self.name} '
+                                               f'lookup in flight')
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
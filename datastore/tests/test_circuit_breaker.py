@@ -0,0 +1,97 @@
+from __future__ import absolute_import
+
+from django.test import SimpleTestCase
+from elasticsearch import exceptions as es_exceptions
+
+from datastore.circuit_breaker import CircuitBreaker
+from datastore.exceptions import CircuitBreakerOpenException
+
+
+class FakeClock(object):
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(SimpleTestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(name='test', window_seconds=10, min_calls=4, failure_ratio=0.5,
+                                      slow_call_seconds=2, open_seconds=30, clock=self.clock)
+
+    def _raise(self, error):
+        def query():
+            raise error
+
+        with self.assertRaises(type(error)):
+            self.breaker.call(query)
+
+    def _fail(self):
+        self._raise(es_exceptions.ConnectionTimeout('TIMEOUT', 'query timed out', None))
+
+    def _slow_query(self):
+        self.clock.now += 3
+        return 'slow'
+
+    def test_opens_when_failure_ratio_is_reached(self):
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self._fail()
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertEqual(self.breaker.call(self._slow_query), 'slow')
+        self.assertEqual(self.breaker.state, 'open')
+
+        with self.assertRaises(CircuitBreakerOpenException):
+            self.breaker.call(lambda: 'ok')
+        stats = self.breaker.stats()
+        self.assertEqual((stats['state'], stats['trips'], stats['rejected']), ('open', 1, 1))
+
+    def test_old_failures_leave_the_window(self):
+        self._fail()
+        self._fail()
+        self.clock.now += 11
+        self.breaker.call(lambda: 'ok')
+        self._fail()
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertEqual(self.breaker.stats()['window_calls'], 2)
+
+    def test_probe_closes_or_reopens_the_breaker(self):
+        for _ in range(4):
+            self._fail()
+        self.clock.now += 30
+        self.assertEqual(self.breaker.state, 'half_open')
+
+        # only one probe at a time
+        def probe():
+            with self.assertRaises(CircuitBreakerOpenException):
+                self.breaker.call(lambda: 'ok')
+            raise es_exceptions.TransportError(503, 'probe failed')
+
+        with self.assertRaises(es_exceptions.TransportError):
+            self.breaker.call(probe)
+        self.assertEqual(self.breaker.state, 'open')
+
+        self.clock.now += 30
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertEqual(self.breaker.stats()['trips'], 2)
+
+    def test_client_errors_do_not_open_the_breaker(self):
+        for _ in range(4):
+            self._raise(es_exceptions.RequestError(400, 'parsing_exception', None))
+            self._raise(es_exceptions.NotFoundError(404, 'index_not_found_exception', None))
+            self._raise(ValueError('bad result'))
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertEqual(self.breaker.stats()['window_calls'], 0)
+
+        for _ in range(4):
+            self._fail()
+        self.clock.now += 30
+        # a client error of the probe lets the next query probe again
+        self._raise(es_exceptions.RequestError(400, 'parsing_exception', None))
+        self.assertEqual(self.breaker.state, 'half_open')
+        self.assertEqual(self.breaker.call(lambda: 'ok'), 'ok')
+        self.assertEqual(self.breaker.state, 'closed')
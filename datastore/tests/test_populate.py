@@ -0,0 +1,77 @@
+from __future__ import absolute_import
+
+import mock
+from django.test import TestCase
+
+from chatbot_ner.config import ner_logger
+from datastore.elastic_search.populate import add_entity_data, backfill_normalized_variants, delete_entity_by_query
+
+
+class TestDeleteEntityByQuery(TestCase):
+
+    def setUp(self):
+        self.connection = mock.MagicMock()
+        self.connection.delete_by_query.return_value = {'deleted': 3, 'took': 5, 'failures': []}
+
+    def test_delete_entity_by_query_single_request(self):
+        """Test that all documents of an entity are wiped with one `_delete_by_query` and no search/scroll calls"""
+        result = delete_entity_by_query(connection=self.connection, index_name='test_index',
+                                        doc_type='test_doc_type', entity_name='city', logger=ner_logger, slices=3)
+
+        self.assertEqual(result['deleted'], 3)
+        self.connection.search.assert_not_called()
+        self.connection.scroll.assert_not_called()
+        self.connection.delete_by_query.assert_called_once_with(
+            index='test_index', doc_type='test_doc_type',
+            body={'query': {'term': {'entity_data': {'value': 'city'}}}},
+            conflicts='proceed', slices=3, refresh=True, wait_for_completion=True
+        )
+
+    def test_delete_entity_by_query_no_refresh_without_wait(self):
+        """Test that refresh is not requested when deletion runs as a background task"""
+        delete_entity_by_query(connection=self.connection, index_name='test_index', doc_type='test_doc_type',
+                               entity_name='city', logger=ner_logger, wait_for_completion=False)
+        _, kwargs = self.connection.delete_by_query.call_args
+        self.assertFalse(kwargs['refresh'])
+        self.assertFalse(kwargs['wait_for_completion'])
+
+
+class TestNormalizedVariants(TestCase):
+
+    def setUp(self):
+        self.connection = mock.MagicMock()
+
+    @mock.patch('datastore.elastic_search.populate.helpers.bulk')
+    def test_add_entity_data_stores_normalized_variants(self, mocked_bulk):
+        """Test that variants are indexed with their normalized forms"""
+        add_entity_data(connection=self.connection, index_name='test_index', doc_type='test_doc_type',
+                        entity_name='restaurant',
+                        value_variant_records=[{'value': 'KFC', 'language_script': 'en',
+                                                'variants': ['KFC', 'Hot & Crispy  Chicken']}])
+        (_, actions), _ = mocked_bulk.call_args
+        self.assertEqual(actions[0]['normalized_variants'], ['kfc', 'hot crispy chicken'])
+
+    @mock.patch('datastore.elastic_search.populate.helpers.bulk')
+    @mock.patch('datastore.elastic_search.populate.helpers.scan')
+    def test_backfill_updates_outdated_documents_only(self, mocked_scan, mocked_bulk):
+        """Test that the backfill puts the mapping and updates documents without (current) normalized variants"""
+        mocked_scan.return_value = iter([
+            {'_id': '1', '_source': {'variants': ['New Delhi', 'Delhi']}},
+            {'_id': '2', '_source': {'variants': ['Mumbai'], 'normalized_variants': ['mumbai']}},
+            {'_id': '3', '_source': {'variants': ['Pune', 'Poona'], 'normalized_variants': ['pune']}},
+        ])
+        mocked_bulk.return_value = (2, 0)
+
+        updated, up_to_date = backfill_normalized_variants(connection=self.connection, index_name='test_index',
+                                                           doc_type='test_doc_type', logger=ner_logger)
+
+        self.assertEqual((updated, up_to_date), (2, 1))
+        self.connection.indices.put_mapping.assert_called_once_with(
+            body={'test_doc_type': {'properties': {'normalized_variants': {'type': 'keyword', 'index': False,
+                                                                           'doc_values': False}}}},
+            index='test_index', doc_type='test_doc_type')
+        (_, actions), _ = mocked_bulk.call_args
+        self.assertEqual([(action['_id'], action['_op_type'], action['doc']) for action in actions], [
+            ('1', 'update', {'normalized_variants': ['new delhi', 'delhi']}),
+            ('3', 'update', {'normalized_variants': ['pune', 'poona']}),
+        ])
@@ -0,0 +1,88 @@
+from __future__ import absolute_import
+
+import threading
+import time
+
+from django.test import SimpleTestCase
+
+from datastore.exceptions import DataStoreRequestException, SingleFlightTimeoutException
+from datastore.single_flight import SingleFlight, single_flight_key, wait_timeout
+
+
+class TestSingleFlight(SimpleTestCase):
+
+    def _run_concurrently(self, single_flight, key, func, callers=4, timeout=None):
+        """Start `callers` threads calling `single_flight.do` while the first call is in flight"""
+        results, errors = [], []
+
+        def call():
+            try:
+                results.append(single_flight.do(key, func, timeout=timeout))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=call) for _ in range(callers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_identical_calls_share_one_call(self):
+        single_flight = SingleFlight(name='test')
+        func_calls = []
+
+        def func():
+            func_calls.append(1)
+            time.sleep(0.2)
+            return [{'city': {'mumbai': 'Mumbai'}}]
+
+        results, errors = self._run_concurrently(single_flight, 'key', func)
+        self.assertEqual((len(func_calls), errors), (1, []))
+        self.assertEqual(results, [[{'city': {'mumbai': 'Mumbai'}}]] * 4)
+        # every caller gets its own copy of the result
+        self.assertEqual(len({id(result) for result in results}), 4)
+        self.assertEqual((single_flight.calls, single_flight.coalesced_calls), (1, 3))
+
+        # nothing is cached once the call is done
+        self.assertEqual(single_flight.do('key', lambda: 'again'), 'again')
+
+    def test_error_is_raised_in_all_callers(self):
+        single_flight = SingleFlight(name='test')
+        error = DataStoreRequestException('failed', engine='elasticsearch', request='{}')
+
+        def func():
+            time.sleep(0.2)
+            raise error
+
+        results, errors = self._run_concurrently(single_flight, 'key', func)
+        self.assertEqual((results, errors), ([], [error] * 4))
+
+    def test_caller_that_ran_the_call_gets_a_copy(self):
+        single_flight = SingleFlight(name='test')
+        result = [{'city': {'mumbai': 'Mumbai'}}]
+        self.assertEqual(single_flight.do('key', lambda: result), result)
+        self.assertIsNot(single_flight.do('key', lambda: result), result)
+
+    def test_wait_timeout_covers_retries(self):
+        self.assertEqual(wait_timeout({'request_timeout': 5, 'max_retries': 1}), 10)
+        self.assertEqual(wait_timeout({}), 80)
+
+    def test_waiters_time_out(self):
+        single_flight = SingleFlight(name='test')
+        release = threading.Event()
+        leader = threading.Thread(target=single_flight.do, args=('key', release.wait))
+        leader.start()
+        time.sleep(0.05)
+        with self.assertRaises(SingleFlightTimeoutException):
+            single_flight.do('key', lambda: None, timeout=0.05)
+        release.set()
+        leader.join()
+
+    def test_single_flight_key(self):
+        self.assertEqual(single_flight_key([['city']], [['mumbai']], 1, 'en'),
+                         single_flight_key([['city']], [['mumbai']], 1, 'en'))
+        self.assertNotEqual(single_flight_key([['city']], [['mumbai']], 1, 'en'),
+                            single_flight_key([['city']], [['mumbai']], 2, 'en'))
+        self.assertEqual(single_flight_key('city', size=1, fuzziness=2),
+                         single_flight_key('city', fuzziness=2, size=1))
@@ -0,0 +1,121 @@
+from __future__ import absolute_import
+
+import gzip
+import json
+import threading
+
+import mock
+from django.test import SimpleTestCase
+from six.moves import BaseHTTPServer, socketserver
+
+from datastore.elastic_search import transport
+
+
+class FakeESHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    bodies = []
+
+    def log_message(self, *args):
+        pass
+
+    def _respond(self, payload):
+        data = json.dumps(payload).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(data)
+
+    def do_HEAD(self):
+        self._respond({})
+
+    def do_GET(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        self.bodies.append((self.headers.get('Content-Encoding'), body.decode('utf-8')))
+        self._respond({'responses': []})
+
+
+class FakeESServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class TestTransport(SimpleTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        super(TestTransport, cls).setUpClass()
+        cls.server = FakeESServer(('127.0.0.1', 0), FakeESHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.daemon = True
+        cls.server_thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super(TestTransport, cls).tearDownClass()
+
+    def setUp(self):
+        transport.clear_clients()
+        FakeESHandler.bodies = []
+        self.settings = {'host': '127.0.0.1', 'port': self.server.server_address[1], 'es_alias': 'test_alias',
+                         'timeout': 5}
+
+    def tearDown(self):
+        transport.clear_clients()
+
+    def test_one_client_per_settings(self):
+        client = transport.get_client(**self.settings)
+        self.assertIsNotNone(client)
+        self.assertIs(transport.get_client(**self.settings), client)
+        self.assertIsNot(transport.get_client(**dict(self.settings, es_alias='other_alias')), client)
+        self.assertEqual(transport.pool_stats()['clients'], 2)
+
+    def test_failed_ping_is_not_cached(self):
+        with mock.patch('datastore.elastic_search.transport.Elasticsearch.ping', return_value=False):
+            self.assertIsNone(transport.get_client(**self.settings))
+        self.assertIsNotNone(transport.get_client(**self.settings))
+
+    def test_ping_without_lock(self):
+        def ping(*args, **kwargs):
+            self.assertFalse(transport._clients_lock.locked())
+            return True
+
+        with mock.patch('datastore.elastic_search.transport.Elasticsearch.ping', side_effect=ping):
+            self.assertIsNotNone(transport.get_client(**self.settings))
+
+    def test_caller_transport_settings_are_kept(self):
+        client = transport.get_client(sniffer_timeout=60, **self.settings)
+        self.assertEqual(client.transport.sniffer_timeout, 60)
+        self.assertFalse(client.transport.sniff_on_connection_fail)
+
+    def test_no_nodes(self):
+        self.assertIsNone(transport.get_client(es_alias='test_alias'))
+
+    def test_connections_are_reused(self):
+        client = transport.get_client(**self.settings)
+        for _ in range(5):
+            client.msearch(body='{}\n{"query": {"match_all": {}}}\n')
+        pool, = transport.pool_stats()['pools']
+        self.assertTrue(pool['pooled'])
+        self.assertEqual(pool['maxsize'], transport.ES_POOL_MAXSIZE)
+        self.assertEqual(pool['connections_opened'], 1)
+        self.assertEqual(pool['requests'], 6)
+        self.assertEqual(pool['requests_on_reused_connections'], 5)
+        self.assertEqual(pool['idle'], 1)
+        self.assertNotIn('compressed_requests', pool)
+
+    def test_large_bodies_are_compressed(self):
+        with mock.patch('datastore.elastic_search.transport.ES_COMPRESS_MIN_BYTES', 100):
+            client = transport.get_client(**self.settings)
+        small_body = '{}\n{"query": {"match_all": {}}}\n'
+        large_body = '{}\n{"query": {"match": {"variants": "%s"}}}\n' % ('mumbai ' * 100)
+        client.msearch(body=small_body)
+        client.msearch(body=large_body)
+        self.assertEqual(FakeESHandler.bodies, [(None, small_body), ('gzip', large_body)])
+        pool, = transport.pool_stats()['pools']
+        self.assertEqual(pool['compressed_requests'], 1)
+        self.assertLess(pool['compressed_bytes_out'], pool['compressed_bytes_in'])
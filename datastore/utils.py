@@ -3,6 +3,8 @@ import csv
 import os
 from collections import defaultdict
 
+from datastore.constants import NORMALIZED_VARIANTS_FIELD
+
 
 def read_csv(file_path):
     """
@@ -56,3 +58,28 @@ def get_files_from_directory(directory_path):
         return []
     return [f for f in os.listdir(directory_path) if
             os.path.isfile(os.path.join(directory_path, f)) and f.endswith('.csv')]
+
+
+def get_normalized_variants(source):
+    """
+    Map the variants of an entity data document to their normalized forms stored at indexing time (see
+    `lib.nlp.token_cache.normalized_variant`)
+
+    Args:
+        source: `_source` of the document, with `variants` and `normalized_variants`
+
+    Returns:
+        A dictionary mapping each variant, with runs of whitespace collapsed to a single space, to its normalized
+        form. Empty if the document has no (or outdated) normalized forms
+
+    Example:
+        get_normalized_variants({'variants': ['New  Delhi', 'Delhi'], 'normalized_variants': ['new delhi', 'delhi']})
+
+        Output:
+            {'New Delhi': 'new delhi', 'Delhi': 'delhi'}
+    """
+    variants = source.get('variants') or []
+    normalized_variants = source.get(NORMALIZED_VARIANTS_FIELD) or []
+    if len(variants) != len(normalized_variants):
+        return {}
+    return {u' '.join(variant.split()): normalized for variant, normalized in zip(variants, normalized_variants)}
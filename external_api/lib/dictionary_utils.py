@@ -249,10 +249,10 @@ def update_entity_records(entity_name, data):
     records_to_create = data.get('edited', [])
     replace_data = data.get('replace')
 
+    datastore_obj = DataStore()
     if replace_data:
-        # TODO: Delete everything for the `entity_name` without having to fetch values first!
-        # https://www.elastic.co/guide/en/elasticsearch/reference/5.6/docs-delete-by-query.html
-        values_to_delete = get_entity_unique_values(entity_name)
+        values_to_delete = []
+        datastore_obj.delete_entity(entity_name=entity_name)
     else:
         values_to_delete = [record['word'] for record in records_to_delete]
         values_to_delete.extend([record['word'] for record in records_to_create])
@@ -268,7 +268,7 @@ def update_entity_records(entity_name, data):
                 })
 
     # delete words
-    delete_records_by_values(entity_name=entity_name, values=values_to_delete)
+    if values_to_delete:
+        delete_records_by_values(entity_name=entity_name, values=values_to_delete)
 
-    datastore_obj = DataStore()
     datastore_obj.add_entity_data(entity_name, value_variants_to_create)
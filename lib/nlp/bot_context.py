@@ -0,0 +1,97 @@
+# coding=utf-8
+"""
+Classification of the bot message (the question the bot asked before the user's message) into the context hints
+detectors use to label what they find.
+
+Date detectors mark a lone date as departure or return date when the bot asked for one, the city detector does the
+same for departure and arrival cities, time detectors accept bare hours when the bot asked for a time and date
+detectors prefer the past century for two digit years when the bot asked for a date of birth. Bots send a small,
+fixed set of prompts over and over, so the classification of each distinct bot message is kept in a bounded process
+wide LRU cache and the patterns are compiled once at import.
+"""
+from __future__ import absolute_import
+
+import collections
+import re
+import threading
+
+BotContext = collections.namedtuple('BotContext', ['departure_date', 'return_date', 'departure_city', 'arrival_city',
+                                                   'time', 'date_of_birth'])
+
+# Context of an empty or missing bot message, nothing is hinted
+NO_BOT_CONTEXT = BotContext(departure_date=False, return_date=False, departure_city=False, arrival_city=False,
+                            time=False, date_of_birth=False)
+
+# Max number of distinct bot messages whose classification is kept in memory
+BOT_CONTEXT_CACHE_SIZE = 1024
+
+_DEPARTURE_DATE_PATTERN = re.compile(u'traveling on|going on|starting on|departure date|date of travel|'
+                                     u'check in date|check-in date|date of check-in|date of departure\\.|'
+                                     u'जाने|जाऊँगा|जाना', flags=re.UNICODE)
+_RETURN_DATE_PATTERN = re.compile(u'traveling back|coming back|returning back|returning on|return date|'
+                                  u'arrival date|check out date|check-out date|date of check-out|check out|'
+                                  u'आने|आगमन|अनेका|रिटर्न', flags=re.UNICODE)
+_DEPARTURE_CITY_PATTERN = re.compile(u'departure city|origin city|origin|'
+                                     u'traveling from|leaving from|flying from|travelling from|'
+                                     u'कहां से', flags=re.UNICODE)
+# ख़तम is matched both with the nukta as a combining character and precomposed
+_ARRIVAL_CITY_PATTERN = re.compile(u'traveling to|travelling to|arrival city|'
+                                   u'arrival|destination city|destination|leaving to|flying to|'
+                                   u'कहां जाना|\u0916\u093c\u0924\u092e|\u0959\u0924\u092e', flags=re.UNICODE)
+# searched in the lower cased bot message
+_TIME_PATTERN = re.compile(u'time', flags=re.UNICODE)
+_DATE_OF_BIRTH_PATTERN = re.compile(u'birth|bday|dob|born', flags=re.UNICODE)
+
+_bot_context_cache = collections.OrderedDict()
+_bot_context_cache_lock = threading.Lock()
+
+
+def _classify(bot_message):
+    departure_date = _DEPARTURE_DATE_PATTERN.search(bot_message) is not None
+    departure_city = _DEPARTURE_CITY_PATTERN.search(bot_message) is not None
+    return BotContext(
+        departure_date=departure_date,
+        return_date=not departure_date and _RETURN_DATE_PATTERN.search(bot_message) is not None,
+        departure_city=departure_city,
+        arrival_city=not departure_city and _ARRIVAL_CITY_PATTERN.search(bot_message) is not None,
+        time=_TIME_PATTERN.search(bot_message.lower()) is not None,
+        date_of_birth=_DATE_OF_BIRTH_PATTERN.search(bot_message) is not None,
+    )
+
+
+def classify_bot_message(bot_message):
+    """
+    Get the context hints of a bot message. Departure hints take precedence, a bot message that asks for both a
+    departure and a return date (or city) only hints the departure
+
+    Args:
+        bot_message (str or None): message sent by the bot before the text detected on
+
+    Returns:
+        BotContext: namedtuple of booleans
+            departure_date: bot asked for a departure / check in date
+            return_date: bot asked for a return / check out date
+            departure_city: bot asked for a departure / origin city
+            arrival_city: bot asked for an arrival / destination city
+            time: bot asked for a time
+            date_of_birth: bot asked for a date of birth
+
+    Example:
+        >>> classify_bot_message(u'What is your departure date?').departure_date
+        True
+    """
+    if not bot_message:
+        return NO_BOT_CONTEXT
+
+    with _bot_context_cache_lock:
+        bot_context = _bot_context_cache.get(bot_message)
+        if bot_context is not None:
+            _bot_context_cache.move_to_end(bot_message)
+            return bot_context
+
+    bot_context = _classify(bot_message)
+    with _bot_context_cache_lock:
+        _bot_context_cache[bot_message] = bot_context
+        if len(_bot_context_cache) > BOT_CONTEXT_CACHE_SIZE:
+            _bot_context_cache.popitem(last=False)
+    return bot_context
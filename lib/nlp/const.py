@@ -1,5 +1,8 @@
 from __future__ import absolute_import
 import os
+
+from django.utils.functional import SimpleLazyObject
+
 from lib.nlp.etc import store_data_in_list
 from lib.nlp.ngram import Ngram
 from lib.nlp.stemmer import Stemmer, PORTER_STEMMER
@@ -7,9 +10,11 @@ from lib.nlp.tokenizer import Tokenizer, PRELOADED_NLTK_TOKENIZER, LUCENE_STANDA
 from lib.nlp.regexreplace import RegexReplace
 from chatbot_ner.settings import BASE_DIR
 
-
-stemmer = Stemmer(PORTER_STEMMER)
-nltk_tokenizer = Tokenizer(PRELOADED_NLTK_TOKENIZER)
+# Objects that need nltk or file I/O to build are wrapped in `SimpleLazyObject` so that they get built on first use
+# instead of at import time. This keeps worker boot time and memory low for workers that never need them.
+# See `chatbot_ner.warmup` to build them ahead of time
+stemmer = SimpleLazyObject(lambda: Stemmer(PORTER_STEMMER))
+nltk_tokenizer = SimpleLazyObject(lambda: Tokenizer(PRELOADED_NLTK_TOKENIZER))
 lucene_tokenizer = Tokenizer(LUCENE_STANDARD_TOKENIZER)
 whitespace_tokenizer = Tokenizer(WHITESPACE_TOKENIZER)
 # Currently we support only elasticsearch as datastore engine, so it safe to use lucene tokenizer as default
@@ -18,9 +23,9 @@ TOKENIZER = lucene_tokenizer
 
 # Creating list of stop words
 stop_word_path = os.path.join(BASE_DIR, 'lib', 'nlp', 'data', 'stop_words.csv')  # file containing words to remove
-stop_words = store_data_in_list(stop_word_path)
+stop_words = SimpleLazyObject(lambda: store_data_in_list(stop_word_path))
 
-ngram_object = Ngram()
+ngram_object = SimpleLazyObject(Ngram)
 
 punctuation_removal_list = [(r'[^\w\'\/]', r' '), (r'\'', r'')]
-regx_punctuation_removal = RegexReplace(punctuation_removal_list)
+regx_punctuation_removal = SimpleLazyObject(lambda: RegexReplace(punctuation_removal_list))
@@ -1,5 +1,4 @@
 from __future__ import absolute_import
-import nltk
 
 
 class Ngram(object):
@@ -36,6 +35,8 @@ class Ngram(object):
             list of str: List of ngrams formed from the given word list except for those that have all their tokes in
                          stop words list
         """
+        import nltk
+
         stop_word_set = set(stop_word_list) if stop_word_list else []
         all_ngrams = nltk.ngrams(word_list, n)
         ngram_list = []
@@ -1,5 +1,4 @@
 from __future__ import absolute_import
-import nltk
 
 # constants
 from lib.singleton import Singleton
@@ -11,11 +10,22 @@ NLTK_AP_TAGGER = 'NLTK_AP_TAGGER'
 
 
 class APTaggerUtils(object):
-    tagger = nltk.PerceptronTagger()
+    # Loaded on first use and shared by all instances, loading the perceptron model pickle is slow
+    tagger = None
+
+    @classmethod
+    def get_tagger(cls):
+        if cls.tagger is None:
+            import nltk
+
+            cls.tagger = nltk.PerceptronTagger()
+        return cls.tagger
 
     def tag(self, tokens, tagset=None):
-        tagged_tokens = APTaggerUtils.tagger.tag(tokens)
+        tagged_tokens = APTaggerUtils.get_tagger().tag(tokens)
         if tagset:
+            import nltk
+
             tagged_tokens = [(token, nltk.map_tag('en-ptb', tagset, tag)) for (token, tag) in tagged_tokens]
         return tagged_tokens
 
@@ -40,6 +50,8 @@ class POS(six.with_metaclass(Singleton, object)):
     def __nltk_maxent_tagger(self):
         if not self.path:
             self.path = DEFAULT_NLTK_TAGGER_PATH
+        import nltk
+
         return nltk.data.load(self.path).tag
 
     def __nltk_ap_tagger(self):
@@ -1,9 +1,16 @@
+import collections
+import threading
+
 import six
 from lib.singleton import Singleton
 from language_utilities.constant import ENGLISH_LANG, SPANISH_LANG, DUTCH_LANG, GERMAN_LANG, FRENCH_LANG
 
-import spacy
-from spacy.tokenizer import Tokenizer
+# Pipes needed to get pos tags, everything else is disabled while tagging. spacy 2 models set `pos_` in the tagger,
+# spacy 3 models need the attribute_ruler or morphologizer for it, and their tagger listens to the tok2vec pipe
+TAGGING_PIPES = ('tok2vec', 'tagger', 'attribute_ruler', 'morphologizer')
+DEFAULT_PIPE_BATCH_SIZE = 64
+# Max number of (language, text) pairs whose tags are kept in memory
+TAG_CACHE_SIZE = 4096
 
 
 class SpacyUtils(six.with_metaclass(Singleton, object)):
@@ -24,6 +31,41 @@ class SpacyUtils(six.with_metaclass(Singleton, object)):
             SPANISH_LANG: None
         }
 
+        self._tag_cache = collections.OrderedDict()
+        self._tag_cache_lock = threading.Lock()
+
+    def get_model(self, language):
+        """
+        Get the spacy model for the given language, loading it (and importing spacy) on first use
+
+        Args:
+            language: language code of the model to load
+
+        Returns:
+            spacy.language.Language: loaded spacy pipeline with parser and ner disabled
+        """
+        nlp = self.spacy_language_to_model[language]['model']
+        if not nlp:
+            import spacy
+
+            spacy_model_name = self.spacy_language_to_model[language]['name']
+            nlp = spacy.load(spacy_model_name, disable=['parser', 'ner'])
+            self.spacy_language_to_model[language]['model'] = nlp
+        return nlp
+
+    def _get_cached_tags(self, language, text):
+        with self._tag_cache_lock:
+            tags = self._tag_cache.get((language, text))
+            if tags is not None:
+                self._tag_cache.move_to_end((language, text))
+            return tags
+
+    def _cache_tags(self, language, text, tags):
+        with self._tag_cache_lock:
+            self._tag_cache[(language, text)] = tags
+            if len(self._tag_cache) > TAG_CACHE_SIZE:
+                self._tag_cache.popitem(last=False)
+
     def tag(self, text, language):
         """
         Pos tag using spacy model for given languages
@@ -34,17 +76,36 @@ class SpacyUtils(six.with_metaclass(Singleton, object)):
         Returns:
             List[Tuples(str, str)]: Returns a list of tuples of (token, pos_tag)
         """
-        spacy_model_name = self.spacy_language_to_model[language]['name']
-        nlp = self.spacy_language_to_model[language]['model']
-        if not nlp:
-            nlp = spacy.load(spacy_model_name, disable=['parser', 'ner'])
-            self.spacy_language_to_model[language]['model'] = nlp
-        spacy_doc = nlp(text)
-        tokens = []
-        for spacy_token in spacy_doc:
-            token = (spacy_token.text, spacy_token.pos_)
-            tokens.append(token)
-        return tokens
+        return self.tag_bulk(texts=[text], language=language)[0]
+
+    def tag_bulk(self, texts, language, batch_size=DEFAULT_PIPE_BATCH_SIZE, n_process=1):
+        """
+        Pos tag multiple texts in batches with `nlp.pipe`, running only the pipes needed for pos tags.
+        Tags of recently seen texts are cached per language and repeated texts are tagged only once.
+
+        Args:
+            texts: list of texts to run pos tagging for
+            language: source language of texts
+            batch_size: number of texts spacy processes together
+            n_process: number of processes spacy uses to tag, texts are tagged in the current process when 1
+
+        Returns:
+            List[List[Tuples(str, str)]]: Returns a list of tuples of (token, pos_tag) for each text
+        """
+        cached_tags = [self._get_cached_tags(language, text) for text in texts]
+        tags_by_text = {}
+        uncached_texts = list(collections.OrderedDict.fromkeys(
+            text for text, tags in zip(texts, cached_tags) if tags is None))
+        if uncached_texts:
+            nlp = self.get_model(language)
+            disable = [pipe_name for pipe_name in nlp.pipe_names if pipe_name not in TAGGING_PIPES]
+            spacy_docs = nlp.pipe(uncached_texts, batch_size=batch_size, n_process=n_process, disable=disable)
+            for text, spacy_doc in zip(uncached_texts, spacy_docs):
+                tags = tuple((spacy_token.text, spacy_token.pos_) for spacy_token in spacy_doc)
+                self._cache_tags(language, text, tags)
+                tags_by_text[text] = tags
+
+        return [list(tags if tags is not None else tags_by_text[text]) for text, tags in zip(texts, cached_tags)]
 
     def tokenize(self, text, language):
         """
@@ -60,11 +121,9 @@ class SpacyUtils(six.with_metaclass(Singleton, object)):
         tokenizer = self.tokenizers[language]
 
         if not tokenizer:
-            spacy_model_name = self.spacy_language_to_model[language]['name']
-            nlp = self.spacy_language_to_model[language]['model']
-            if not nlp:
-                nlp = spacy.load(spacy_model_name, disable=['parser', 'ner'])
-                self.spacy_language_to_model[language]['model'] = nlp
+            from spacy.tokenizer import Tokenizer
+
+            nlp = self.get_model(language)
             tokenizer = Tokenizer(nlp.vocab)
             self.tokenizers[language] = tokenizer
 
@@ -0,0 +1,143 @@
+"""
+Replace detected substrings of a text without compiling a regex per detected substring.
+
+Detectors replace every detected substring with their tag in `tagged_text` and drop it from `processed_text`. This
+used to be done by compiling a boundary regex around each escaped substring. `find_delimited` instead looks for
+the literal with `str.find` and checks the characters on either side of it, the resulting span is then rewritten by
+slicing (`replace_span`).
+
+Substrings that must be delimited by `\\b` word boundaries (Unicode word boundaries with the `regex` lib, which can not
+be reproduced with simple character checks) go through `replace_words`, which skips texts the literal does not
+occur in and reuses compiled patterns from a bounded process wide LRU cache.
+"""
+from __future__ import absolute_import
+
+import collections
+import threading
+
+try:
+    import regex as re
+
+    _re_flags = re.UNICODE | re.V1 | re.WORD
+except ImportError:
+    import re
+
+    _re_flags = re.UNICODE
+
+# Max number of compiled word boundary patterns kept in memory
+WORD_PATTERN_CACHE_SIZE = 5000
+
+_word_pattern_cache = collections.OrderedDict()
+_word_pattern_cache_lock = threading.Lock()
+
+
+def find_delimited(text, literal, preceding_characters, following_characters, start=0):
+    """
+    Find the first occurrence of literal in text that is preceded by start of text, whitespace or one of
+    `preceding_characters` and followed by end of text, whitespace or one of `following_characters`.
+
+    Same as searching for `(?:^|(?<=[\\s<preceding_characters>])){literal}(?=[\\s<following_characters>]|$)`
+
+    Args:
+        text (str): text to search in
+        literal (str): substring to find
+        preceding_characters (set or str): characters allowed right before the literal apart from whitespace
+        following_characters (set or str): characters allowed right after the literal apart from whitespace
+        start (int): offset in text to start searching from
+
+    Returns:
+        tuple of (int, int) or None: start (inclusive) and end (exclusive) offsets of the occurrence,
+            None if there is no delimited occurrence
+
+    Example:
+        >>> find_delimited(u'12 2 ,2', u'2', preceding_characters=u',', following_characters=u'')
+        (3, 4)
+    """
+    text_length = len(text)
+    index = text.find(literal, start)
+    while index != -1:
+        end = index + len(literal)
+        if (index == 0 or text[index - 1].isspace() or text[index - 1] in preceding_characters) and \
+                (end == text_length or text[end].isspace() or text[end] in following_characters):
+            return index, end
+        if index == text_length:
+            break
+        index = text.find(literal, index + 1)
+    return None
+
+
+def replace_span(text, span, replacement):
+    """
+    Replace the part of text at span with replacement
+
+    Args:
+        text (str): text to rewrite
+        span (tuple of (int, int)): start (inclusive) and end (exclusive) offsets of the part to replace
+        replacement (str): text to put in place of the span
+
+    Returns:
+        str: rewritten text
+    """
+    start, end = span
+    return text[:start] + replacement + text[end:]
+
+
+def replace_delimited(text, literal, replacement, preceding_characters, following_characters):
+    """
+    Replace the first delimited occurrence of literal in text (see `find_delimited`) with replacement
+
+    Args:
+        text (str): text to rewrite
+        literal (str): substring to replace
+        replacement (str): text to put in place of the literal
+        preceding_characters (set or str): characters allowed right before the literal apart from whitespace
+        following_characters (set or str): characters allowed right after the literal apart from whitespace
+
+    Returns:
+        str: rewritten text, same object as text if there is no delimited occurrence of literal
+    """
+    span = find_delimited(text, literal, preceding_characters, following_characters)
+    if span is None:
+        return text
+    return replace_span(text, span, replacement)
+
+
+def word_boundary_pattern(literal):
+    """
+    Get compiled `\\b<literal>\\b` pattern, compiled patterns are cached across calls
+
+    Args:
+        literal (str): substring the pattern should match
+
+    Returns:
+        Pattern: compiled pattern
+    """
+    with _word_pattern_cache_lock:
+        pattern = _word_pattern_cache.get(literal)
+        if pattern is not None:
+            _word_pattern_cache.move_to_end(literal)
+            return pattern
+
+    pattern = re.compile(r'\b%s\b' % re.escape(literal), flags=_re_flags)
+    with _word_pattern_cache_lock:
+        _word_pattern_cache[literal] = pattern
+        if len(_word_pattern_cache) > WORD_PATTERN_CACHE_SIZE:
+            _word_pattern_cache.popitem(last=False)
+    return pattern
+
+
+def replace_words(text, literal, replacement):
+    """
+    Replace all occurrences of literal delimited by word boundaries in text with replacement
+
+    Args:
+        text (str): text to rewrite
+        literal (str): substring to replace
+        replacement (str): text to put in place of the literal, backslash escapes are not processed
+
+    Returns:
+        str: rewritten text
+    """
+    if literal not in text:
+        return text
+    return word_boundary_pattern(literal).sub(lambda _: replacement, text)
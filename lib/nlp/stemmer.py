@@ -1,5 +1,4 @@
 from __future__ import absolute_import
-from nltk.stem.porter import PorterStemmer
 
 # constants
 from lib.singleton import Singleton
@@ -94,6 +93,8 @@ class Stemmer(six.with_metaclass(Singleton, object)):
         Returns:
             Initializes PorterStemmer
         """
+        from nltk.stem.porter import PorterStemmer
+
         self.stemmer = PorterStemmer()
 
     def get_stemmer(self):
@@ -0,0 +1,55 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import collections
+
+import mock
+from django.test import SimpleTestCase
+
+from lib.nlp import bot_context
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
+from ner_v2.detectors.temporal.date.date_detection import DateAdvancedDetector
+from ner_v2.detectors.temporal.time.time_detection import TimeDetector
+
+
+class BotContextTest(SimpleTestCase):
+    def test_classify_bot_message(self):
+        expected_contexts = [
+            (u'What is your departure date?', {'departure_date': True}),
+            (u'Please tell me the return date', {'return_date': True}),
+            (u'departure date and return date please', {'departure_date': True}),
+            (u'आप कब वापस आने वाले हैं', {'return_date': True}),
+            (u'Which is your origin city?', {'departure_city': True}),
+            (u'What is your destination?', {'arrival_city': True}),
+            (u'आप कहां जाना चाहते हैं', {'departure_date': True, 'arrival_city': True}),
+            (u'At what Time should I book?', {'time': True}),
+            (u'What is your date of birth?', {'date_of_birth': True}),
+            (u'How can I help you?', {}),
+        ]
+        for message, flags in expected_contexts:
+            self.assertEqual(classify_bot_message(message), NO_BOT_CONTEXT._replace(**flags), message)
+        self.assertIs(classify_bot_message(None), NO_BOT_CONTEXT)
+        self.assertIs(classify_bot_message(u''), NO_BOT_CONTEXT)
+
+    def test_bot_messages_are_classified_once(self):
+        with mock.patch.object(bot_context, '_bot_context_cache', collections.OrderedDict()), \
+                mock.patch.object(bot_context, 'BOT_CONTEXT_CACHE_SIZE', 2):
+            with mock.patch.object(bot_context, '_classify', wraps=bot_context._classify) as classify:
+                for _ in range(3):
+                    classify_bot_message(u'What is your departure date?')
+                    classify_bot_message(u'What time?')
+                self.assertEqual(classify.call_count, 2)
+                classify_bot_message(u'Where to?')
+                self.assertEqual(classify.call_count, 3)
+            self.assertEqual(list(bot_context._bot_context_cache), [u'What time?', u'Where to?'])
+
+    def test_detectors_use_bot_context(self):
+        date_detector = DateAdvancedDetector(entity_name='date', language='en',
+                                             bot_message=u'What is your return date?')
+        date_dicts, _ = date_detector.detect_entity(u'5th march')
+        self.assertTrue(date_dicts[0]['to'])
+
+        time_detector = TimeDetector(entity_name='time', language='en')
+        self.assertEqual(time_detector.detect_entity(u'5')[1], [])
+        time_detector.set_bot_message(u'What time should I book the table for?')
+        self.assertEqual(time_detector.detect_entity(u'5')[1], [u'5'])
@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+from django.test import SimpleTestCase
+
+from chatbot_ner.profile_imports import BASE_DIR, parse_importtime
+from chatbot_ner.warmup import get_memory_usage, warm_up
+
+
+class LazyLoadingTest(SimpleTestCase):
+    def test_api_import_does_not_load_heavy_libraries(self):
+        """Test that importing the apis does not import nltk, spacy or pandas"""
+        script = ("import os, sys\n"
+                  "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'chatbot_ner.settings')\n"
+                  "import django\n"
+                  "django.setup()\n"
+                  "import lib.nlp.const, ner_v1.api, ner_v2.api\n"
+                  "print(sorted(name for name in ('nltk', 'spacy', 'pandas') if name in sys.modules))\n")
+        output = subprocess.check_output([sys.executable, '-c', script], cwd=BASE_DIR, universal_newlines=True)
+        self.assertEqual(output.strip().splitlines()[-1], '[]')
+
+    def test_parse_importtime(self):
+        stderr = ("import time: self [us] | cumulative | imported package\n"
+                  "import time:       120 |        120 |     lib.singleton\n"
+                  "import time:      1500 |       1620 |   lib.nlp.tokenizer\n"
+                  "import time:       300 |       1920 | lib.nlp.const\n")
+        timings = parse_importtime(stderr)
+        self.assertEqual([timing.module for timing in timings], ['lib.singleton', 'lib.nlp.tokenizer', 'lib.nlp.const'])
+        self.assertEqual([timing.depth for timing in timings], [2, 1, 0])
+        self.assertEqual(timings[2].cumulative_us, 1920)
+
+    def test_warm_up_skips_unknown_components(self):
+        timings = warm_up(['language_data', 'unknown_component'])
+        self.assertEqual(list(timings.keys()), ['language_data'])
+
+    def test_get_memory_usage(self):
+        usage = get_memory_usage()
+        if sys.platform.startswith('linux'):
+            self.assertGreater(usage['rss_kb'], 0)
+            self.assertEqual(usage['private_kb'], usage['rss_kb'] - usage['shared_kb'])
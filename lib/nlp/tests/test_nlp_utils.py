@@ -1,4 +1,5 @@
 
+import mock
 from django.test import TestCase
 from lib.nlp.spacy_utils import SpacyUtils
 
@@ -26,3 +27,26 @@ class SpacyUtilsTest(TestCase):
         english_tokenizer_loaded = self.spacy_utils.tokenizers['en'] is not None
         self.assertTrue(english_tokenizer_loaded, 'English model not loaded')
         self.assertTrue(english_model_loaded, 'English tokenizer not loaded')
+
+    def test_tag_bulk_pipes_unique_uncached_texts_with_only_tagging_pipes(self):
+        def pipe(texts, **kwargs):
+            for text in texts:
+                yield [mock.Mock(text=token, pos_='PROPN') for token in text.split()]
+
+        nlp = mock.Mock(pipe_names=['tok2vec', 'tagger', 'parser', 'ner'])
+        nlp.pipe.side_effect = pipe
+        self.spacy_utils._tag_cache.clear()
+        with mock.patch.object(self.spacy_utils, 'get_model', return_value=nlp):
+            output = self.spacy_utils.tag_bulk(texts=['hola juan', 'soy ana', 'hola juan'], language='es')
+            self.assertEqual(output, [[('hola', 'PROPN'), ('juan', 'PROPN')],
+                                      [('soy', 'PROPN'), ('ana', 'PROPN')],
+                                      [('hola', 'PROPN'), ('juan', 'PROPN')]])
+            nlp.pipe.assert_called_once()
+            args, kwargs = nlp.pipe.call_args
+            self.assertEqual(args[0], ['hola juan', 'soy ana'])
+            self.assertEqual(kwargs['disable'], ['parser', 'ner'])
+
+            # cached texts are not tagged again
+            self.assertEqual(self.spacy_utils.tag(text='soy ana', language='es'), [('soy', 'PROPN'), ('ana', 'PROPN')])
+            nlp.pipe.assert_called_once()
+        self.spacy_utils._tag_cache.clear()
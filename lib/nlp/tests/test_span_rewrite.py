@@ -0,0 +1,65 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import random
+
+import mock
+from django.test import SimpleTestCase
+
+from lib.nlp import span_rewrite
+from lib.nlp.span_rewrite import find_delimited, replace_delimited, replace_words
+from ner_v2.detectors.numeral.number.standard_number_detector import BaseNumberDetector
+
+try:
+    import regex as re
+
+    _re_flags = re.UNICODE | re.V1 | re.WORD
+except ImportError:
+    import re
+
+    _re_flags = re.UNICODE
+
+
+class SpanRewriteTest(SimpleTestCase):
+    preceding_characters = BaseNumberDetector._SPAN_PRECEDING_CHARACTERS
+    following_characters = BaseNumberDetector._SPAN_FOLLOWING_CHARACTERS
+
+    def _reference_search(self, text, literal):
+        pattern = re.compile(BaseNumberDetector._SPAN_BOUNDARY_TEMPLATE.format(re.escape(literal)), flags=_re_flags)
+        match = pattern.search(text)
+        return match.span() if match else None
+
+    def test_find_delimited_examples(self):
+        self.assertEqual(find_delimited(u'12 2 ,2', u'2', u',', u''), (3, 4))
+        self.assertEqual(find_delimited(u'buy 2.5kg', u'2.5', u'', u''), None)
+        self.assertEqual(replace_delimited(u'i want 2, not 22 or 2', u'2', u'__number__',
+                                           self.preceding_characters, self.following_characters),
+                         u'i want __number__, not 22 or 2')
+
+    def test_find_delimited_matches_boundary_template_on_random_texts(self):
+        alphabet = list(u'1225ab') * 3 + list(u'   \t\n') + list(u'"\',-?!%.:_') + list(u'२३')
+        rng = random.Random(20330)
+        for _ in range(3000):
+            text = u''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 30)))
+            literal = u''.join(rng.choice(u'12.5२') for _ in range(rng.randint(1, 3)))
+            self.assertEqual(find_delimited(text, literal, self.preceding_characters, self.following_characters),
+                             self._reference_search(text, literal), repr((text, literal)))
+
+    def test_replace_words_matches_word_boundary_sub(self):
+        texts = [u'new delhi to delhi, delhi6 and old-delhi', u'dr. ambedkar nagar', u'दिल्ली से मुंबई', u'a\\1 b']
+        literals = [u'delhi', u'dr. ambedkar', u'दिल्ली', u'a\\1', u'pune']
+        for text in texts:
+            for literal in literals:
+                pattern = re.compile(r'\b%s\b' % re.escape(literal), flags=_re_flags)
+                self.assertEqual(replace_words(text, literal, u'__city__'), pattern.sub(u'__city__', text))
+
+    def test_word_patterns_are_compiled_once(self):
+        with mock.patch.object(span_rewrite, '_word_pattern_cache', span_rewrite.collections.OrderedDict()), \
+                mock.patch.object(span_rewrite, 'WORD_PATTERN_CACHE_SIZE', 1):
+            with mock.patch.object(span_rewrite.re, 'compile', wraps=span_rewrite.re.compile) as compile_:
+                replace_words(u'go to pune', u'pune', u'__city__')
+                replace_words(u'pune to goa', u'pune', u'__city__')
+                replace_words(u'go to mumbai', u'pune', u'__city__')
+                self.assertEqual(compile_.call_count, 1)
+                replace_words(u'goa', u'goa', u'__city__')
+            self.assertEqual(list(span_rewrite._word_pattern_cache), [u'goa'])
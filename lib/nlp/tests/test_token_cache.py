@@ -0,0 +1,123 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import random
+
+import mock
+from django.test import SimpleTestCase
+
+from lib.nlp import token_cache
+from lib.nlp.const import TOKENIZER, whitespace_tokenizer
+from lib.nlp.token_cache import TokenCache, align_token_spans, find_token_sequence, tokenize_with_spans
+
+
+def _reference_tokens_and_indices(txt):
+    """Token offsets as computed by TextDetector._get_substring_from_processed_text before align_token_spans"""
+    txt = txt.rstrip() + ' __eos__'
+    processed_text_tokens = TOKENIZER.tokenize(txt)
+    processed_text_tokens_indices = []
+
+    offset = 0
+    for token in processed_text_tokens:
+        st = txt.index(token)
+        en = st + len(token)
+        prefix = txt[:en]
+        prefix_tokens = whitespace_tokenizer.tokenize(prefix)
+        if prefix and len(prefix_tokens) > 1 and prefix_tokens[0]:
+            if processed_text_tokens_indices:
+                s, e = processed_text_tokens_indices.pop()
+                e += len(prefix_tokens[0])
+                processed_text_tokens_indices.append((s, e))
+
+        txt = txt[en:]
+        processed_text_tokens_indices.append((offset + st, offset + en))
+        offset += en
+
+    processed_text_tokens.pop()
+    processed_text_tokens_indices.pop()
+    return processed_text_tokens, processed_text_tokens_indices
+
+
+def _reference_substring(text, matched_tokens):
+    n = len(matched_tokens)
+    tokens, indices = _reference_tokens_and_indices(text)
+    for i in range(len(tokens) - n + 1):
+        if tokens[i:i + n] == matched_tokens:
+            return text[indices[i][0]:indices[i + n - 1][1]]
+    return None
+
+
+class TokenCacheTest(SimpleTestCase):
+    texts = [
+        u' i want to order 1 pc hot & crispy ',
+        u'(A B) C',
+        u"don't go to mumbai's airport, go to dr. ambedkar nagar",
+        u'मुझे दिल्ली जाना है',
+        u'',
+        u'   ',
+    ]
+
+    def test_tokenize_with_spans_matches_tokenizer(self):
+        for text in self.texts:
+            tokenized = tokenize_with_spans(text)
+            self.assertEqual(list(tokenized.tokens), TOKENIZER.tokenize(text))
+            self.assertEqual([text[start:end] for start, end in tokenized.spans], list(tokenized.tokens))
+
+    def test_align_token_spans_examples(self):
+        aligned = align_token_spans(u' i want to order 1 pc hot & crispy ')
+        self.assertEqual(aligned.spans, ((1, 2), (3, 7), (8, 10), (11, 16), (17, 18), (19, 21), (22, 25), (28, 34)))
+        self.assertEqual(find_token_sequence(u'(a b) c', [u'b']), u'b)')
+        self.assertEqual(find_token_sequence(u'i like hot & crispy!', [u'hot', u'crispy']), u'hot & crispy!')
+        self.assertIsNone(find_token_sequence(u'i like hot & crispy', [u'cold']))
+
+    def test_align_token_spans_matches_reference_on_random_texts(self):
+        alphabet = list(u'abcxyz019') * 4 + list(u'     \t\n') * 2 + list(u"()&!.,'-_/:@#") + list(u'दिल्ली')
+        rng = random.Random(20161)
+        for _ in range(3000):
+            text = u''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+            tokens, indices = _reference_tokens_and_indices(text)
+            aligned = align_token_spans(text)
+            self.assertEqual(list(aligned.tokens), tokens, repr(text))
+            self.assertEqual(list(aligned.spans), indices, repr(text))
+
+            if tokens:
+                start = rng.randrange(len(tokens))
+                matched_tokens = tokens[start:rng.randint(start + 1, len(tokens))]
+                self.assertEqual(find_token_sequence(text, matched_tokens, aligned=aligned),
+                                 _reference_substring(text, matched_tokens), repr((text, matched_tokens)))
+
+    def test_texts_are_tokenized_once_per_cache(self):
+        cache = TokenCache()
+        with mock.patch.object(token_cache, 'tokenize_with_spans', wraps=tokenize_with_spans) as tokenize:
+            first = cache.tokenize(self.texts[0])
+            second = cache.tokenize(self.texts[0])
+            self.assertIs(first, second)
+            self.assertEqual(tokenize.call_count, 1)
+
+    def test_variant_cache_is_shared_and_bounded(self):
+        with mock.patch.object(token_cache, '_variant_cache', token_cache.collections.OrderedDict()), \
+                mock.patch.object(token_cache, 'VARIANT_CACHE_SIZE', 2):
+            self.assertEqual(TokenCache().normalize_variant(u'new  delhi'), u'new delhi')
+            self.assertIn(u'new  delhi', token_cache._variant_cache)
+            with mock.patch.object(token_cache, 'tokenize_with_spans') as tokenize:
+                self.assertEqual(TokenCache().tokenize_variant(u'new  delhi'), (u'new', u'delhi'))
+                tokenize.assert_not_called()
+
+            TokenCache().tokenize_variant(u'mumbai')
+            TokenCache().tokenize_variant(u'pune')
+            self.assertEqual(list(token_cache._variant_cache), [u'mumbai', u'pune'])
+
+    def test_normalized_variant(self):
+        self.assertEqual(token_cache.normalized_variant(u'Hot & Crispy  Chicken'), u'hot crispy chicken')
+        self.assertEqual(token_cache.normalized_variant(u'New-Delhi'), u'new delhi')
+        self.assertEqual(token_cache.normalized_variant(u''), u'')
+
+    def test_cached_normalized_variant_is_not_tokenized(self):
+        with mock.patch.object(token_cache, '_variant_cache', token_cache.collections.OrderedDict()):
+            token_cache.cache_normalized_variant(u'Hot & Crispy', u'hot crispy')
+            token_cache.cache_normalized_variant(u'', u'')
+            with mock.patch.object(token_cache, 'tokenize_with_spans') as tokenize:
+                self.assertEqual(TokenCache().tokenize_variant(u'hot & crispy'), (u'hot', u'crispy'))
+                self.assertEqual(TokenCache().normalize_variant(u'hot & crispy'), u'hot crispy')
+                self.assertEqual(TokenCache().tokenize_variant(u''), ())
+                tokenize.assert_not_called()
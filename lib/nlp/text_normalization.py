@@ -5,7 +5,7 @@ from six.moves import range
 from chatbot_ner.config import ner_logger
 from ner_v1.detectors.pattern.regex.data.character_constants import CHARACTER_CONSTANTS
 from ner_v2.detectors.numeral.constant import NUMBER_DETECTION_RETURN_DICT_VALUE
-from ner_v2.detectors.numeral.number.number_detection import NumberDetector
+from ner_v2.detectors.numeral.number.number_detection import get_shared_number_detector
 
 # Constants
 _re_flags = re.UNICODE | re.V1
@@ -132,12 +132,13 @@ def resolve_numerals(text, language) -> str:
         processed_text (str): modified text
     """
     processed_text = text
-    number_detector = NumberDetector('asr_dummy', language=language)
+    number_detector = get_shared_number_detector(language=language)
     # FIXME: Detection fails if text starts with '0' since number detector discards it
-    detected_numerals, original_texts = number_detector.detect_entity(text=text)
-    detected_numerals_hi, original_texts_hi = number_detector.detect_entity(text=text, language='hi')
-    detected_numerals.extend(detected_numerals_hi)
-    original_texts.extend(original_texts_hi)
+    number_detection_result = number_detector.detect_entity(text=text, entity_name='asr_dummy')
+    detected_numerals, original_texts = number_detection_result.numbers, number_detection_result.original_texts
+    number_detection_result_hi = number_detector.detect_entity(text=text, entity_name='asr_dummy')
+    detected_numerals.extend(number_detection_result_hi.numbers)
+    original_texts.extend(number_detection_result_hi.original_texts)
     for number, original_text in zip(detected_numerals, original_texts):
         substitution_reg = re.compile(re.escape(original_text), re.IGNORECASE)
         processed_text = substitution_reg.sub(number[NUMBER_DETECTION_RETURN_DICT_VALUE], processed_text)
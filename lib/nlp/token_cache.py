@@ -0,0 +1,258 @@
+"""
+Memoized lucene standard tokenization.
+
+Text detectors tokenize the same strings many times while processing one request: the message for the datastore
+query, every variant returned by the datastore for exact match checks and for sorting, and the message again when
+looking for a variant in it. `TokenCache` tokenizes each distinct string once per request, computing tokens and their
+character spans in a single `finditer` pass. Variants recur across requests (the same entity data is queried over and
+over), so their tokens are also kept in a bounded process wide LRU cache. `normalized_variant` is the form of a
+variant stored with the entity data at indexing time (`normalized_variants` field), text lookups that fetch it put the
+tokens in that cache with `cache_normalized_variant` instead of tokenizing variants again.
+
+`align_token_spans` maps tokens back to the part of the original text they came from in linear time, so that
+detected values can be reported with the special characters the tokenizer drops.
+"""
+from __future__ import absolute_import
+
+import collections
+import threading
+
+try:
+    import regex as re
+except ImportError:
+    import re
+
+from lib.nlp.tokenizer import LUCENE_STANDARD_TOKEN_PATTERN
+
+TokenizedText = collections.namedtuple('TokenizedText', ['tokens', 'spans'])
+
+# Max number of distinct variant strings whose tokens are kept in memory across requests
+VARIANT_CACHE_SIZE = 20000
+
+_NON_WHITESPACE_RUN_PATTERN = re.compile(r'\S+', flags=re.UNICODE)
+
+_variant_cache = collections.OrderedDict()
+_variant_cache_lock = threading.Lock()
+
+
+def tokenize_with_spans(text):
+    """
+    Tokenize text the same way as `lib.nlp.const.TOKENIZER` (lucene standard tokenizer) and get the character span
+    of each token
+
+    Args:
+        text (str): text to tokenize
+
+    Returns:
+        TokenizedText: namedtuple with
+            tokens (tuple of str): tokens of the text
+            spans (tuple of (int, int)): start (inclusive) and end (exclusive) offsets of each token in text
+
+    Example:
+        >>> tokenize_with_spans(u'hot & crispy')
+        TokenizedText(tokens=(u'hot', u'crispy'), spans=((0, 3), (6, 12)))
+    """
+    tokens, spans = [], []
+    for match in LUCENE_STANDARD_TOKEN_PATTERN.finditer(text):
+        tokens.append(match.group())
+        spans.append(match.span())
+    return TokenizedText(tokens=tuple(tokens), spans=tuple(spans))
+
+
+def align_token_spans(text, tokenized=None):
+    """
+    Get tokens of text with the spans of text they correspond to. Spans are the token spans, except that a token
+    directly followed by special characters (dropped by the tokenizer) and then whitespace or the end of text is
+    extended over those characters. E.g. in '(A B) C' the span of 'B' covers 'B)'
+
+    Args:
+        text (str): text to tokenize
+        tokenized (TokenizedText, optional): result of `tokenize_with_spans(text)` if already computed
+
+    Returns:
+        TokenizedText: tokens of text and their aligned spans
+
+    Example:
+        >>> align_token_spans(u' i want 1 pc hot & crispy! ')
+        TokenizedText(tokens=(u'i', u'want', u'1', u'pc', u'hot', u'crispy'),
+                      spans=((1, 2), (3, 7), (8, 9), (10, 12), (13, 16), (19, 26)))
+    """
+    if tokenized is None:
+        tokenized = tokenize_with_spans(text)
+    text_end = len(text.rstrip())
+    token_spans = tokenized.spans
+    spans = []
+    for index, (start, end) in enumerate(token_spans):
+        is_last = index == len(token_spans) - 1
+        gap_end = text_end if is_last else token_spans[index + 1][0]
+        special_characters = _NON_WHITESPACE_RUN_PATTERN.match(text, end, gap_end)
+        # the run of special characters must be followed by whitespace, end of text counts as whitespace
+        if special_characters and (is_last or special_characters.end() < gap_end):
+            end = special_characters.end()
+        spans.append((start, end))
+    return TokenizedText(tokens=tokenized.tokens, spans=tuple(spans))
+
+
+def find_token_sequence(text, matched_tokens, aligned=None):
+    """
+    Get part of text that corresponds to the first occurrence of a contiguous sequence of tokens
+
+    Args:
+        text (str): text to search in
+        matched_tokens (list of str): tokens to find
+        aligned (TokenizedText, optional): result of `align_token_spans(text)` if already computed
+
+    Returns:
+        str or None: part of text spanning the tokens including special characters in between and after them (see
+            `align_token_spans`), None if the tokens do not occur in text
+
+    Example:
+        >>> find_token_sequence(u'i want to order 1 pc hot & crispy', [u'1', u'pc', u'hot', u'crispy'])
+        u'1 pc hot & crispy'
+    """
+    if aligned is None:
+        aligned = align_token_spans(text)
+    matched_tokens = tuple(matched_tokens)
+    n = len(matched_tokens)
+    if not n:
+        return None
+    tokens, spans = aligned.tokens, aligned.spans
+    for i in range(len(tokens) - n + 1):
+        if tokens[i] == matched_tokens[0] and tokens[i:i + n] == matched_tokens:
+            return text[spans[i][0]:spans[i + n - 1][1]]
+    return None
+
+
+def normalized_variant(variant):
+    """
+    Get the lower cased tokens of a variant joined by single spaces. This is the form stored in the datastore with
+    every variant, detectors tokenize variants after lower casing them
+
+    Args:
+        variant (str): variant to normalize
+
+    Returns:
+        str: lower cased tokens of the variant joined by spaces
+
+    Example:
+        >>> normalized_variant(u'Hot & Crispy')
+        u'hot crispy'
+    """
+    return u' '.join(tokenize_with_spans(variant.lower()).tokens)
+
+
+def _store_variant_tokens(variant, tokens):
+    with _variant_cache_lock:
+        _variant_cache[variant] = tokens
+        _variant_cache.move_to_end(variant)
+        if len(_variant_cache) > VARIANT_CACHE_SIZE:
+            _variant_cache.popitem(last=False)
+
+
+def cache_normalized_variant(variant, normalized):
+    """
+    Put the tokens of a variant in the process wide variant cache from its precomputed normalized form (see
+    `normalized_variant`), so that detectors don't tokenize it
+
+    Args:
+        variant (str): variant as returned by the datastore
+        normalized (str): normalized form of the variant stored in the datastore
+    """
+    _store_variant_tokens(variant.lower(), tuple(normalized.split(u' ')) if normalized else ())
+
+
+def _tokenize_variant(variant):
+    with _variant_cache_lock:
+        tokens = _variant_cache.get(variant)
+        if tokens is not None:
+            _variant_cache.move_to_end(variant)
+            return tokens
+
+    tokens = tokenize_with_spans(variant).tokens
+    _store_variant_tokens(variant, tokens)
+    return tokens
+
+
+class TokenCache(object):
+    """
+    Per request memo of lucene standard tokenization. Create one per detection pass and drop it afterwards, texts
+    are held in memory for as long as the instance lives. Returned values are shared, callers must not mutate them.
+    """
+
+    def __init__(self):
+        self._texts = {}
+        self._aligned = {}
+        self._variants = {}
+
+    def tokenize_with_spans(self, text):
+        """
+        Get tokens and their character spans in text, see `tokenize_with_spans`
+
+        Args:
+            text (str): text to tokenize
+
+        Returns:
+            TokenizedText: tokens and spans of text
+        """
+        tokenized = self._texts.get(text)
+        if tokenized is None:
+            tokenized = tokenize_with_spans(text)
+            self._texts[text] = tokenized
+        return tokenized
+
+    def align(self, text):
+        """
+        Get tokens of text with aligned spans, see `align_token_spans`
+
+        Args:
+            text (str): text to tokenize
+
+        Returns:
+            TokenizedText: tokens of text and their aligned spans
+        """
+        aligned = self._aligned.get(text)
+        if aligned is None:
+            aligned = align_token_spans(text, tokenized=self.tokenize_with_spans(text))
+            self._aligned[text] = aligned
+        return aligned
+
+    def tokenize(self, text):
+        """
+        Get tokens of text
+
+        Args:
+            text (str): text to tokenize
+
+        Returns:
+            tuple of str: tokens of the text
+        """
+        return self.tokenize_with_spans(text).tokens
+
+    def tokenize_variant(self, variant):
+        """
+        Get tokens of a datastore variant. Same as `tokenize` but also cached across requests
+
+        Args:
+            variant (str): variant to tokenize
+
+        Returns:
+            tuple of str: tokens of the variant
+        """
+        tokens = self._variants.get(variant)
+        if tokens is None:
+            tokens = _tokenize_variant(variant)
+            self._variants[variant] = tokens
+        return tokens
+
+    def normalize_variant(self, variant):
+        """
+        Get variant with its tokens joined by single spaces, the form used to look for exact matches in
+        tokenized text
+
+        Args:
+            variant (str): variant to normalize
+
+        Returns:
+            str: tokens of the variant joined by spaces
+        """
+        return u' '.join(self.tokenize_variant(variant))
@@ -13,7 +13,6 @@ except ImportError:
 
     _re_flags = re.UNICODE
 
-import nltk
 import six
 
 from lib.singleton import Singleton
@@ -23,6 +22,9 @@ PRELOADED_NLTK_TOKENIZER = 'PRELOADED_NLTK_TOKENIZER'
 LUCENE_STANDARD_TOKENIZER = 'LUCENE_STANDARD_TOKENIZER'
 WHITESPACE_TOKENIZER = 'WHITESPACE_TOKENIZER'
 
+# Approximates word boundaries of Elasticsearch/Lucene's standard tokenizer (Unicode Annex 29)
+LUCENE_STANDARD_TOKEN_PATTERN = re.compile(r'\w(?:\B\S)*', flags=_re_flags)
+
 
 class Tokenizer(six.with_metaclass(Singleton, object)):
     """
@@ -64,10 +66,8 @@ class Tokenizer(six.with_metaclass(Singleton, object)):
         Uses word boundaries defined in Unicode Annex 29
         """
 
-        words_pattern = re.compile(r'\w(?:\B\S)*', flags=_re_flags)
-
         def word_tokenize(text):
-            return words_pattern.findall(text)
+            return LUCENE_STANDARD_TOKEN_PATTERN.findall(text)
 
         return word_tokenize
 
@@ -78,6 +78,8 @@ class Tokenizer(six.with_metaclass(Singleton, object)):
         Returns:
             callable: nltk.word_tokenize callable
         """
+        import nltk
+
         return nltk.word_tokenize
 
     def __preloaded_nltk_tokenizer(self):
@@ -90,6 +92,8 @@ class Tokenizer(six.with_metaclass(Singleton, object)):
         Returns:
             callable: tokenizer with punkt tokenizer cached in memory
         """
+        import nltk
+
         # Code pulled out of nltk == 3.2.5
         tokenizer = nltk.load('tokenizers/punkt/{0}.pickle'.format('english'))
         sent_tokenizer = tokenizer.tokenize
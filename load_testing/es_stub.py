@@ -0,0 +1,269 @@
+"""
+Elasticsearch stand-in for load tests.
+
+Serves the requests chatbot_ner makes to Elasticsearch for text detection (ping and `_msearch`) from entity data
+loaded in memory, so that `v2/text` can be load tested without a cluster. A variant of an entity matches a text when
+all of its tokens occur in the text, there is no fuzzy matching or scoring. Responses have the shape of
+Elasticsearch 5.x responses with every variant token highlighted, as parsed by
+`ner_v2.detectors.textual.queries._parse_multi_entity_es_results`.
+
+Usage:
+    python load_testing/es_stub.py --port 9200 --entity-data-dir data/entity_data --latency-ms 5
+
+and point chatbot_ner to it with ES_HOST / ES_PORT (or ES_URL).
+"""
+from __future__ import absolute_import
+
+import argparse
+import collections
+import csv
+import glob
+import gzip
+import io
+import json
+import os
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+
+try:
+    import regex as re
+
+    _re_flags = re.UNICODE | re.V1 | re.WORD
+except ImportError:
+    import re
+
+    _re_flags = re.UNICODE
+
+# same as lib.nlp.tokenizer.LUCENE_STANDARD_TOKEN_PATTERN, not imported so that the stub runs without the project
+# settings
+TOKEN_PATTERN = re.compile(r'\w(?:\B\S)*', flags=_re_flags)
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_ENTITY_DATA_DIR = os.path.join(BASE_DIR, 'data', 'entity_data')
+
+EntityVariant = collections.namedtuple('EntityVariant', ['value', 'variant', 'tokens', 'variants'])
+
+
+class EntityIndex(object):
+    """
+    In memory index of entity variants by their lower cased tokens
+    """
+
+    def __init__(self):
+        # entity name -> token -> list of EntityVariant having that token
+        self._entities = collections.defaultdict(lambda: collections.defaultdict(list))
+
+    def add(self, entity_name, value, variants):
+        """
+        Add an entity value with its variants
+
+        Args:
+            entity_name (str): name of the entity
+            value (str): entity value
+            variants (list of str): variants of the value
+        """
+        for variant in variants:
+            tokens = frozenset(token.lower() for token in TOKEN_PATTERN.findall(variant))
+            if not tokens:
+                continue
+            entity_variant = EntityVariant(value=value, variant=variant, tokens=tokens, variants=variants)
+            # variants are indexed by a single token, every match has to contain all tokens anyway
+            self._entities[entity_name][min(tokens)].append(entity_variant)
+
+    def load_csv_directory(self, directory):
+        """
+        Add entity data from csv files with `value` and `|` separated `variants` columns (in any case), the entity
+        name being the file name (same format as data/entity_data)
+
+        Args:
+            directory (str): path to the directory with the csv files
+
+        Returns:
+            int: number of entities loaded
+        """
+        csv_paths = sorted(glob.glob(os.path.join(directory, '*.csv')))
+        for csv_path in csv_paths:
+            entity_name = os.path.splitext(os.path.basename(csv_path))[0]
+            with io.open(csv_path, 'r', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    # some files have capitalized headers
+                    row = {(key or '').strip().lower(): value for key, value in row.items()}
+                    variants = [variant.strip() for variant in (row.get('variants') or '').split('|')
+                                if variant.strip()]
+                    self.add(entity_name, row['value'], variants or [row['value']])
+        return len(csv_paths)
+
+    def search(self, entity_names, text, size):
+        """
+        Get variants of the entities all of whose tokens occur in text
+
+        Args:
+            entity_names (list of str): entities to search
+            text (str): text to search in
+            size (int): max number of results
+
+        Returns:
+            list of (str, EntityVariant): entity name and matching variant
+        """
+        text_tokens = set(token.lower() for token in TOKEN_PATTERN.findall(text))
+        matches = []
+        for entity_name in entity_names:
+            variants_by_token = self._entities.get(entity_name, {})
+            for token in text_tokens:
+                for entity_variant in variants_by_token.get(token, ()):
+                    if entity_variant.tokens <= text_tokens:
+                        matches.append((entity_name, entity_variant))
+                        if len(matches) >= size:
+                            return matches
+        return matches
+
+
+def _search_response(index, query, took_ms):
+    bool_query = query.get('query', {}).get('bool', {})
+    entity_names, text = [], ''
+    for filter_term in bool_query.get('filter', []):
+        entity_names.extend(filter_term.get('terms', {}).get('entity_data', []))
+    for should_term in bool_query.get('should', []):
+        text = should_term.get('match', {}).get('variants', {}).get('query', text)
+
+    hits = []
+    for entity_name, entity_variant in index.search(entity_names, text, size=query.get('size', 10)):
+        highlighted_variant = TOKEN_PATTERN.sub(lambda match: u'<em>{}</em>'.format(match.group()),
+                                                entity_variant.variant)
+        source = {'value': entity_variant.value, 'entity_data': entity_name}
+        if 'normalized_variants' in query.get('_source', []):
+            source['variants'] = entity_variant.variants
+            source['normalized_variants'] = [u' '.join(TOKEN_PATTERN.findall(variant.lower()))
+                                             for variant in entity_variant.variants]
+        hits.append({
+            '_index': 'entity_data',
+            '_type': 'data_dictionary',
+            '_id': u'{}:{}'.format(entity_name, entity_variant.value),
+            '_score': 1.0,
+            '_source': source,
+            'highlight': {'variants': [highlighted_variant]},
+        })
+    return {
+        'took': took_ms,
+        'timed_out': False,
+        '_shards': {'total': 1, 'successful': 1, 'failed': 0},
+        'hits': {'total': len(hits), 'max_score': 1.0 if hits else None, 'hits': hits},
+        'status': 200,
+    }
+
+
+def msearch_response(index, body, took_ms=0):
+    """
+    Build the response to an `_msearch` request
+
+    Args:
+        index (EntityIndex): entity data to search
+        body (str): newline delimited JSON `_msearch` request body, alternating header and query lines
+        took_ms (int): value of `took` in the responses
+
+    Returns:
+        dict: `_msearch` response with one search response per query
+    """
+    lines = [line for line in body.splitlines() if line.strip()]
+    queries = [json.loads(line) for line in lines[1::2]]
+    return {'responses': [_search_response(index, query, took_ms) for query in queries]}
+
+
+class ElasticsearchStubHandler(BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # headers and body are separate writes, with Nagle's algorithm the body of keep-alive responses waits for the
+    # delayed ACK of the client (~40ms)
+    disable_nagle_algorithm = True
+    # set on the server
+    entity_index = None
+    latency_seconds = 0.0
+
+    def _send_json(self, status, data, include_body=True):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=UTF-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if include_body:
+            self.wfile.write(body)
+
+    def _read_body(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return ''
+        body = self.rfile.read(length)
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        return body.decode('utf-8')
+
+    def _handle(self, include_body=True):
+        body = self._read_body()
+        path = self.path.split('?', 1)[0].rstrip('/')
+        if self.server.latency_seconds:
+            time.sleep(self.server.latency_seconds)
+        if path == '':
+            self._send_json(200, {'name': 'es-stub', 'cluster_name': 'chatbot-ner-load-test',
+                                  'version': {'number': '5.5.3'}, 'tagline': 'You Know, for Search'},
+                            include_body=include_body)
+        elif path.endswith('/_msearch'):
+            took_ms = int(self.server.latency_seconds * 1000)
+            self._send_json(200, msearch_response(self.server.entity_index, body, took_ms=took_ms),
+                            include_body=include_body)
+        else:
+            self._send_json(404, {'error': 'es-stub does not support {} {}'.format(self.command, self.path),
+                                  'status': 404}, include_body=include_body)
+
+    def do_HEAD(self):
+        self._handle(include_body=False)
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ElasticsearchStubServer(socketserver.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, server_address, entity_index, latency_seconds=0.0):
+        """
+        Args:
+            server_address (tuple): (host, port) to listen on, port 0 picks a free port
+            entity_index (EntityIndex): entity data to serve
+            latency_seconds (float): time to wait before answering each request, to simulate a remote cluster
+        """
+        BaseHTTPServer.HTTPServer.__init__(self, server_address, ElasticsearchStubHandler)
+        self.entity_index = entity_index
+        self.latency_seconds = latency_seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Elasticsearch stand-in serving canned text detection results')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9200)
+    parser.add_argument('--entity-data-dir', default=DEFAULT_ENTITY_DATA_DIR,
+                        help='directory with entity csv files, defaults to data/entity_data')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='added latency per request')
+    args = parser.parse_args()
+
+    entity_index = EntityIndex()
+    entity_count = entity_index.load_csv_directory(args.entity_data_dir)
+    server = ElasticsearchStubServer((args.host, args.port), entity_index, latency_seconds=args.latency_ms / 1000.0)
+    print('Serving {} entities from {} on http://{}:{}'.format(entity_count, args.entity_data_dir,
+                                                               *server.server_address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+"""
+Replay a JSONL log of requests against a running chatbot_ner server and report latency per endpoint.
+
+Each line of the log is a JSON object with
+    endpoint (str): path of the request, e.g. "/v2/number/"
+    method (str, optional): "GET" (default) or "POST"
+    body (dict, optional): query parameters for GET requests, JSON body for POST requests
+
+The log is replayed in order (and from the start again until `--requests` or `--duration` is reached) by
+`--concurrency` threads. With `--rate` requests are started at that many requests per second in total, otherwise
+each thread sends its next request as soon as the previous one is answered. Latencies are bucketed into a histogram
+per endpoint. Requests that fail or get a non 2xx response are counted as errors.
+
+Usage:
+    python load_testing/run_load_test.py --base-url http://localhost:8081 --concurrency 8 --rate 200 \
+        --requests 5000 --output load_test.json
+"""
+from __future__ import absolute_import
+
+import argparse
+import bisect
+import collections
+import io
+import itertools
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+import requests
+
+DEFAULT_TRAFFIC_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'sample_traffic.jsonl')
+
+# Upper bounds (inclusive, in ms) of the latency histogram buckets, the last bucket is unbounded
+HISTOGRAM_BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+
+ReplayRequest = collections.namedtuple('ReplayRequest', ['endpoint', 'method', 'body'])
+
+
+def load_traffic(path):
+    """
+    Read requests to replay from a JSONL file, blank lines are skipped
+
+    Args:
+        path (str): path to the JSONL file
+
+    Returns:
+        list of ReplayRequest: requests in file order
+
+    Raises:
+        ValueError: if a line is not valid JSON or has no endpoint
+    """
+    traffic = []
+    with io.open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                traffic.append(ReplayRequest(endpoint=record['endpoint'],
+                                             method=(record.get('method') or 'GET').upper(),
+                                             body=record.get('body') or {}))
+            except (ValueError, KeyError) as e:
+                raise ValueError('Invalid request on line {} of {}: {!r}'.format(line_number, path, e))
+    return traffic
+
+
+class LatencyHistogram(object):
+    """
+    Latency samples of one endpoint with a bucketed histogram, error and status code counts
+    """
+
+    def __init__(self):
+        self.bucket_counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        self.latencies_ms = []
+        self.errors = 0
+        self.status_codes = collections.Counter()
+
+    def add(self, latency_ms, status_code=None, error=False):
+        self.bucket_counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency_ms)] += 1
+        self.latencies_ms.append(latency_ms)
+        self.status_codes[str(status_code) if status_code is not None else 'exception'] += 1
+        if error:
+            self.errors += 1
+
+    def merge(self, other):
+        """
+        Add the samples of another histogram to this one
+
+        Args:
+            other (LatencyHistogram): histogram to add
+        """
+        self.bucket_counts = [count + other_count for count, other_count in zip(self.bucket_counts,
+                                                                                other.bucket_counts)]
+        self.latencies_ms.extend(other.latencies_ms)
+        self.errors += other.errors
+        self.status_codes.update(other.status_codes)
+
+    def summary(self, elapsed_seconds):
+        """
+        Args:
+            elapsed_seconds (float): wall clock duration of the run, to compute throughput
+
+        Returns:
+            collections.OrderedDict: request and error counts, status code counts, latency percentiles in ms,
+                requests per second and the histogram as a mapping of bucket upper bound ("+inf" for the last
+                bucket) to count
+        """
+        latencies = sorted(self.latencies_ms)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[max(int(math.ceil(fraction * len(latencies))), 1) - 1]
+
+        bucket_labels = ['<={}'.format(bound) for bound in HISTOGRAM_BUCKETS_MS] + ['+inf']
+        return collections.OrderedDict([
+            ('requests', len(latencies)),
+            ('errors', self.errors),
+            ('status_codes', dict(self.status_codes)),
+            ('p50_ms', percentile(0.50)),
+            ('p90_ms', percentile(0.90)),
+            ('p99_ms', percentile(0.99)),
+            ('max_ms', latencies[-1] if latencies else None),
+            ('requests_per_sec', len(latencies) / elapsed_seconds if elapsed_seconds else None),
+            ('histogram_ms', collections.OrderedDict(zip(bucket_labels, self.bucket_counts))),
+        ])
+
+
+class LoadTest(object):
+    """
+    Replays traffic against a server from a pool of threads, each with its own keep-alive HTTP session
+    """
+
+    def __init__(self, base_url, traffic, concurrency=4, rate=None, total_requests=None, duration=None,
+                 timeout=30.0):
+        """
+        Args:
+            base_url (str): url of the server, e.g. http://localhost:8081
+            traffic (list of ReplayRequest): requests to replay, cycled through
+            concurrency (int): number of threads sending requests
+            rate (float, optional): total requests per second to start, unlimited if None
+            total_requests (int, optional): number of requests to send. Defaults to one pass over traffic unless
+                duration is given
+            duration (float, optional): stop starting requests after this many seconds
+            timeout (float): timeout of each request in seconds
+        """
+        if not traffic:
+            raise ValueError('No requests to replay')
+        self.base_url = base_url.rstrip('/')
+        self.traffic = traffic
+        self.concurrency = concurrency
+        self.rate = rate
+        self.total_requests = total_requests if total_requests or duration else len(traffic)
+        self.duration = duration
+        self.timeout = timeout
+        self.histograms = collections.defaultdict(LatencyHistogram)
+        self._lock = threading.Lock()
+        self._counter = itertools.count()
+        self._start_time = None
+
+    def _next_request_index(self):
+        """
+        Claim the next request to send, waiting for its start time when the rate is limited
+
+        Returns:
+            int or None: sequence number of the request, None when the run is over
+        """
+        index = next(self._counter)
+        if self.total_requests and index >= self.total_requests:
+            return None
+        if self.rate:
+            delay = self._start_time + index / float(self.rate) - time.time()
+            if delay > 0:
+                time.sleep(delay)
+        if self.duration and time.time() - self._start_time >= self.duration:
+            return None
+        return index
+
+    def _send(self, session, replay_request):
+        url = self.base_url + replay_request.endpoint
+        if replay_request.method == 'GET':
+            return session.get(url, params=replay_request.body, timeout=self.timeout)
+        return session.request(replay_request.method, url, data=json.dumps(replay_request.body),
+                               headers={'Content-Type': 'application/json'}, timeout=self.timeout)
+
+    def _worker(self):
+        session = requests.Session()
+        while True:
+            index = self._next_request_index()
+            if index is None:
+                break
+            replay_request = self.traffic[index % len(self.traffic)]
+            status_code, error = None, True
+            start_time = time.time()
+            try:
+                response = self._send(session, replay_request)
+                status_code, error = response.status_code, not 200 <= response.status_code < 300
+            except requests.RequestException:
+                pass
+            latency_ms = (time.time() - start_time) * 1000
+            with self._lock:
+                self.histograms[replay_request.endpoint].add(latency_ms, status_code=status_code, error=error)
+        session.close()
+
+    def run(self):
+        """
+        Replay the traffic
+
+        Returns:
+            collections.OrderedDict: `meta` (arguments and duration of the run), `total` and `endpoints` (summary
+                per endpoint, see LatencyHistogram.summary)
+        """
+        self._start_time = time.time()
+        threads = [threading.Thread(target=self._worker) for _ in range(self.concurrency)]
+        for thread in threads:
+            thread.daemon = True
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed_seconds = time.time() - self._start_time
+
+        total = LatencyHistogram()
+        for histogram in self.histograms.values():
+            total.merge(histogram)
+
+        return collections.OrderedDict([
+            ('meta', collections.OrderedDict([
+                ('base_url', self.base_url),
+                ('concurrency', self.concurrency),
+                ('rate', self.rate),
+                ('total_requests', self.total_requests),
+                ('duration', self.duration),
+                ('elapsed_seconds', elapsed_seconds),
+            ])),
+            ('total', total.summary(elapsed_seconds)),
+            ('endpoints', collections.OrderedDict(
+                (endpoint, histogram.summary(elapsed_seconds))
+                for endpoint, histogram in sorted(self.histograms.items()))),
+        ])
+
+
+def _print_report(results, stream=sys.stdout):
+    stream.write('{:<28} {:>8} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9}\n'.format(
+        'endpoint', 'requests', 'errors', 'p50 ms', 'p90 ms', 'p99 ms', 'max ms', 'req/sec'))
+    rows = list(results['endpoints'].items()) + [('total', results['total'])]
+    for endpoint, summary in rows:
+        stream.write('{:<28} {requests:>8} {errors:>7} {p50_ms:>9.1f} {p90_ms:>9.1f} {p99_ms:>9.1f} {max_ms:>9.1f} '
+                     '{requests_per_sec:>9.1f}\n'.format(endpoint, **summary))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Replay a JSONL request log against a chatbot_ner server')
+    parser.add_argument('--base-url', default='http://localhost:8081')
+    parser.add_argument('--traffic', default=DEFAULT_TRAFFIC_PATH,
+                        help='JSONL file of requests to replay, defaults to load_testing/data/sample_traffic.jsonl')
+    parser.add_argument('--concurrency', type=int, default=4, help='number of concurrent clients, default 4')
+    parser.add_argument('--rate', type=float, default=None, help='total requests per second, default unlimited')
+    parser.add_argument('--requests', type=int, default=None,
+                        help='number of requests to send, default one pass over the traffic file')
+    parser.add_argument('--duration', type=float, default=None, help='stop after this many seconds')
+    parser.add_argument('--timeout', type=float, default=30.0, help='timeout per request in seconds, default 30')
+    parser.add_argument('--output', default=None, help='path to write the results to as JSON')
+    args = parser.parse_args(argv)
+
+    load_test = LoadTest(base_url=args.base_url, traffic=load_traffic(args.traffic), concurrency=args.concurrency,
+                         rate=args.rate, total_requests=args.requests, duration=args.duration, timeout=args.timeout)
+    results = load_test.run()
+    _print_report(results)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    return 1 if results['total']['errors'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
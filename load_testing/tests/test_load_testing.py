@@ -0,0 +1,117 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import json
+import threading
+
+import six
+from django.test import RequestFactory, SimpleTestCase
+from django.urls import resolve
+
+from load_testing.es_stub import ElasticsearchStubServer, EntityIndex, msearch_response
+from load_testing.run_load_test import DEFAULT_TRAFFIC_PATH, LatencyHistogram, LoadTest, ReplayRequest, load_traffic
+from ner_constants import PARAMETER_ENTITY_NAME, PARAMETER_MESSAGE
+from ner_v2.api import get_parameters_dictionary, parse_post_request
+from ner_v2.detectors.textual.queries import _generate_multi_entity_es_query, _parse_multi_entity_es_results
+from ner_v2.detectors.textual.utils import validate_text_request
+
+
+class ElasticsearchStubTest(SimpleTestCase):
+    def setUp(self):
+        self.entity_index = EntityIndex()
+        self.entity_index.add('city', 'New Delhi', ['new delhi', 'delhi', 'dilli'])
+        self.entity_index.add('city', 'Mumbai', ['mumbai', 'bombay'])
+        self.entity_index.add('restaurant', 'Delhi Darbar', ['delhi darbar'])
+
+    def _msearch_body(self, entities, texts):
+        lines = []
+        for text in texts:
+            lines.append(json.dumps({'index': 'entity_data', 'type': 'data_dictionary'}))
+            lines.append(json.dumps(_generate_multi_entity_es_query(entities=entities, text=text)))
+        return '\n'.join(lines) + '\n'
+
+    def test_msearch_response_is_parsed_like_elasticsearch_results(self):
+        body = self._msearch_body(entities=['city', 'restaurant'],
+                                  texts=['flights from new delhi to mumbai', 'nothing to see here'])
+        results = _parse_multi_entity_es_results(msearch_response(self.entity_index, body)['responses'])
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(dict(results[0]['city']), {'new delhi': 'New Delhi', 'delhi': 'New Delhi',
+                                                    'mumbai': 'Mumbai'})
+        self.assertNotIn('restaurant', results[0])
+        self.assertEqual(results[1], {})
+
+    def test_search_only_returns_requested_entities(self):
+        matches = self.entity_index.search(['restaurant'], 'dinner at Delhi Darbar', size=10)
+        self.assertEqual([(entity_name, variant.value) for entity_name, variant in matches],
+                         [('restaurant', 'Delhi Darbar')])
+
+
+class LoadTestTest(SimpleTestCase):
+    def setUp(self):
+        self.server = ElasticsearchStubServer(('127.0.0.1', 0), EntityIndex())
+        self.server_thread = threading.Thread(target=self.server.serve_forever)
+        self.server_thread.daemon = True
+        self.server_thread.start()
+        self.base_url = 'http://{}:{}'.format(*self.server.server_address)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_replays_requests_per_endpoint(self):
+        traffic = [ReplayRequest(endpoint='/', method='GET', body={}),
+                   ReplayRequest(endpoint='/missing', method='POST', body={'message': ['hello']})]
+        results = LoadTest(self.base_url, traffic, concurrency=3, total_requests=10).run()
+
+        self.assertEqual(results['total']['requests'], 10)
+        self.assertEqual(results['endpoints']['/']['requests'], 5)
+        self.assertEqual(results['endpoints']['/']['errors'], 0)
+        self.assertEqual(results['endpoints']['/missing']['errors'], 5)
+        self.assertEqual(results['endpoints']['/missing']['status_codes'], {'404': 5})
+        self.assertEqual(sum(results['total']['histogram_ms'].values()), 10)
+
+    def test_latency_histogram_buckets(self):
+        histogram = LatencyHistogram()
+        for latency_ms in (0.5, 1, 3, 7, 30000):
+            histogram.add(latency_ms, status_code=200)
+        summary = histogram.summary(elapsed_seconds=1.0)
+
+        self.assertEqual(summary['histogram_ms']['<=1'], 2)
+        self.assertEqual(summary['histogram_ms']['<=5'], 1)
+        self.assertEqual(summary['histogram_ms']['<=10'], 1)
+        self.assertEqual(summary['histogram_ms']['+inf'], 1)
+        self.assertEqual(summary['p50_ms'], 3)
+        self.assertEqual(summary['max_ms'], 30000)
+
+    def test_load_sample_traffic(self):
+        traffic = load_traffic(DEFAULT_TRAFFIC_PATH)
+        self.assertTrue(traffic)
+        request_factory = RequestFactory()
+        for replay_request in traffic:
+            self.assertIn(replay_request.method, ('GET', 'POST'))
+            self.assertTrue(replay_request.endpoint.startswith('/v2/'))
+            resolve(replay_request.endpoint)
+
+            # build the request the way LoadTest sends it and read it the way the view does
+            if replay_request.method == 'GET':
+                request = request_factory.get(replay_request.endpoint, data=replay_request.body)
+            else:
+                request = request_factory.post(replay_request.endpoint, data=json.dumps(replay_request.body),
+                                               content_type='application/json')
+            if replay_request.endpoint == '/v2/text/':
+                validate_text_request(request)
+                continue
+
+            if replay_request.method == 'GET':
+                parameters_dict = get_parameters_dictionary(request)
+            else:
+                parameters_dict = parse_post_request(request)
+            self.assertTrue(parameters_dict[PARAMETER_ENTITY_NAME], replay_request)
+            message = parameters_dict[PARAMETER_MESSAGE]
+            if replay_request.endpoint.endswith('_bulk/'):
+                self.assertIsInstance(message, list, replay_request)
+                self.assertTrue(message, replay_request)
+            else:
+                self.assertIsInstance(message, six.string_types, replay_request)
+                self.assertTrue(message.strip(), replay_request)
@@ -395,7 +395,9 @@ def email(request):
 @require_http_methods(["GET", "POST"])
 @csrf_exempt
 def person_name(request):
-    """This functionality calls the get_name() functionality to detect name. It is called through api call
+    """This functionality calls the get_name() functionality to detect name. It is called through api call.
+    POST requests can send a list of texts as `message` to detect names in all of them at once (bulk mode), the
+    response then has one output for each text
 
     Attributes:
         request: url parameters
@@ -411,7 +413,7 @@ def person_name(request):
                                         language=parameters_dict[PARAMETER_SOURCE_LANGUAGE],
                                         predetected_values=parameters_dict[PARAMETER_PRIOR_RESULTS])
         ner_logger.debug('Finished %s : %s ' % (parameters_dict[PARAMETER_ENTITY_NAME], entity_output))
-    except TypeError as e:
+    except (TypeError, ValueError) as e:
         ner_logger.exception('Exception for person_name: %s ' % e)
         return HttpResponse(status=500)
 
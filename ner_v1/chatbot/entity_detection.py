@@ -522,8 +522,9 @@ def get_person_name(message, entity_name, structured_value, fallback_value, bot_
     """Use NameDetector to detect names
 
     Args:
-        message (str): natural text on which detection logic is to be run. Note if structured value is
-                                detection is run on structured value instead of message
+        message (str or list of str): natural text on which detection logic is to be run. Note if structured value is
+                                detection is run on structured value instead of message. If a list of texts is
+                                given, names are detected in each text (bulk mode), see `get_person_name_bulk`
         entity_name (str): name of the entity. Also acts as elastic-search dictionary name
                            if entity uses elastic-search lookup
         structured_value (str): Value obtained from any structured elements. Note if structured value is
@@ -539,6 +540,7 @@ def get_person_name(message, entity_name, structured_value, fallback_value, bot_
     Returns:
         dict or None: dictionary containing entity_value, original_text and detection;
                       entity_value is in itself a dict with its keys varying from entity to entity
+        In bulk mode a list of the same, one for each message
 
     Example:
 
@@ -552,6 +554,11 @@ def get_person_name(message, entity_name, structured_value, fallback_value, bot_
             'entity_value': {'first_name': yash, 'middle_name': None, 'last_name': doshi}}]
     """
     # TODO refactor NameDetector to make this easy to read and use
+    if isinstance(message, (list, tuple)) and not structured_value:
+        return get_person_name_bulk(messages=message, entity_name=entity_name, fallback_values=fallback_value,
+                                    bot_message=bot_message, language=language,
+                                    predetected_values=predetected_values)
+
     predetected_values = predetected_values or []
 
     name_detection = NameDetector(entity_name=entity_name, language=language)
@@ -584,6 +591,53 @@ def get_person_name(message, entity_name, structured_value, fallback_value, bot_
     return None
 
 
+def get_person_name_bulk(messages, entity_name, fallback_values=None, bot_message=None, language=ENGLISH_LANG,
+                         predetected_values=None):
+    """Use NameDetector to detect names in multiple messages. Messages of languages tagged with spacy are pos
+    tagged together in batches
+
+    Args:
+        messages (list of str): natural texts on which detection logic is to be run
+        entity_name (str): name of the entity
+        fallback_values (str or list of str): fallback value to return when no name is detected, either one for all
+                          messages or one for each message
+        bot_message (str): previous message from a bot/agent.
+        language (str): ISO 639-1 code of language of messages
+        predetected_values(list of list of str): prior detection results from models like crf etc. for each message
+
+    Returns:
+        list: list with output of `get_person_name` for each message
+
+    Example:
+
+        messages = ['My name is yash doshi', 'i am nikhil']
+        entity_name = 'person_name'
+
+            [[{'detection': 'message', 'original_text': 'yash doshi',
+               'entity_value': {'first_name': yash, 'middle_name': None, 'last_name': doshi}}],
+             [{'detection': 'message', 'original_text': 'nikhil',
+               'entity_value': {'first_name': nikhil, 'middle_name': None, 'last_name': None}}]]
+    """
+    if isinstance(fallback_values, six.string_types) or not fallback_values:
+        fallback_values = [fallback_values] * len(messages)
+
+    name_detection = NameDetector(entity_name=entity_name, language=language)
+    entities_list, original_texts_list = name_detection.detect_entity_bulk(texts=messages, bot_message=bot_message,
+                                                                           predetected_values=predetected_values)
+    entity_output = []
+    for entity_list, original_text_list, fallback_text in zip(entities_list, original_texts_list, fallback_values):
+        detection_method = FROM_MESSAGE
+        if not entity_list and fallback_text:
+            entity_list, original_text_list = NameDetector.get_format_name(fallback_text.split(), fallback_text)
+            detection_method = FROM_FALLBACK_VALUE
+
+        if entity_list and original_text_list:
+            entity_output.append(output_entity_dict_list(entity_list, original_text_list, detection_method))
+        else:
+            entity_output.append(None)
+    return entity_output
+
+
 def get_pnr(message, entity_name, structured_value, fallback_value, bot_message):
     """Use PNRDetector to detect pnr
 
@@ -11,6 +11,7 @@ from six.moves import zip
 
 import ner_v1.constant as detector_constant
 from chatbot_ner.config import ner_logger
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
 from ner_constants import FROM_MESSAGE
 from ner_v1.constant import (TYPE_EXACT, TYPE_EVERYDAY, TYPE_TODAY,
                              TYPE_TOMORROW, TYPE_YESTERDAY, TYPE_DAY_AFTER, TYPE_DAY_BEFORE, TYPE_NEXT_DAY,
@@ -58,6 +59,7 @@ class DateAdvancedDetector(object):
         self.tag = '__' + entity_name + '__'
         self.date_detector_object = DateDetector(entity_name=entity_name, timezone=timezone)
         self.bot_message = None
+        self.bot_context = NO_BOT_CONTEXT
 
     def detect_entity(self, text):
         """
@@ -300,25 +302,8 @@ class DateAdvancedDetector(object):
             Otherwise the normal date with the key 'normal' will be set to True
         """
         date_dict_list = []
-        departure_date_flag = False
-        return_date_flag = False
-        if self.bot_message:
-            departure_regex_string = r'traveling on|going on|starting on|departure date|date of travel|' + \
-                                     r'check in date|check-in date|date of check-in|' \
-                                     r'date of departure\.|'
-            hinglish_departure = u'जाने|जाऊँगा|जाना'
-            departure_regex_string = departure_regex_string + hinglish_departure
-            arrival_regex_string = r'traveling back|coming back|returning back|returning on|return date' + \
-                                   r'|arrival date|check out date|check-out date|date of check-out' \
-                                   r'|check out|'
-            hinglish_arrival = u'आने|आगमन|अनेका|रिटर्न'
-            arrival_regex_string = arrival_regex_string + hinglish_arrival
-            departure_regexp = re.compile(departure_regex_string)
-            arrival_regexp = re.compile(arrival_regex_string)
-            if departure_regexp.search(self.bot_message) is not None:
-                departure_date_flag = True
-            elif arrival_regexp.search(self.bot_message) is not None:
-                return_date_flag = True
+        departure_date_flag = self.bot_context.departure_date
+        return_date_flag = self.bot_context.return_date
 
         patterns = re.compile(r'\s((.+))\.?\b').findall(self.processed_text.lower())
 
@@ -360,6 +345,7 @@ class DateAdvancedDetector(object):
             bot_message: is the previous message that is sent by the bot
         """
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
         self.date_detector_object.set_bot_message(self.bot_message)
 
     def _date_dict_from_text(self, text, from_property=False, to_property=False, start_range_property=False,
@@ -591,6 +577,7 @@ class DateDetector(object):
         self.month_dictionary = MONTH_DICT
         self.day_dictionary = DAY_DICT
         self.bot_message = None
+        self.bot_context = NO_BOT_CONTEXT
 
     def detect_entity(self, text):
         """
@@ -2248,18 +2235,9 @@ class DateDetector(object):
         Returns:
             str: year in four digits
         """
-        past_regex = re.compile(r'birth|bday|dob|born')
-        present_regex = None
-        future_regex = None
         this_century = int(str(self.now_date.year)[:2])
-        if len(year) == 2:
-            if self.bot_message:
-                if past_regex and past_regex.search(self.bot_message):
-                    return str(this_century - 1) + year
-                elif present_regex and present_regex.search(self.bot_message):
-                    return str(this_century) + year
-                elif future_regex and future_regex.search(self.bot_message):
-                    return str(this_century + 1) + year
+        if len(year) == 2 and self.bot_context.date_of_birth:
+            return str(this_century - 1) + year
 
         # if patterns didn't match or no bot message set, fallback to current century
         if len(year) == 2:
@@ -2275,3 +2253,4 @@ class DateDetector(object):
             bot_message: is the previous message that is sent by the bot
         """
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
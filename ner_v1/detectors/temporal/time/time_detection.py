@@ -5,6 +5,7 @@ import pytz
 from ner_v1.constant import TWELVE_HOUR, PM_MERIDIEM, AM_MERIDIEM, EVERY_TIME_TYPE
 from ner_v1.detectors.base_detector import BaseDetector
 from language_utilities.constant import ENGLISH_LANG
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
 
 
 class TimeDetector(BaseDetector):
@@ -94,6 +95,7 @@ class TimeDetector(BaseDetector):
         self.form_check = form_check
         self.tag = '__' + entity_name + '__'
         self.bot_message = None
+        self.bot_context = NO_BOT_CONTEXT
         self.timezone = timezone or 'UTC'
         self.range_enabled = range_enabled
 
@@ -1123,9 +1125,8 @@ class TimeDetector(BaseDetector):
                               r'(?:o\'clock|o\' clock|clock|oclock|o clock|hours))\s',
                               self.processed_text.lower())
 
-        if not patterns and self.bot_message:
-            if re.findall(r"Time|time", self.bot_message.lower()):
-                patterns = re.findall(r'\s*((([0-2]?[0-9])()))\s*', self.processed_text.lower())
+        if not patterns and self.bot_context.time:
+            patterns = re.findall(r'\s*((([0-2]?[0-9])()))\s*', self.processed_text.lower())
         for pattern in patterns:
             original = pattern[0]
             t1 = pattern[2]
@@ -1442,6 +1443,7 @@ class TimeDetector(BaseDetector):
             bot_message (str): previous message that is sent by the bot
         """
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
 
     def _remove_time_range_entities(self, time_list, original_list):
         """
@@ -5,6 +5,7 @@ import re
 
 import language_utilities.constant as lang_constant
 import ner_v1.constant as detector_constant
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
 from ner_constants import FROM_MESSAGE
 from ner_v1.detectors.textual.text.text_detection import TextDetector
 
@@ -39,6 +40,7 @@ class CityDetector(object):
         self.entity_name = entity_name
         self.text = ''
         self.bot_message = ''
+        self.bot_context = NO_BOT_CONTEXT
         self.tagged_text = ''
         self.processed_text = ''
         self.city = []
@@ -292,21 +294,8 @@ class CityDetector(object):
 
         """
         city_dict_list = []
-        departure_city_flag = False
-        arrival_city_flag = False
-        if self.bot_message:
-            hinglish_departure = u'कहां से'
-            departure_regexp = re.compile(u'departure city|origin city|origin|'
-                                          u'traveling from|leaving from|flying from|travelling from|'
-                                          + hinglish_departure)
-            hinglish_arrival = u'कहां जाना|\u0916\u093c\u0924\u092e|\u0959\u0924\u092e'  # unicode for ख़तम
-            arrival_regexp = re.compile(u'traveling to|travelling to|arrival city|'
-                                        u'arrival|destination city|destination|leaving to|flying to|'
-                                        + hinglish_arrival)
-            if departure_regexp.search(self.bot_message) is not None:
-                departure_city_flag = True
-            elif arrival_regexp.search(self.bot_message) is not None:
-                arrival_city_flag = True
+        departure_city_flag = self.bot_context.departure_city
+        arrival_city_flag = self.bot_context.arrival_city
 
         patterns = re.findall(u'\\s((.+))\\.?', self.processed_text.lower(), re.UNICODE)
 
@@ -417,6 +406,7 @@ class CityDetector(object):
         """
 
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
 
     def convert_city_dict_in_tuple(self, entity_dict_list):
         """
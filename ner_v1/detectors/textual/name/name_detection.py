@@ -5,6 +5,7 @@ import re
 import string
 from six.moves import range
 
+from chatbot_ner.config import SPACY_BULK_PROCESSES
 from language_utilities.constant import (ENGLISH_LANG)
 from lib.nlp.const import nltk_tokenizer
 from lib.nlp.pos import POS
@@ -188,6 +189,50 @@ class NameDetector(object):
 
         return entity_value, original_text
 
+    def detect_entity_bulk(self, texts, bot_message=None, predetected_values=None, **kwargs):
+        """
+        Detect names in multiple texts. For languages tagged with spacy, all texts are pos tagged together in
+        batches before running detection on each text
+
+        Args:
+           texts (list of str): the original texts
+           bot_message (str): previous bot message
+           predetected_values (list of list of str): detected values from prior detection for each text
+
+        Returns:
+            tuple: tuple containing
+                list of list: entity values detected in each text
+                list of list: original texts detected in each text
+
+        Raises:
+            ValueError: if predetected_values is given and does not have one item for each text
+
+        Example:
+            texts = ['my name is yash doshi', 'i am nikhil']
+            detect_entity_bulk(texts=texts)
+            >> [[{first_name: "yash", middle_name: None, last_name: "doshi"}], [{first_name: "nikhil", ...}]],
+               [["yash doshi"], ["nikhil"]]
+        """
+        if predetected_values and len(predetected_values) != len(texts):
+            raise ValueError(f'predetected_values has {len(predetected_values)} items for {len(texts)} texts')
+        predetected_values = predetected_values or [[] for _ in texts]
+        if self.language in EUROPEAN_LANGUAGES_SET and not (bot_message and
+                                                             not self.context_check_botmessage(bot_message)):
+            texts_to_tag = [text.strip() for text, predetected in zip(texts, predetected_values)
+                            if text and not predetected]
+            if texts_to_tag:
+                spacy_utils.tag_bulk(texts=texts_to_tag, language=self.language, n_process=SPACY_BULK_PROCESSES)
+
+        entities_list, original_texts_list = [], []
+        for text, predetected in zip(texts, predetected_values):
+            entity_value, original_text = [], []
+            if text:
+                entity_value, original_text = self.detect_entity(text=text, bot_message=bot_message,
+                                                                 predetected_values=predetected)
+            entities_list.append(entity_value)
+            original_texts_list.append(original_text)
+        return entities_list, original_texts_list
+
     def detect_english_name(self, text=None):
         """
         This method is used to detect English names from the provided text
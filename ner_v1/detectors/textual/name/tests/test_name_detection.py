@@ -2,6 +2,7 @@ from __future__ import absolute_import
 
 import os
 
+import mock
 import pandas as pd
 from django.test import TestCase
 
@@ -77,3 +78,24 @@ class NameDetectionTest(TestCase):
                 person_name_dict[person_name_key] = None
 
         return person_name_dict
+
+
+class NameDetectionBulkTest(TestCase):
+
+    def test_person_name_bulk_detection_tags_texts_together(self):
+        texts = ['juan', 'me llamo', '']
+        tags = {'juan': [('juan', 'PROPN')], 'me llamo': [('me', 'PRON'), ('llamo', 'VERB')]}
+        name_detector = NameDetector(language='es', entity_name='person_name')
+        with mock.patch('ner_v1.detectors.textual.name.name_detection.spacy_utils') as spacy_utils, \
+                mock.patch('ner_v1.detectors.textual.name.name_detection.SPACY_BULK_PROCESSES', 2):
+            spacy_utils.tag.side_effect = lambda text, language: tags[text]
+            detected_texts, original_texts = name_detector.detect_entity_bulk(texts=texts,
+                                                                              bot_message='cual es tu nombre')
+        spacy_utils.tag_bulk.assert_called_once_with(texts=['juan', 'me llamo'], language='es', n_process=2)
+        self.assertEqual(original_texts, [['juan'], [], []])
+        self.assertEqual(detected_texts[0][0]['first_name'], 'juan')
+
+    def test_person_name_bulk_detection_checks_predetected_values_length(self):
+        name_detector = NameDetector(language='es', entity_name='person_name')
+        with self.assertRaises(ValueError):
+            name_detector.detect_entity_bulk(texts=['juan', 'me llamo'], predetected_values=[['juan']])
@@ -9,7 +9,8 @@ from six.moves import range
 import language_utilities.constant as lang_constant
 from chatbot_ner.config import ner_logger
 from datastore import DataStore
-from lib.nlp.const import TOKENIZER, whitespace_tokenizer
+from lib.nlp.span_rewrite import replace_words
+from lib.nlp.token_cache import TokenCache, find_token_sequence
 from lib.nlp.text_normalization import edit_distance
 from ner_constants import ENTITY_VALUE_DICT_KEY
 from ner_v1.detectors.base_detector import BaseDetector
@@ -24,6 +25,9 @@ except ImportError:
 
     _re_flags = re.UNICODE
 
+# Leading and trailing punctuation, stripped from detected original texts before tagging them
+_BOUNDARY_PUNCT_PATTERN = re.compile(r'(^[{0}]+)|([{0}]+$)'.format(re.escape(string.punctuation)))
+
 
 class TextDetector(BaseDetector):
     """
@@ -85,6 +89,7 @@ class TextDetector(BaseDetector):
         self.__texts = []
         self.__tagged_texts = []
         self.__processed_texts = []
+        self._token_cache = TokenCache()
 
         self.entity_name = entity_name
         self.tag = '__' + self.entity_name + '__'
@@ -111,6 +116,7 @@ class TextDetector(BaseDetector):
         self.__texts = []
         self.__tagged_texts = []
         self.__processed_texts = []
+        self._token_cache = TokenCache()
 
     def set_fuzziness_threshold(self, fuzziness):
         """
@@ -222,65 +228,11 @@ class TextDetector(BaseDetector):
         Notice that & is dropped during tokenization but when finding original text, we recover it from processed text
         """
 
-        def _get_tokens_and_indices(txt):
-            """
-            Args:
-                txt (str or unicode): text to get tokens from and indicies of those tokens in the given text
-
-            Returns:
-                tuple:
-                    list: containing tokens, direct results from tokenizer.tokenize
-                    list: containing (int, int) indicating start and end position of ith token (of first list)
-                          in given text
-
-            E.g.
-            In: text = u'i want to order 1 pc hot & crispy'
-            Out: ([u'i', u'want', u'to', u'order', u'1', u'pc', u'hot', u'crispy'],
-                  [(1, 2), (3, 7), (8, 10), (11, 16), (17, 18), (19, 21), (22, 25), (28, 34)])
-
-            """
-            txt = txt.rstrip() + ' __eos__'
-            processed_text_tokens = TOKENIZER.tokenize(txt)
-            processed_text_tokens_indices = []
-
-            offset = 0
-            for token in processed_text_tokens:
-                st = txt.index(token)
-                en = st + len(token)
-
-                # Small block to handle tricky cases like '(A B) C'
-                # It extends the previous token's end boundary if there are special characters except whitespace
-                # towards the end of previous token
-                prefix = txt[:en]
-                prefix_tokens = whitespace_tokenizer.tokenize(prefix)
-                if prefix and len(prefix_tokens) > 1 and prefix_tokens[0]:
-                    if processed_text_tokens_indices:
-                        s, e = processed_text_tokens_indices.pop()
-                        e += len(prefix_tokens[0])
-                        processed_text_tokens_indices.append((s, e))
-
-                txt = txt[en:]
-                processed_text_tokens_indices.append((offset + st, offset + en))
-                offset += en
-
-            # remove eos parts
-            processed_text_tokens.pop()
-            processed_text_tokens_indices.pop()
-
-            return processed_text_tokens, processed_text_tokens_indices
-
-        try:
-            n = len(matched_tokens)
-            tokens, indices = _get_tokens_and_indices(text)
-            for i in range(len(tokens) - n + 1):
-                if tokens[i:i + n] == matched_tokens:
-                    start = indices[i][0]
-                    end = indices[i + n - 1][1]
-                    return text[start:end]
-        except (ValueError, IndexError):
-            ner_logger.exception('Error getting original text (%s, %s)' % (matched_tokens, text))
-
-        return u' '.join(matched_tokens)
+        original_text = find_token_sequence(text, matched_tokens, aligned=self._token_cache.align(text))
+        if original_text is None:
+            ner_logger.debug('Could not find original text (%s, %s)' % (matched_tokens, text))
+            return u' '.join(matched_tokens)
+        return original_text
 
     def detect_entity_bulk(self, texts, predetected_values=None, **kwargs):
         """
@@ -431,7 +383,7 @@ class TextDetector(BaseDetector):
 
         original_final_list_ = []
         value_final_list_ = []
-        texts = [u' '.join(TOKENIZER.tokenize(processed_text)) for processed_text in self.__processed_texts]
+        texts = [u' '.join(self._token_cache.tokenize(processed_text)) for processed_text in self.__processed_texts]
 
         _variants_to_values_list = self.db.get_similar_dictionary(entity_name=self.entity_name,
                                                                   texts=texts,
@@ -455,12 +407,12 @@ class TextDetector(BaseDetector):
             exact_matches, fuzzy_variants = [], []
             _text = texts
             for variant in variants_list:
-                if u' '.join(TOKENIZER.tokenize(variant)) in _text[index]:
+                if self._token_cache.normalize_variant(variant) in _text[index]:
                     exact_matches.append(variant)
                 else:
                     fuzzy_variants.append(variant)
-            exact_matches.sort(key=lambda s: len(TOKENIZER.tokenize(s)), reverse=True)
-            fuzzy_variants.sort(key=lambda s: len(TOKENIZER.tokenize(s)), reverse=True)
+            exact_matches.sort(key=lambda s: len(self._token_cache.tokenize_variant(s)), reverse=True)
+            fuzzy_variants.sort(key=lambda s: len(self._token_cache.tokenize_variant(s)), reverse=True)
             variants_list = exact_matches + fuzzy_variants
 
             for variant in variants_list:
@@ -470,14 +422,13 @@ class TextDetector(BaseDetector):
                     value_final_list.append(variants_to_values[variant])
                     original_final_list.append(original_text)
 
-                    boundary_punct_pattern = re.compile(r'(^[{0}]+)|([{0}]+$)'.format(re.escape(string.punctuation)))
-                    original_text_ = boundary_punct_pattern.sub("", original_text)
+                    original_text_ = _BOUNDARY_PUNCT_PATTERN.sub("", original_text)
 
-                    _pattern = re.compile(r'\b%s\b' % re.escape(original_text_), flags=_re_flags)
-                    self.__tagged_texts[index] = _pattern.sub(self.tag, self.__tagged_texts[index])
+                    self.__tagged_texts[index] = replace_words(self.__tagged_texts[index], original_text_, self.tag)
                     # Instead of dropping completely like in other entities,
                     # we replace with tag to avoid matching non contiguous segments
-                    self.__processed_texts[index] = _pattern.sub(self.tag, self.__processed_texts[index])
+                    self.__processed_texts[index] = replace_words(self.__processed_texts[index], original_text_,
+                                                                  self.tag)
             value_final_list_.append(value_final_list)
             original_final_list_.append(original_final_list)
 
@@ -506,8 +457,8 @@ class TextDetector(BaseDetector):
             'delehi'
 
         """
-        variant_tokens = TOKENIZER.tokenize(variant)
-        text_tokens = TOKENIZER.tokenize(text)
+        variant_tokens = self._token_cache.tokenize_variant(variant)
+        text_tokens = self._token_cache.tokenize(text)
         original_text_tokens = []
         variant_token_i = 0
         for text_token in text_tokens:
@@ -9,6 +9,9 @@ from django.views.decorators.csrf import csrf_exempt
 from elasticsearch import exceptions as es_exceptions
 
 from chatbot_ner.config import ner_logger
+from chatbot_ner.payload_logging import payload_logger
+from datastore import circuit_breaker
+from datastore.elastic_search import transport
 from datastore.exceptions import DataStoreRequestException
 from language_utilities.constant import ENGLISH_LANG, CHINESE_TRADITIONAL_LANG
 from ner_constants import PARAMETER_MESSAGE, PARAMETER_ENTITY_NAME, PARAMETER_STRUCTURED_VALUE, \
@@ -21,6 +24,7 @@ from ner_v2.detectors.numeral.number_range.number_range_detection import NumberR
 from ner_v2.detectors.pattern.phone_number.phone_number_detection import PhoneDetector, ChinesePhoneDetector
 from ner_v2.detectors.temporal.date.date_detection import DateAdvancedDetector
 from ner_v2.detectors.temporal.time.time_detection import TimeDetector
+from ner_v2.detectors.textual import elastic_search
 from ner_v2.detectors.textual.utils import get_text_entity_detection_data, validate_text_request, InvalidTextRequest
 
 
@@ -160,7 +164,7 @@ def date(request):
         elif isinstance(message, (list, tuple)):
             entity_output = date_detection.detect_bulk(messages=message)
 
-        ner_logger.debug('Finished %s : %s ' % (parameters_dict[PARAMETER_ENTITY_NAME], entity_output))
+        payload_logger.debug(f'Finished {parameters_dict[PARAMETER_ENTITY_NAME]}', entity_output)
     except InvalidTextRequest as err:
         response = {"success": False, "error": str(err)}
         ner_logger.exception(f"Error in validating request body for {request.path}, error: {err}")
@@ -263,7 +267,7 @@ def time(request):
         elif isinstance(message, (list, tuple)):
             entity_output = time_detection.detect_bulk(messages=message)
 
-        ner_logger.debug('Finished %s : %s ' % (parameters_dict[PARAMETER_ENTITY_NAME], entity_output))
+        payload_logger.debug(f'Finished {parameters_dict[PARAMETER_ENTITY_NAME]}', entity_output)
     except InvalidTextRequest as err:
         response = {"success": False, "error": str(err)}
         ner_logger.exception(f"Error in validating request body for {request.path}, error: {err}")
@@ -382,7 +386,7 @@ def number(request):
         elif isinstance(message, (list, tuple)):
             entity_output = number_detection.detect_bulk(messages=message)
 
-        ner_logger.debug('Finished %s : %s ' % (parameters_dict[PARAMETER_ENTITY_NAME], entity_output))
+        payload_logger.debug(f'Finished {parameters_dict[PARAMETER_ENTITY_NAME]}', entity_output)
     except InvalidTextRequest as err:
         response = {"success": False, "error": str(err)}
         ner_logger.exception(f"Error in validating request body for {request.path}, error: {err}")
@@ -475,7 +479,7 @@ def number_range(request):
         elif isinstance(message, (list, tuple)):
             entity_output = number_range_detector.detect_bulk(messages=message)
 
-        ner_logger.debug('Finished %s : %s ' % (parameters_dict[PARAMETER_ENTITY_NAME], entity_output))
+        payload_logger.debug(f'Finished {parameters_dict[PARAMETER_ENTITY_NAME]}', entity_output)
 
     except InvalidTextRequest as err:
         response = {"success": False, "error": str(err)}
@@ -650,7 +654,7 @@ def phone_number(request):
                                                           bot_message=parameters_dict[PARAMETER_BOT_MESSAGE])
         elif isinstance(message, (list, tuple)):
             entity_output = phone_number_detection.detect_bulk(messages=message)
-        ner_logger.debug('Finished %s : %s ' % (parameters_dict[PARAMETER_ENTITY_NAME], entity_output))
+        payload_logger.debug(f'Finished {parameters_dict[PARAMETER_ENTITY_NAME]}', entity_output)
     except InvalidTextRequest as err:
         response = {"success": False, "error": str(err)}
         ner_logger.exception(f"Error in validating request body for {request.path}, error: {err}")
@@ -833,3 +837,56 @@ def text(request):
     else:
         response = {"success": False, "error": "Some error while parsing"}
         return JsonResponse(response, status=500)
+
+
+def msearch_batch_stats(request):
+    """
+    Counters and batch size distributions of the msearch batching of text detections, see
+    `ner_v2.detectors.textual.msearch_batching.MsearchBatcher.stats`
+
+    Args:
+        request (django.http.request.HttpRequest): HttpRequest object
+
+    Returns:
+        response (django.http.response.JsonResponse): JsonResponse with the stats as `data`, 404 if batching is
+            disabled
+    """
+    if elastic_search.msearch_batcher is None:
+        response = {"success": False, "error": "msearch batching is disabled, see ES_MSEARCH_BATCH_WAIT_MS"}
+        return JsonResponse(response, status=404)
+    response = {"success": True, "error": None, "data": elastic_search.msearch_batcher.stats()}
+    return JsonResponse(response, status=200)
+
+
+def es_circuit_breaker_stats(request):
+    """
+    State and counters of the circuit breaker of the Elasticsearch text lookups, see
+    `datastore.circuit_breaker.CircuitBreaker.stats`
+
+    Args:
+        request (django.http.request.HttpRequest): HttpRequest object
+
+    Returns:
+        response (django.http.response.JsonResponse): JsonResponse with the stats as `data`, 404 if the breaker is
+            disabled
+    """
+    if circuit_breaker.es_circuit_breaker is None:
+        response = {"success": False, "error": "circuit breaker is disabled, see ES_BREAKER_ENABLED"}
+        return JsonResponse(response, status=404)
+    response = {"success": True, "error": None, "data": circuit_breaker.es_circuit_breaker.stats()}
+    return JsonResponse(response, status=200)
+
+
+def es_pool_stats(request):
+    """
+    Utilisation of the connection pools of the Elasticsearch clients of the worker, see
+    `datastore.elastic_search.transport.pool_stats`
+
+    Args:
+        request (django.http.request.HttpRequest): HttpRequest object
+
+    Returns:
+        response (django.http.response.JsonResponse): JsonResponse with the stats as `data`
+    """
+    response = {"success": True, "error": None, "data": transport.pool_stats()}
+    return JsonResponse(response, status=200)
@@ -58,6 +58,24 @@ class BaseDetector(object):
         """
         return [], []
 
+    def detect_entity_bulk(self, texts, **kwargs):
+        """
+        Runs detect_entity on each of the texts. Detectors that can process many texts faster together should
+        override this
+        Args:
+            texts (list of str): text snippets from which entities needs to be detected
+            **kwargs: passed on to detect_entity
+        Return:
+            tuple: Two lists with one entry per text, each entry being the lists of detected values and original
+            substrings returned by detect_entity for that text
+        """
+        bulk_entities_list, bulk_original_texts_list = [], []
+        for text in texts:
+            entities_list, original_texts_list = self.detect_entity(text=text, **kwargs)
+            bulk_entities_list.append(entities_list)
+            bulk_original_texts_list.append(original_texts_list)
+        return bulk_entities_list, bulk_original_texts_list
+
     def _set_language_processing_script(self):
         """
         This method is used to decide the language in which detector should run it's logic based on
@@ -190,12 +208,7 @@ class BaseDetector(object):
                 messages.append(translation_output[TRANSLATED_TEXT] if translation_output['status'] else '')
 
         texts = messages
-        bulk_entities_list, bulk_original_texts_list = [], []
-
-        for text in texts:
-            entities_list, original_texts_list = self.detect_entity(text=text, **kwargs)
-            bulk_entities_list.append(entities_list)
-            bulk_original_texts_list.append(original_texts_list)
+        bulk_entities_list, bulk_original_texts_list = self.detect_entity_bulk(texts, **kwargs)
 
         values_list, method, original_texts_list = bulk_entities_list, FROM_MESSAGE, bulk_original_texts_list
 
@@ -0,0 +1,221 @@
+"""
+Loader for the small csv files under each language's `data` directory used by the detectors.
+
+All language csv files are compiled once into a single versioned pickle artifact (see `build_language_data`) so that
+detectors can read them without importing pandas or parsing csv on the request path. The artifact is only trusted for
+a file if the sha1 of the csv on disk matches the one recorded at build time, otherwise the csv is parsed directly.
+Either way each file is loaded at most once per process.
+
+Build the artifact with:
+    python -m ner_v2.detectors.language_data
+"""
+from __future__ import absolute_import
+
+import csv
+import hashlib
+import io
+import os
+import pickle
+import re
+import threading
+
+from chatbot_ner.config import ner_logger
+from ner_v2.constant import LANGUAGE_DATA_DIRECTORY
+
+DETECTORS_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+LANGUAGE_DATA_ARTIFACT_PATH = os.path.join(DETECTORS_DIRECTORY, 'compiled_language_data.pickle')
+# Bump this whenever the structure of the artifact or the csv parsing semantics change
+LANGUAGE_DATA_FORMAT_VERSION = 1
+# Protocol 4 keeps the artifact readable on every python version we deploy on (3.6+)
+LANGUAGE_DATA_PICKLE_PROTOCOL = 4
+
+# Same defaults as pandas.read_csv so that parsed values stay identical to what the detectors used to get
+_NA_VALUES = frozenset(['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+                        '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null'])
+_TRUE_VALUES = frozenset(['True', 'TRUE', 'true'])
+_FALSE_VALUES = frozenset(['False', 'FALSE', 'false'])
+# python's int() and float() also accept non ascii digits, pandas does not
+_ASCII_RE = re.compile(r'^[\x00-\x7f]*$')
+
+_lock = threading.Lock()
+_artifact_files = None
+_loaded_records = {}
+
+
+def _convert_column(raw_values):
+    """
+    Infer the type of a csv column the way pandas.read_csv does and convert its values.
+    NA values become float('nan'), integer columns with NA values become float columns.
+
+    Args:
+        raw_values (list): list of str (or None for missing fields) values of the column
+
+    Returns:
+        list: converted values
+    """
+    nan = float('nan')
+    is_na = [value is None or value in _NA_VALUES for value in raw_values]
+    values = [value for value, na in zip(raw_values, is_na) if not na]
+    has_na = any(is_na)
+
+    for converter in (int, float):
+        if not all(_ASCII_RE.match(value) for value in values):
+            break
+        try:
+            converted = iter([converter(value) for value in values])
+        except ValueError:
+            continue
+        if converter is int and has_na:
+            converted = iter([float(value) for value in values])
+        return [nan if na else next(converted) for na in is_na]
+
+    if values and all(value in _TRUE_VALUES or value in _FALSE_VALUES for value in values):
+        converted = iter([value in _TRUE_VALUES for value in values])
+        return [nan if na else next(converted) for na in is_na]
+
+    return [nan if na else value for value, na in zip(raw_values, is_na)]
+
+
+def parse_csv(content):
+    """
+    Parse csv content into records
+
+    Args:
+        content (bytes): raw content of the csv file
+
+    Returns:
+        list of dict: one dict per row mapping column name to value. Duplicate column names are suffixed with
+            `.1`, `.2`, ... like pandas does
+    """
+    rows = [row for row in csv.reader(io.StringIO(content.decode('utf-8-sig'))) if row]
+    if not rows:
+        return []
+    header, rows = rows[0], rows[1:]
+
+    columns, seen = [], {}
+    for column in header:
+        if column in seen:
+            seen[column] += 1
+            column = '{}.{}'.format(column, seen[column])
+        else:
+            seen[column] = 0
+        columns.append(column)
+
+    raw_columns = [[row[index] if index < len(row) else None for row in rows] for index in range(len(columns))]
+    converted_columns = [_convert_column(raw_values) for raw_values in raw_columns]
+    return [dict(zip(columns, row_values)) for row_values in zip(*converted_columns)]
+
+
+def _sha1(content):
+    return hashlib.sha1(content).hexdigest()
+
+
+def _relative_path(csv_path):
+    return os.path.relpath(os.path.abspath(csv_path), DETECTORS_DIRECTORY)
+
+
+def _read_artifact(artifact_path=LANGUAGE_DATA_ARTIFACT_PATH):
+    """
+    Read the compiled artifact, returns an empty dict if it is missing, unreadable or of a different version
+    """
+    if not os.path.exists(artifact_path):
+        ner_logger.debug('Compiled language data not found at {}, csv files will be parsed'.format(artifact_path))
+        return {}
+    try:
+        with open(artifact_path, 'rb') as f:
+            artifact = pickle.load(f)
+    except Exception as e:
+        ner_logger.warning('Failed to read compiled language data at {}: {}'.format(artifact_path, e))
+        return {}
+    if artifact.get('version') != LANGUAGE_DATA_FORMAT_VERSION:
+        ner_logger.warning('Compiled language data at {} has version {}, expected {}. Please rebuild it'.format(
+            artifact_path, artifact.get('version'), LANGUAGE_DATA_FORMAT_VERSION))
+        return {}
+    return artifact['files']
+
+
+def load_csv_records(csv_path):
+    """
+    Get records of a language data csv file, from the compiled artifact if it is up to date with the file on disk,
+    otherwise by parsing the csv. Records are loaded once per process, callers must not mutate them.
+
+    Args:
+        csv_path (str): path to the csv file
+
+    Returns:
+        list of dict: one dict per row mapping column name to value
+
+    Raises:
+        IOError: if the csv file does not exist
+    """
+    global _artifact_files
+    csv_path = os.path.abspath(csv_path)
+    records = _loaded_records.get(csv_path)
+    if records is not None:
+        return records
+
+    with _lock:
+        records = _loaded_records.get(csv_path)
+        if records is not None:
+            return records
+        if _artifact_files is None:
+            _artifact_files = _read_artifact()
+
+        with open(csv_path, 'rb') as f:
+            content = f.read()
+        compiled = _artifact_files.get(_relative_path(csv_path))
+        if compiled is not None and compiled['sha1'] == _sha1(content):
+            records = compiled['records']
+        else:
+            if _artifact_files:
+                ner_logger.warning('Compiled language data is stale for {}, parsing csv. '
+                                   'Please rebuild it'.format(csv_path))
+            records = parse_csv(content)
+        _loaded_records[csv_path] = records
+    return records
+
+
+def find_language_data_files(root=DETECTORS_DIRECTORY):
+    """
+    Find all csv files inside language data directories under root
+
+    Args:
+        root (str): directory to search under
+
+    Returns:
+        list of str: sorted absolute paths of csv files
+    """
+    csv_paths = []
+    for dirpath, _, filenames in os.walk(root):
+        if os.path.basename(dirpath) != LANGUAGE_DATA_DIRECTORY:
+            continue
+        csv_paths.extend(os.path.join(dirpath, filename) for filename in filenames if filename.endswith('.csv'))
+    return sorted(csv_paths)
+
+
+def build_language_data(artifact_path=LANGUAGE_DATA_ARTIFACT_PATH):
+    """
+    Compile all language data csv files into a single pickle artifact
+
+    Args:
+        artifact_path (str): path to write the artifact at
+
+    Returns:
+        int: number of csv files compiled
+    """
+    files = {}
+    for csv_path in find_language_data_files():
+        with open(csv_path, 'rb') as f:
+            content = f.read()
+        files[_relative_path(csv_path)] = {'sha1': _sha1(content), 'records': parse_csv(content)}
+
+    tmp_path = artifact_path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        pickle.dump({'version': LANGUAGE_DATA_FORMAT_VERSION, 'files': files}, f,
+                    protocol=LANGUAGE_DATA_PICKLE_PROTOCOL)
+    os.rename(tmp_path, artifact_path)
+    return len(files)
+
+
+if __name__ == '__main__':
+    print('Compiled {} language data files into {}'.format(build_language_data(), LANGUAGE_DATA_ARTIFACT_PATH))
@@ -0,0 +1,121 @@
+"""
+Registry of the language specific modules of date, time, number and number range detectors.
+
+Each of these detectors looks for a module for the requested language (e.g. `ner_v2.detectors.temporal.date.hi.
+date_detection`) and falls back to its standard regex / csv based detector when there is none. The registry resolves
+each (detector, language) pair once per process: the language detector class is imported and kept, and languages
+without a module are remembered as such, so requests don't pay for a failed import each time a detector is created.
+Supported languages (language data directories next to each detector) are listed once as well.
+
+`warm_up_language_registry` resolves all pairs ahead of the first request, see `chatbot_ner.warmup`.
+"""
+from __future__ import absolute_import
+
+import collections
+import importlib
+import os
+import threading
+
+from chatbot_ner.config import ner_logger
+
+LanguageModuleSpec = collections.namedtuple('LanguageModuleSpec', ['package', 'module', 'class_name',
+                                                                   'language_code_lengths'])
+
+DATE = 'date'
+TIME = 'time'
+NUMBER = 'number'
+NUMBER_RANGE = 'number_range'
+
+LANGUAGE_MODULE_SPECS = collections.OrderedDict([
+    (DATE, LanguageModuleSpec(package='ner_v2.detectors.temporal.date', module='date_detection',
+                              class_name='DateDetector', language_code_lengths=(2,))),
+    (TIME, LanguageModuleSpec(package='ner_v2.detectors.temporal.time', module='time_detection',
+                              class_name='TimeDetector', language_code_lengths=(2,))),
+    (NUMBER, LanguageModuleSpec(package='ner_v2.detectors.numeral.number', module='number_detection',
+                                class_name='NumberDetector', language_code_lengths=(2, 5))),
+    (NUMBER_RANGE, LanguageModuleSpec(package='ner_v2.detectors.numeral.number_range',
+                                      module='number_range_detection', class_name='NumberRangeDetector',
+                                      language_code_lengths=(2,))),
+])
+
+# (detector, language) -> language detector class, None if the language has no module of its own
+_language_detector_classes = {}
+# detector -> tuple of supported languages
+_supported_languages = {}
+_registry_lock = threading.Lock()
+
+
+def get_supported_languages(detector):
+    """
+    Get languages the detector has language data for, i.e. names of the language directories in its package
+
+    Args:
+        detector (str): one of the keys of LANGUAGE_MODULE_SPECS
+
+    Returns:
+        list: language codes
+    """
+    languages = _supported_languages.get(detector)
+    if languages is None:
+        spec = LANGUAGE_MODULE_SPECS[detector]
+        package_directory = os.path.dirname(os.path.abspath(importlib.import_module(spec.package).__file__))
+        languages = tuple(name for name in os.listdir(package_directory)
+                          if os.path.isdir(os.path.join(package_directory, name))
+                          and len(name.rstrip(os.sep)) in spec.language_code_lengths)
+        with _registry_lock:
+            _supported_languages[detector] = languages
+    return list(languages)
+
+
+def get_language_detector_class(detector, language):
+    """
+    Get the language specific detector class of the detector for the language
+
+    Args:
+        detector (str): one of the keys of LANGUAGE_MODULE_SPECS
+        language (str): ISO 639 language code
+
+    Returns:
+        type or None: detector class of the language module, None if the language has no module and the standard
+            detector should be used
+    """
+    key = (detector, language)
+    try:
+        return _language_detector_classes[key]
+    except KeyError:
+        pass
+
+    spec = LANGUAGE_MODULE_SPECS[detector]
+    module_name = '{package}.{language}.{module}'.format(package=spec.package, language=language, module=spec.module)
+    try:
+        detector_class = getattr(importlib.import_module(module_name), spec.class_name)
+    except ImportError as e:
+        if getattr(e, 'name', None) not in (None, module_name) and not module_name.startswith(e.name + '.'):
+            # the language module exists but one of its own imports failed
+            ner_logger.warning('Could not import {module_name}, using standard {detector} detector for {language}: '
+                               '{error}'.format(module_name=module_name, detector=detector, language=language,
+                                                error=e))
+        detector_class = None
+
+    with _registry_lock:
+        _language_detector_classes[key] = detector_class
+    return detector_class
+
+
+def warm_up_language_registry(languages=None):
+    """
+    Resolve the language detector classes of all detectors ahead of time
+
+    Args:
+        languages (list, optional): language codes to resolve. Defaults to None, which resolves all languages each
+            detector supports
+
+    Returns:
+        dict: detector -> list of languages that have a language module of their own
+    """
+    language_modules = collections.OrderedDict()
+    for detector in LANGUAGE_MODULE_SPECS:
+        detector_languages = get_supported_languages(detector) if languages is None else languages
+        language_modules[detector] = [language for language in detector_languages
+                                      if get_language_detector_class(detector, language) is not None]
+    return language_modules
@@ -1,8 +1,9 @@
 from __future__ import absolute_import
 
-import importlib
+import collections
 import math
 import os
+import threading
 from six.moves import zip
 
 from chatbot_ner.config import ner_logger
@@ -19,11 +20,26 @@ except ImportError:
     _re_flags = re.UNICODE
 
 from language_utilities.constant import ENGLISH_LANG
+from ner_v2.detectors import language_registry
 from ner_v2.detectors.base_detector import BaseDetector
 from ner_v2.detectors.numeral.constant import NUMBER_DETECTION_RETURN_DICT_VALUE, NUMBER_DETECTION_RETURN_DICT_UNIT
+from ner_v2.detectors.numeral.number import standard_number_detector
 from ner_v2.detectors.utils import get_lang_data_path
 
 COMMON_NON_NUMERIC_PUNCTUATIONS = re.escape('!"#%&\'()*/;<=>?@[\\]^_`{|}~।')
+_NON_NUMERIC_PUNCTUATIONS_PATTERN = re.compile(f'[{COMMON_NON_NUMERIC_PUNCTUATIONS}]')
+
+NumberDetectionResult = collections.namedtuple('NumberDetectionResult', ['numbers', 'original_texts', 'tagged_text',
+                                                                         'processed_text'])
+
+_shared_number_detectors = {}
+_shared_number_detectors_lock = threading.Lock()
+# Max number of entity names a thread keeps a NumberDetector for, per SharedNumberDetector
+SHARED_NUMBER_DETECTOR_ENTITIES = 32
+
+
+def _get_language_number_detector_class(language):
+    return language_registry.get_language_detector_class(language_registry.NUMBER, language)
 
 
 class NumberDetector(BaseDetector):
@@ -77,13 +93,7 @@ class NumberDetector(BaseDetector):
         Returns:
             (list): supported languages
         """
-        supported_languages = []
-        cwd = os.path.dirname(os.path.abspath(__file__))
-        cwd_dirs = [x for x in os.listdir(cwd) if os.path.isdir(os.path.join(cwd, x))]
-        for _dir in cwd_dirs:
-            if len(_dir.rstrip(os.sep)) in [2, 5]:
-                supported_languages.append(_dir)
-        return supported_languages
+        return language_registry.get_supported_languages(language_registry.NUMBER)
 
     def __init__(self, entity_name, language=ENGLISH_LANG, unit_type=None, detect_without_unit=False):
         """Initializes a NumberDetector object
@@ -109,17 +119,13 @@ class NumberDetector(BaseDetector):
         self.language = language
         self.unit_type = unit_type
         self.detect_without_unit = detect_without_unit
-        self.punctuations_to_filter = re.compile(f'[{COMMON_NON_NUMERIC_PUNCTUATIONS}]')
-        try:
-            number_detector_module = importlib.import_module(
-                'ner_v2.detectors.numeral.number.{0}.number_detection'.format(self.language))
-            self.language_number_detector = number_detector_module.NumberDetector(entity_name=self.entity_name,
-                                                                                  unit_type=self.unit_type)
-        except ImportError:
-            standard_number_regex = importlib.import_module(
-                'ner_v2.detectors.numeral.number.standard_number_detector'
-            )
-            self.language_number_detector = standard_number_regex.NumberDetector(
+        self.punctuations_to_filter = _NON_NUMERIC_PUNCTUATIONS_PATTERN
+        language_number_detector_class = _get_language_number_detector_class(self.language)
+        if language_number_detector_class is not None:
+            self.language_number_detector = language_number_detector_class(entity_name=self.entity_name,
+                                                                           unit_type=self.unit_type)
+        else:
+            self.language_number_detector = standard_number_detector.NumberDetector(
                 entity_name=self.entity_name,
                 unit_type=self.unit_type,
                 data_directory_path=get_lang_data_path(detector_path=os.path.abspath(__file__),
@@ -242,3 +248,104 @@ class NumberDetector(BaseDetector):
 
     def _filter_non_num_punctuations(self, text):
         return re.sub(self.punctuations_to_filter, '', text)
+
+
+class SharedNumberDetector(object):
+    """
+    Read only number detection for a (language, unit_type) that can be shared across requests and threads, get
+    instances with `get_shared_number_detector`.
+
+    Language data (number words, scales, units) is loaded once when the instance is created. Each thread keeps a
+    `NumberDetector` per entity name built on that data, which `detect_entity` reuses after resetting its per call
+    settings (the text state is reset by `NumberDetector.detect_entity`), so threads never share detection state.
+    """
+
+    def __init__(self, language=ENGLISH_LANG, unit_type=None):
+        """
+        Args:
+            language (str, optional): language code of number text, defaults to 'en'
+            unit_type (str): number unit types like weight, currency, temperature, used to detect number with
+                               specific unit type.
+        """
+        self.language = language
+        self.unit_type = unit_type
+        self._number_detector = NumberDetector(entity_name='number', language=language, unit_type=unit_type)
+        self._local = threading.local()
+
+    @property
+    def language_number_detector(self):
+        """
+        Language number detector of this language and unit type. Only its read only helpers (e.g. `get_number`,
+        `units_map`) may be used, its detection methods keep state on the instance.
+        """
+        return self._number_detector.language_number_detector
+
+    def get_unit_type(self, detected_unit):
+        """
+        Get type of a detected unit, see `NumberDetector.get_unit_type`
+        """
+        return self._number_detector.get_unit_type(detected_unit)
+
+    def _get_number_detector(self, entity_name):
+        number_detectors = getattr(self._local, 'number_detectors', None)
+        if number_detectors is None:
+            number_detectors = self._local.number_detectors = collections.OrderedDict()
+        number_detector = number_detectors.get(entity_name)
+        if number_detector is None:
+            number_detector = NumberDetector(entity_name=entity_name, language=self.language, unit_type=self.unit_type)
+            number_detectors[entity_name] = number_detector
+            if len(number_detectors) > SHARED_NUMBER_DETECTOR_ENTITIES:
+                number_detectors.popitem(last=False)
+        else:
+            number_detectors.move_to_end(entity_name)
+        return number_detector
+
+    def detect_entity(self, text, entity_name='number', min_digit=None, max_digit=None, detect_without_unit=False):
+        """
+        Detect numbers in text
+
+        Args:
+            text (str): text to detect numbers in
+            entity_name (str): name used to tag detected numbers in tagged_text
+            min_digit (int, optional): minimum digits a number can have, defaults to NumberDetector's default
+            max_digit (int, optional): maximum digits a number can have, defaults to NumberDetector's default
+            detect_without_unit (bool): see `NumberDetector`
+
+        Returns:
+            NumberDetectionResult: namedtuple with
+                numbers (list): detected number dicts
+                original_texts (list): substrings of text the numbers were detected from
+                tagged_text (str): text with detected numbers replaced with the entity tag
+                processed_text (str): text with detected numbers removed
+        """
+        number_detector = self._get_number_detector(entity_name)
+        number_detector.detect_without_unit = detect_without_unit
+        number_detector.set_min_max_digits(
+            min_digit=self._number_detector.min_digit if min_digit is None else min_digit,
+            max_digit=self._number_detector.max_digit if max_digit is None else max_digit)
+        numbers, original_texts = number_detector.detect_entity(text)
+        return NumberDetectionResult(numbers=numbers, original_texts=original_texts,
+                                     tagged_text=number_detector.tagged_text,
+                                     processed_text=number_detector.processed_text)
+
+
+def get_shared_number_detector(language=ENGLISH_LANG, unit_type=None):
+    """
+    Get the process wide SharedNumberDetector for language and unit_type, created on first use
+
+    Args:
+        language (str, optional): language code of number text, defaults to 'en'
+        unit_type (str): number unit type, see `NumberDetector`
+
+    Returns:
+        SharedNumberDetector: shared number detector
+    """
+    key = (language, unit_type)
+    shared_number_detector = _shared_number_detectors.get(key)
+    if shared_number_detector is None:
+        with _shared_number_detectors_lock:
+            shared_number_detector = _shared_number_detectors.get(key)
+            if shared_number_detector is None:
+                shared_number_detector = SharedNumberDetector(language=language, unit_type=unit_type)
+                _shared_number_detectors[key] = shared_number_detector
+    return shared_number_detector
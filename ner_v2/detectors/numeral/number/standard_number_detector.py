@@ -3,7 +3,7 @@ from __future__ import absolute_import
 
 import collections
 import os
-import pandas as pd
+import threading
 from six.moves import zip
 
 try:
@@ -15,20 +15,121 @@ except ImportError:
 
     _re_flags = re.UNICODE
 
+from lib.nlp.span_rewrite import find_delimited, replace_delimited, replace_span
+from ner_v2.detectors.language_data import load_csv_records
 from ner_v2.detectors.numeral.constant import NUMBER_NUMERAL_FILE_VARIANTS_COLUMN_NAME, \
     NUMBER_NUMERAL_FILE_VALUE_COLUMN_NAME, NUMBER_NUMERAL_FILE_TYPE_COLUMN_NAME, NUMBER_TYPE_UNIT, \
     NUMBER_NUMERAL_CONSTANT_FILE_NAME, NUMBER_DETECTION_RETURN_DICT_VALUE, NUMBER_DETECTION_RETURN_DICT_SPAN, \
     NUMBER_DETECTION_RETURN_DICT_UNIT, NUMBER_UNITS_FILE_NAME, NUMBER_DATA_FILE_UNIT_VARIANTS_COLUMN_NAME, \
     NUMBER_DATA_FILE_UNIT_VALUE_COLUMN_NAME, NUMBER_TYPE_SCALE, NUMBER_DATA_FILE_UNIT_TYPE_COLUMN_NAME, \
     NUMBER_NUMERAL_FILE_NUMBER_COLUMN_NAME
-from ner_v2.detectors.numeral.utils import get_number_from_number_word, get_list_from_pipe_sep_string
+from ner_v2.detectors.numeral.utils import NumberWordParser, get_list_from_pipe_sep_string
 
 NumberVariant = collections.namedtuple('NumberVariant', ['scale', 'increment'])
 NumberUnit = collections.namedtuple('NumberUnit', ['value', 'type'])
+NumberLanguageData = collections.namedtuple('NumberLanguageData', ['base_numbers_map', 'numbers_word_map', 'scale_map',
+                                                                   'units_map', 'unit_choices', 'scale_map_choices',
+                                                                   'number_word_parser'])
+
+_number_language_data = {}
+_number_language_data_lock = threading.Lock()
+
+
+def _load_number_language_data(data_directory_path, unit_type=None):
+    """
+    Read number words, scales and units of a language from its data files
+
+    Args:
+        data_directory_path (str): path of data folder for given language
+        unit_type (str): if given, only units of this type are loaded
+
+    Returns:
+        NumberLanguageData: maps for the language
+    """
+    base_numbers_map, numbers_word_map, scale_map, units_map = {}, {}, {}, {}
+    # create number_words dict having number variants and their corresponding scale and increment value
+    # create language_scale_map dict having scale variants and their corresponding value
+    for row in load_csv_records(os.path.join(data_directory_path, NUMBER_NUMERAL_CONSTANT_FILE_NAME)):
+        name_variants = get_list_from_pipe_sep_string(row[NUMBER_NUMERAL_FILE_VARIANTS_COLUMN_NAME])
+        value = row[NUMBER_NUMERAL_FILE_VALUE_COLUMN_NAME]
+        if float(value).is_integer():
+            value = int(row[NUMBER_NUMERAL_FILE_VALUE_COLUMN_NAME])
+        number_type = row[NUMBER_NUMERAL_FILE_TYPE_COLUMN_NAME]
+
+        if number_type == NUMBER_TYPE_UNIT:
+            for numeral in name_variants:
+                # tuple values to corresponds to (scale, increment), for unit type, scale will always be 1.
+                numbers_word_map[numeral] = NumberVariant(scale=1, increment=value)
+                # map the name of number to latin numeric value
+                base_numbers_map[numeral] = value
+
+        elif number_type == NUMBER_TYPE_SCALE:
+            for numeral in name_variants:
+                # tuple values to corresponds to (scale, increment), for scale type, increment will always be 0.
+                numbers_word_map[numeral] = NumberVariant(scale=value, increment=0)
+                # Dict map to store scale and their values
+                scale_map[numeral] = value
+                # map the name of number to latin numeric value
+                base_numbers_map[numeral] = value
+
+        number_text = row[NUMBER_NUMERAL_FILE_NUMBER_COLUMN_NAME]
+        base_numbers_map[number_text] = value
+
+    # create units_dict having unit variants and their corresponding value
+    unit_file_path = os.path.join(data_directory_path, NUMBER_UNITS_FILE_NAME)
+    if os.path.exists(unit_file_path):
+        for row in load_csv_records(unit_file_path):
+            if unit_type and row[NUMBER_DATA_FILE_UNIT_TYPE_COLUMN_NAME] != unit_type:
+                continue
+            unit_variants = get_list_from_pipe_sep_string(row[NUMBER_DATA_FILE_UNIT_VARIANTS_COLUMN_NAME])
+            unit_value = row[NUMBER_DATA_FILE_UNIT_VALUE_COLUMN_NAME]
+            row_unit_type = row[NUMBER_DATA_FILE_UNIT_TYPE_COLUMN_NAME]
+            for unit in unit_variants:
+                units_map[unit] = NumberUnit(value=unit_value, type=row_unit_type)
+
+    sorted_len_units_keys = sorted(list(units_map.keys()), key=len, reverse=True)
+    unit_choices = "|".join([re.escape(x) for x in sorted_len_units_keys])
+
+    sorted_len_scale_map = sorted(list(scale_map.keys()), key=len, reverse=True)
+    # using re.escape for strict matches in case pattern comes with '.' or '*', which should be escaped
+    scale_map_choices = "|".join([re.escape(x) for x in sorted_len_scale_map])
+
+    return NumberLanguageData(base_numbers_map=base_numbers_map, numbers_word_map=numbers_word_map,
+                              scale_map=scale_map, units_map=units_map, unit_choices=unit_choices,
+                              scale_map_choices=scale_map_choices,
+                              number_word_parser=NumberWordParser(numbers_word_map))
+
+
+def get_number_language_data(data_directory_path, unit_type=None):
+    """
+    Get number words, scales and units of a language. Loaded once per (data_directory_path, unit_type) and process,
+    the returned maps are shared by every caller and must not be mutated.
+
+    Args:
+        data_directory_path (str): path of data folder for given language
+        unit_type (str): if given, only units of this type are loaded
+
+    Returns:
+        NumberLanguageData: maps for the language
+    """
+    key = (os.path.abspath(data_directory_path), unit_type)
+    number_language_data = _number_language_data.get(key)
+    if number_language_data is None:
+        with _number_language_data_lock:
+            number_language_data = _number_language_data.get(key)
+            if number_language_data is None:
+                number_language_data = _load_number_language_data(data_directory_path, unit_type=unit_type)
+                _number_language_data[key] = number_language_data
+    return number_language_data
 
 
 class BaseNumberDetector(object):
     _SPAN_BOUNDARY_TEMPLATE = r'(?:^|(?<=[\s\"\'\,\-\?])){}(?=[\s\!\"\%\'\,\?\.\-]|$)'
+    # Characters, apart from whitespace, that may surround a detected number. Same as _SPAN_BOUNDARY_TEMPLATE, used
+    # with lib.nlp.span_rewrite to replace detected numbers without compiling a pattern for each of them
+    _SPAN_PRECEDING_CHARACTERS = frozenset('"\',-?')
+    _SPAN_FOLLOWING_CHARACTERS = frozenset('!"%\',?.-')
+    _NUMERAL_TEXT_SPLIT_PATTERN = re.compile(r'[\-\:]', flags=re.UNICODE)
 
     def __init__(self, entity_name, data_directory_path, unit_type=None):
         """
@@ -53,16 +154,13 @@ class BaseNumberDetector(object):
         self.units_map = {}
         self.unit_type = unit_type
 
+        self.unit_choices = ''
+        self.scale_map_choices = ''
+        self.number_word_parser = None
+
         # Method to initialise value in regex
         self.init_regex_and_parser(data_directory_path)
 
-        sorted_len_units_keys = sorted(list(self.units_map.keys()), key=len, reverse=True)
-        self.unit_choices = "|".join([re.escape(x) for x in sorted_len_units_keys])
-
-        sorted_len_scale_map = sorted(list(self.scale_map.keys()), key=len, reverse=True)
-        # using re.escape for strict matches in case pattern comes with '.' or '*', which should be escaped
-        self.scale_map_choices = "|".join([re.escape(x) for x in sorted_len_scale_map])
-
         # Variable to define default order in which detector will work
         self.detector_preferences = [self._detect_number_from_digit,
                                      self._detect_number_from_words]
@@ -103,54 +201,21 @@ class BaseNumberDetector(object):
 
     def init_regex_and_parser(self, data_directory_path):
         """
-        Initialise numbers word from from data file
+        Initialise numbers word, scale and unit maps for the language. Maps are loaded from the data files once per
+        process and shared by all detectors of the same language and unit type, they must not be mutated.
         Args:
             data_directory_path (str): path of data folder for given language
         Returns:
             None
         """
-        # create number_words dict having number variants and their corresponding scale and increment value
-        # create language_scale_map dict having scale variants and their corresponding value
-        numeral_df = pd.read_csv(os.path.join(data_directory_path, NUMBER_NUMERAL_CONSTANT_FILE_NAME),
-                                 encoding='utf-8')
-        for _, row in numeral_df.iterrows():
-            name_variants = get_list_from_pipe_sep_string(row[NUMBER_NUMERAL_FILE_VARIANTS_COLUMN_NAME])
-            value = row[NUMBER_NUMERAL_FILE_VALUE_COLUMN_NAME]
-            if float(value).is_integer():
-                value = int(row[NUMBER_NUMERAL_FILE_VALUE_COLUMN_NAME])
-            number_type = row[NUMBER_NUMERAL_FILE_TYPE_COLUMN_NAME]
-
-            if number_type == NUMBER_TYPE_UNIT:
-                for numeral in name_variants:
-                    # tuple values to corresponds to (scale, increment), for unit type, scale will always be 1.
-                    self.numbers_word_map[numeral] = NumberVariant(scale=1, increment=value)
-                    # map the name of number to latin numeric value
-                    self.base_numbers_map[numeral] = value
-
-            elif number_type == NUMBER_TYPE_SCALE:
-                for numeral in name_variants:
-                    # tuple values to corresponds to (scale, increment), for scale type, increment will always be 0.
-                    self.numbers_word_map[numeral] = NumberVariant(scale=value, increment=0)
-                    # Dict map to store scale and their values
-                    self.scale_map[numeral] = value
-                    # map the name of number to latin numeric value
-                    self.base_numbers_map[numeral] = value
-
-            number_text = row[NUMBER_NUMERAL_FILE_NUMBER_COLUMN_NAME]
-            self.base_numbers_map[number_text] = value
-
-        # create units_dict having unit variants and their corresponding value
-        unit_file_path = os.path.join(data_directory_path, NUMBER_UNITS_FILE_NAME)
-        if os.path.exists(unit_file_path):
-            units_df = pd.read_csv(unit_file_path, encoding='utf-8')
-            if self.unit_type:
-                units_df = units_df[units_df[NUMBER_DATA_FILE_UNIT_TYPE_COLUMN_NAME] == self.unit_type]
-            for index, row in units_df.iterrows():
-                unit_variants = get_list_from_pipe_sep_string(row[NUMBER_DATA_FILE_UNIT_VARIANTS_COLUMN_NAME])
-                unit_value = row[NUMBER_DATA_FILE_UNIT_VALUE_COLUMN_NAME]
-                unit_type = row[NUMBER_DATA_FILE_UNIT_TYPE_COLUMN_NAME]
-                for unit in unit_variants:
-                    self.units_map[unit] = NumberUnit(value=unit_value, type=unit_type)
+        number_language_data = get_number_language_data(data_directory_path, unit_type=self.unit_type)
+        self.base_numbers_map = number_language_data.base_numbers_map
+        self.numbers_word_map = number_language_data.numbers_word_map
+        self.scale_map = number_language_data.scale_map
+        self.units_map = number_language_data.units_map
+        self.unit_choices = number_language_data.unit_choices
+        self.scale_map_choices = number_language_data.scale_map_choices
+        self.number_word_parser = number_language_data.number_word_parser
 
     def _get_unit_from_text(self, detected_original, processed_text):
         """
@@ -238,31 +303,36 @@ class BaseNumberDetector(object):
         """
         number_list = number_list or []
         original_list = original_list or []
-        end_span = -1
-        spans = []
-        spanned_text = self.text
+        search_start = 0
 
         # Splitting text based on "-" and ":",  as in case of text "two thousand-three thousand", simple splitting
         # will give list as [two, thousand-three, thousand], result in number word detector giving wrong result,
         # hence we need to separate them into [two thousand, three thousand] using '-' or ':' as split char
-        numeral_text_list = re.split(r'[\-\:]', self.processed_text)
+        numeral_text_list = self._NUMERAL_TEXT_SPLIT_PATTERN.split(self.processed_text)
+        fragment_start = 0
         for numeral_text in numeral_text_list:
-            numbers, original_texts = get_number_from_number_word(numeral_text, self.numbers_word_map)
-            for original in original_texts:
-                span = re.search(original, spanned_text).span()
-                start_span = end_span + span[0]
-                end_span += span[1]
-                spanned_text = spanned_text[span[1]:]
-                spans.append((start_span, end_span))
-            full_list = list(zip(numbers, original_texts, spans))
-            sorted_full_list = sorted(full_list, key=lambda kv: len(kv[2]), reverse=False)
-            for number, original_text, span in sorted_full_list:
+            full_list = []
+            for parsed_number in self.number_word_parser.parse(numeral_text):
+                # spans are offsets in self.text shifted by one, same as in _detect_number_from_digit
+                original_start = self.text.find(parsed_number.original_text, search_start)
+                if original_start == -1:
+                    # words of the number are not contiguous in self.text, e.g. a number was removed from between
+                    # them in processed_text
+                    original_start, original_end = [fragment_start + offset for offset in parsed_number.span]
+                else:
+                    original_end = original_start + len(parsed_number.original_text)
+                    search_start = original_end
+                full_list.append((parsed_number.value, parsed_number.original_text,
+                                  (original_start - 1, original_end - 1)))
+            fragment_start += len(numeral_text) + 1
+
+            for number, original_text, span in full_list:
                 unit = None
                 if self.unit_type:
                     unit, original_text = self._get_unit_from_text(original_text, numeral_text)
-                _pattern = re.compile(self._SPAN_BOUNDARY_TEMPLATE.format(re.escape(original_text)), flags=_re_flags)
-                if _pattern.search(numeral_text):
-                    numeral_text = _pattern.sub(self.tag, numeral_text, 1)
+                original_span = self._find_number_span(numeral_text, original_text)
+                if original_span:
+                    numeral_text = replace_span(numeral_text, original_span, self.tag)
                     number_list.append({
                         NUMBER_DETECTION_RETURN_DICT_VALUE: str(number),
                         NUMBER_DETECTION_RETURN_DICT_UNIT: unit,
@@ -352,9 +422,9 @@ class BaseNumberDetector(object):
                 unit = None
                 if self.unit_type:
                     unit, original_text = self._get_unit_from_text(original_text, processed_text)
-                _pattern = re.compile(self._SPAN_BOUNDARY_TEMPLATE.format(re.escape(original_text)), flags=_re_flags)
-                if _pattern.search(processed_text):
-                    processed_text = _pattern.sub(self.tag, processed_text, 1)
+                original_span = self._find_number_span(processed_text, original_text)
+                if original_span:
+                    processed_text = replace_span(processed_text, original_span, self.tag)
                     number_list.append({
                         NUMBER_DETECTION_RETURN_DICT_VALUE: str(number),
                         NUMBER_DETECTION_RETURN_DICT_UNIT: unit,
@@ -376,9 +446,36 @@ class BaseNumberDetector(object):
                                        created from entity_name
         """
         for detected_text in original_number_list:
-            _pattern = re.compile(self._SPAN_BOUNDARY_TEMPLATE.format(re.escape(detected_text)), flags=_re_flags)
-            self.tagged_text = _pattern.sub(self.tag, self.tagged_text, 1)
-            self.processed_text = _pattern.sub('', self.processed_text, 1)
+            self.tagged_text = self._replace_number_text(self.tagged_text, detected_text, self.tag)
+            self.processed_text = self._replace_number_text(self.processed_text, detected_text, '')
+
+    def _find_number_span(self, text, number_text):
+        """
+        Find the first occurrence of number_text in text delimited as described by _SPAN_BOUNDARY_TEMPLATE
+
+        Args:
+            text (str): text to search in
+            number_text (str): detected number substring
+
+        Returns:
+            tuple of (int, int) or None: span of number_text in text, None if it does not occur in text
+        """
+        return find_delimited(text, number_text, self._SPAN_PRECEDING_CHARACTERS, self._SPAN_FOLLOWING_CHARACTERS)
+
+    def _replace_number_text(self, text, number_text, replacement):
+        """
+        Replace the first occurrence of number_text in text delimited as described by _SPAN_BOUNDARY_TEMPLATE
+
+        Args:
+            text (str): text to rewrite
+            number_text (str): detected number substring
+            replacement (str): text to put in place of number_text
+
+        Returns:
+            str: rewritten text
+        """
+        return replace_delimited(text, number_text, replacement,
+                                 self._SPAN_PRECEDING_CHARACTERS, self._SPAN_FOLLOWING_CHARACTERS)
 
 
 class NumberDetector(BaseNumberDetector):
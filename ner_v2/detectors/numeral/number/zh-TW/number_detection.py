@@ -124,9 +124,8 @@ class NumberDetector(BaseNumberDetector):
                     full_number = number
 
             if full_number:
-                _pattern = re.compile(re.escape(original_text), flags=_re_flags)
-                if _pattern.search(processed_text):
-                    processed_text = _pattern.sub(self.tag, processed_text, 1)
+                if original_text in processed_text:
+                    processed_text = processed_text.replace(original_text, self.tag, 1)
                     number_list.append({
                         NUMBER_DETECTION_RETURN_DICT_VALUE: int(full_number),
                         NUMBER_DETECTION_RETURN_DICT_UNIT: None,
@@ -1,9 +1,10 @@
 from __future__ import absolute_import
 
-import importlib
 import os
 
+from ner_v2.detectors import language_registry
 from ner_v2.detectors.base_detector import BaseDetector
+from ner_v2.detectors.numeral.number_range import standard_number_range_detector
 from language_utilities.constant import ENGLISH_LANG
 from ner_v2.detectors.utils import get_lang_data_path
 
@@ -55,13 +56,7 @@ class NumberRangeDetector(BaseDetector):
         Returns:
             (list): supported languages
         """
-        supported_languages = []
-        cwd = os.path.dirname(os.path.abspath(__file__))
-        cwd_dirs = [x for x in os.listdir(cwd) if os.path.isdir(os.path.join(cwd, x))]
-        for _dir in cwd_dirs:
-            if len(_dir.rstrip(os.sep)) == 2:
-                supported_languages.append(_dir)
-        return supported_languages
+        return language_registry.get_supported_languages(language_registry.NUMBER_RANGE)
 
     def __init__(self, entity_name='number_range', language=ENGLISH_LANG, unit_type=None):
         """Initializes a NumberDetector object
@@ -84,19 +79,16 @@ class NumberRangeDetector(BaseDetector):
         self.tag = '__' + self.entity_name + '__'
         self.language = language
         self.unit_type = unit_type
-        try:
-            number_range_detector_module = importlib.import_module(
-                'ner_v2.detectors.numeral.number_range.{0}.number_range_detection'.format(self.language))
+        language_number_range_detector_class = language_registry.get_language_detector_class(
+            language_registry.NUMBER_RANGE, self.language)
+        if language_number_range_detector_class is not None:
             self.language_number_range_detector = \
-                number_range_detector_module.NumberRangeDetector(entity_name=self.entity_name,
-                                                                 language=self.language,
-                                                                 unit_type=self.unit_type)
+                language_number_range_detector_class(entity_name=self.entity_name,
+                                                     language=self.language,
+                                                     unit_type=self.unit_type)
 
-        except ImportError:
-            standard_number_range_regex = importlib.import_module(
-                'ner_v2.detectors.numeral.number_range.standard_number_range_detector'
-            )
-            self.language_number_range_detector = standard_number_range_regex.NumberRangeDetector(
+        else:
+            self.language_number_range_detector = standard_number_range_detector.NumberRangeDetector(
                 entity_name=self.entity_name,
                 language=language,
                 unit_type=self.unit_type,
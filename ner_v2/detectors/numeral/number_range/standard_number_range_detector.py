@@ -4,11 +4,12 @@ from __future__ import absolute_import
 import collections
 import os
 
-import pandas as pd
 from six.moves import zip
 
 import ner_v2.detectors.numeral.constant as numeral_constant
-from ner_v2.detectors.numeral.number.number_detection import NumberDetector
+from lib.nlp.span_rewrite import replace_words
+from ner_v2.detectors.language_data import load_csv_records
+from ner_v2.detectors.numeral.number.number_detection import get_shared_number_detector
 from ner_v2.detectors.numeral.utils import get_list_from_pipe_sep_string
 
 try:
@@ -56,9 +57,7 @@ class BaseNumberRangeDetector(object):
         self.min_max_range_variants = None
         self.number_detected_map = {}
 
-        self.number_detector = NumberDetector(entity_name=entity_name, language=language, unit_type=unit_type,
-                                              detect_without_unit=True)
-        self.number_detector.set_min_max_digits(1, 100)
+        self.number_detector = get_shared_number_detector(language=language, unit_type=unit_type)
 
         # Method to initialise regex params
         self._init_regex_for_range(data_directory_path)
@@ -87,9 +86,8 @@ class BaseNumberRangeDetector(object):
         Returns:
             None
         """
-        number_range_df = pd.read_csv(os.path.join(data_directory_path,
-                                                   numeral_constant.NUMBER_RANGE_KEYWORD_FILE_NAME), encoding='utf-8')
-        for index, row in number_range_df.iterrows():
+        range_keyword_file_path = os.path.join(data_directory_path, numeral_constant.NUMBER_RANGE_KEYWORD_FILE_NAME)
+        for row in load_csv_records(range_keyword_file_path):
             range_variants = get_list_from_pipe_sep_string(row[numeral_constant.COLUMN_NUMBER_RANGE_VARIANTS])
             for variant in range_variants:
                 self.range_variants_map[variant] = \
@@ -133,10 +131,11 @@ class BaseNumberRangeDetector(object):
         tagged_number_text = processed_text
         sorted_number_detected_map = sorted(list(self.number_detected_map.items()),
                                             key=lambda kv: len(kv[1].original_text), reverse=True)
-        span_template = self.number_detector.language_number_detector._SPAN_BOUNDARY_TEMPLATE
+        language_number_detector = self.number_detector.language_number_detector
         for number_tag, value_text_pair in sorted_number_detected_map:
-            tagged_number_text = re.sub(span_template.format(re.escape(value_text_pair.original_text)), number_tag,
-                                        tagged_number_text, count=1, flags=_re_flags)
+            tagged_number_text = language_number_detector._replace_number_text(tagged_number_text,
+                                                                               value_text_pair.original_text,
+                                                                               number_tag)
         return tagged_number_text
 
     def _get_number_tag_dict(self):
@@ -151,7 +150,10 @@ class BaseNumberRangeDetector(object):
             {'__dnumber_1': ({'value': 12, 'unit': None}, '12')}
         """
         detected_number_dict = {}
-        entity_value_list, original_text_list = self.number_detector.detect_entity(self.processed_text)
+        number_detection_result = self.number_detector.detect_entity(self.processed_text, entity_name=self.entity_name,
+                                                                     min_digit=1, max_digit=100,
+                                                                     detect_without_unit=True)
+        entity_value_list, original_text_list = number_detection_result.numbers, number_detection_result.original_texts
         for index, (entity_value, original_text) in enumerate(zip(entity_value_list, original_text_list)):
             key = '{number}{index}__'.format(number=numeral_constant.NUMBER_REPLACE_TEXT, index=index)
             detected_number_dict[key] = ValueTextPair(entity_value=entity_value, original_text=original_text)
@@ -428,8 +430,7 @@ class BaseNumberRangeDetector(object):
                                        created from entity_name
         """
         for detected_text in original_number_list:
-            _pattern = re.compile(r'\b%s\b' % re.escape(detected_text), flags=_re_flags)
-            self.tagged_text = _pattern.sub(self.tag, self.tagged_text)
+            self.tagged_text = replace_words(self.tagged_text, detected_text, self.tag)
 
 
 class NumberRangeDetector(BaseNumberRangeDetector):
@@ -1,75 +1,87 @@
 from __future__ import absolute_import
 
+import collections
 import re
-from six.moves import range
 
 
-def get_number_from_number_word(text, number_word_dict):
+ParsedNumber = collections.namedtuple('ParsedNumber', ['value', 'original_text', 'span'])
+NumberWord = collections.namedtuple('NumberWord', ['scale', 'increment', 'digit_len'])
+
+
+class NumberWordParser(object):
     """
-    Detect numbers from numerals text
-    Args:
-        text (str): text to detect number from number words
-        number_word_dict (dict): dict containing scale and increment of each number word
-    Returns:
-        detected_number_list (list): list of numeric value detected from text
-        detected_original_text_list (list): list of original text for numeric value detected
-    Examples:
-        [In]  >>  number_word_dict = {'one': NumberVariant(scale=1, increment=1),
-                                      'two': NumberVariant(scale=1, increment=2),
-                                      'three': NumberVariant(scale=1, increment=3),
-                                      'thousand': NumberVariant(scale=1000, increment=0),
-                                      'four': NumberVariant(scale=1, increment=4),
-                                      'hundred': NumberVariant(scale=100, increment=0)
-                                      }
-        [In]  >>  _get_number_from_numerals('one thousand two',  number_word_dict)
-        [Out] >> (['1002'], ['one thousand two'])
-        [In]  >> _get_number_from_numerals('one two three',  number_word_dict)
-        [Out] >> (['1', '2', '3'], ['one', 'two', 'three'])
-        [In]  >> _get_number_from_numerals('two hundred three four hundred three',  number_word_dict)
-        [Out] >> (['103', '403'], ['one hundred three', 'four hundred three'])
+    Parser for numbers written in words, e.g. 'two thousand three hundred' -> 2300.
+
+    The vocabulary (number words with their scale, increment and digit length) is precomputed once from the
+    language's number word map, text is then parsed in a single scan over its words.
     """
-    # FIXME: conversion from float -> int is lossy, consider using Decimal class
-    detected_number_list = []
-    detected_original_text_list = []
-
-    # exclude single char scales word from word number map dict
-    number_word_dict = {word: number_map for word, number_map in number_word_dict.items()
-                        if (len(word) > 1 and number_map.increment == 0) or number_map.scale == 1}
-    text = text.strip()
-    if not text:
-        return detected_number_list, detected_original_text_list
-
-    whitespace_pattern = re.compile(r'(\s+)', re.UNICODE)
-    parts = []
-    _parts = whitespace_pattern.split(u' ' + text)
-    for i in range(2, len(_parts), 2):
-        parts.append(_parts[i - 1] + _parts[i])
-
-    current = result = 0
-    current_text, result_text = '', ''
-    on_number = False
-    prev_digit_len = 0
-    prev_scale = 0
-    is_double_or_triple = False
-
-    for part in parts:
-        word = part.strip()
-
-        if word not in number_word_dict:
-            if on_number:
-                result_text += current_text
-                original = result_text.strip()
-                number_detected = result + current
-                if float(number_detected).is_integer():
-                    number_detected = int(number_detected)
-                detected_number_list.append(number_detected)
-                detected_original_text_list.append(original)
-
-            result = current = 0
-            result_text, current_text = '', ''
-            on_number = False
-        else:
-            scale, increment = number_word_dict[word].scale, number_word_dict[word].increment
+
+    _WORD_PATTERN = re.compile(r'\S+', re.UNICODE)
+
+    def __init__(self, number_word_dict):
+        """
+        Args:
+            number_word_dict (dict): dict mapping number word to NumberVariant(scale, increment), see
+                BaseNumberDetector.numbers_word_map
+        """
+        # exclude single char scales word from word number map dict
+        self.vocab = {}
+        for word, number_map in number_word_dict.items():
+            if (len(word) > 1 and number_map.increment == 0) or number_map.scale == 1:
+                digit_len = max(len(str(int(number_map.increment))), len(str(number_map.scale)))
+                self.vocab[word] = NumberWord(scale=number_map.scale, increment=number_map.increment,
+                                              digit_len=digit_len)
+
+    def parse(self, text):
+        """
+        Detect numbers from number words in text
+
+        Args:
+            text (str): text to detect numbers in
+
+        Returns:
+            list of ParsedNumber: namedtuples with
+                value (int or float): detected number
+                original_text (str): words the number was detected from, with the whitespace between them as in text
+                span (tuple of (int, int)): start (inclusive) and end (exclusive) offsets of original_text in text
+
+        Examples:
+            >>> parser.parse(u'one thousand two and three')
+            [ParsedNumber(value=1002, original_text=u'one thousand two', span=(0, 16)),
+             ParsedNumber(value=3, original_text=u'three', span=(21, 26))]
+        """
+        # FIXME: conversion from float -> int is lossy, consider using Decimal class
+        parsed_numbers = []
+        vocab = self.vocab
+
+        current = result = 0
+        current_text, result_text = '', ''
+        number_start = number_end = None
+        on_number = False
+        prev_digit_len = 0
+        prev_scale = 0
+        prev_end = 0
+        is_double_or_triple = False
+
+        for match in self._WORD_PATTERN.finditer(text):
+            word = match.group()
+            word_start, word_end = match.span()
+            # word along with the whitespace preceding it
+            part = text[prev_end:word_end]
+            prev_end = word_end
+            number_word = vocab.get(word)
+
+            if number_word is None:
+                if on_number:
+                    parsed_numbers.append(self._get_parsed_number(result + current, result_text + current_text,
+                                                                  number_start, number_end))
+                result = current = 0
+                result_text, current_text = '', ''
+                number_start = None
+                on_number = False
+                continue
+
+            scale, increment, digit_len = number_word
             if scale % 100 == 11:
                 is_double_or_triple = True
                 prev_scale = scale
@@ -80,20 +92,13 @@ def get_number_from_number_word(text, number_word_dict):
                 current = 0
                 current_text = ''
 
-            digit_len = max(len(str(int(increment))), len(str(scale)))
-
             if digit_len == prev_digit_len:
                 if on_number:
-                    result_text += current_text
-                    original = result_text.strip()
-                    number_detected = result + current
-                    if float(number_detected).is_integer():
-                        number_detected = int(number_detected)
-                    detected_number_list.append(number_detected)
-                    detected_original_text_list.append(original)
-
+                    parsed_numbers.append(self._get_parsed_number(result + current, result_text + current_text,
+                                                                  number_start, number_end))
                 result = current = 0
                 result_text, current_text = '', ''
+                number_start = None
 
             if digit_len > prev_digit_len:
                 if on_number and prev_scale == scale:
@@ -108,6 +113,8 @@ def get_number_from_number_word(text, number_word_dict):
             current = 1 if (scale > 1 and current == 0 and increment == 0) else current
             current = current * scale + increment
             current_text += part
+            number_start = word_start if number_start is None else number_start
+            number_end = word_end
             if scale > 1:
                 result += current
                 result_text += current_text
@@ -117,16 +124,47 @@ def get_number_from_number_word(text, number_word_dict):
             prev_digit_len = digit_len
             prev_scale = scale
 
-    if on_number:
-        result_text += current_text
-        original = result_text.strip()
-        number_detected = result + current
+        if on_number:
+            parsed_numbers.append(self._get_parsed_number(result + current, result_text + current_text,
+                                                          number_start, number_end))
+
+        return parsed_numbers
+
+    @staticmethod
+    def _get_parsed_number(number_detected, original_text, start, end):
         if float(number_detected).is_integer():
             number_detected = int(number_detected)
-        detected_number_list.append(number_detected)
-        detected_original_text_list.append(original)
+        return ParsedNumber(value=number_detected, original_text=original_text.strip(), span=(start, end))
+
 
-    return detected_number_list, detected_original_text_list
+def get_number_from_number_word(text, number_word_dict):
+    """
+    Detect numbers from numerals text. Builds a NumberWordParser on every call, callers that parse many texts with
+    the same number_word_dict should create one NumberWordParser and reuse it.
+
+    Args:
+        text (str): text to detect number from number words
+        number_word_dict (dict): dict containing scale and increment of each number word
+    Returns:
+        detected_number_list (list): list of numeric value detected from text
+        detected_original_text_list (list): list of original text for numeric value detected
+    Examples:
+        [In]  >>  number_word_dict = {'one': NumberVariant(scale=1, increment=1),
+                                      'two': NumberVariant(scale=1, increment=2),
+                                      'three': NumberVariant(scale=1, increment=3),
+                                      'thousand': NumberVariant(scale=1000, increment=0),
+                                      'four': NumberVariant(scale=1, increment=4),
+                                      'hundred': NumberVariant(scale=100, increment=0)
+                                      }
+        [In]  >>  _get_number_from_numerals('one thousand two',  number_word_dict)
+        [Out] >> (['1002'], ['one thousand two'])
+        [In]  >> _get_number_from_numerals('one two three',  number_word_dict)
+        [Out] >> (['1', '2', '3'], ['one', 'two', 'three'])
+        [In]  >> _get_number_from_numerals('two hundred three four hundred three',  number_word_dict)
+        [Out] >> (['103', '403'], ['one hundred three', 'four hundred three'])
+    """
+    parsed_numbers = NumberWordParser(number_word_dict).parse(text)
+    return [parsed.value for parsed in parsed_numbers], [parsed.original_text for parsed in parsed_numbers]
 
 
 def get_list_from_pipe_sep_string(text_string):
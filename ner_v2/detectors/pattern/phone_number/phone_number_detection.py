@@ -1,7 +1,10 @@
 # -*- coding: utf-8 -*-
 from __future__ import absolute_import
 
+import concurrent.futures
 import re
+import threading
+
 import structlog
 
 try:
@@ -14,11 +17,77 @@ except ImportError:
 import phonenumbers
 from six.moves import zip
 
+from chatbot_ner.config import PHONE_BULK_PROCESSES, PHONE_BULK_PROCESS_MIN_MESSAGES
 from language_utilities.constant import ENGLISH_LANG, CHINESE_TRADITIONAL_LANG
 from ner_v2.detectors.base_detector import BaseDetector
-from ner_v2.detectors.numeral.number.number_detection import NumberDetector
+from ner_v2.detectors.numeral.number.number_detection import NumberDetector, get_shared_number_detector
 ner_logger = structlog.getLogger('chatbot_ner')
 
+# Phone numbers with national numbers shorter than this are discarded, see PhoneDetector.detect_entity
+MIN_NATIONAL_NUMBER_LENGTH = 8
+
+_LOCALE_COUNTRY_PATTERN = re.compile('[-_](.*$)', re.U)
+_COUNTRY_CALLING_CODE_PREFIX_PATTERN = re.compile(r'^({country_code})\d{length}$'.format(
+    country_code='911|1|011 91|91', length='{10}'), re.U)
+_DIGIT_PATTERN = re.compile(r'\d', re.U)
+
+# locale -> (region code, country calling code)
+_locale_regions = {}
+
+_process_pool = None
+_process_pool_lock = threading.Lock()
+# detectors created in process pool workers, keyed by their class and constructor arguments
+_worker_detectors = {}
+
+
+def get_region_from_locale(locale):
+    """
+    Get region code and country calling code for a locale. Both are resolved once per locale and process, the phone
+    number metadata of the region is loaded at the same time.
+
+    Args:
+        locale (str): locale of the country from which you are dialing. Ex: 'en-IN'
+
+    Returns:
+        tuple: region code (str, e.g. 'IN') and country calling code (int, e.g. 91)
+    """
+    region = _locale_regions.get(locale)
+    if region is None:
+        match = _LOCALE_COUNTRY_PATTERN.findall(locale)
+        region_code = match[0].upper() if match else 'IN'
+        metadata = phonenumbers.PhoneMetadata.metadata_for_region(region_code)
+        # same as phonenumbers.country_code_for_region, which returns 0 for unknown regions
+        region = (region_code, metadata.country_code if metadata is not None else 0)
+        _locale_regions[locale] = region
+    return region
+
+
+def _get_process_pool():
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = concurrent.futures.ProcessPoolExecutor(max_workers=PHONE_BULK_PROCESSES)
+    return _process_pool
+
+
+def _detect_entity_in_worker(detector_args, texts):
+    """
+    Run phone number detection on texts in a process pool worker
+
+    Args:
+        detector_args (tuple): detector class, entity_name, language and locale to create the detector with
+        texts (list of str): texts to detect phone numbers in
+
+    Returns:
+        list: (phone numbers, original texts) tuple for each text
+    """
+    detector = _worker_detectors.get(detector_args)
+    if detector is None:
+        detector_class, entity_name, language, locale = detector_args
+        detector = detector_class(entity_name=entity_name, language=language, locale=locale)
+        _worker_detectors[detector_args] = detector
+    return [detector.detect_entity(text) for text in texts]
+
 
 class PhoneDetector(BaseDetector):
     """
@@ -49,7 +118,7 @@ class PhoneDetector(BaseDetector):
 
         self.text = ''
         self.phone, self.original_phone_text = [], []
-        self.country_code = self.get_country_code_from_locale()
+        self.country_code, self.country_calling_code = get_region_from_locale(self.locale)
         self.entity_name = entity_name
         self.tag = '__' + self.entity_name + '__'
 
@@ -66,12 +135,7 @@ class PhoneDetector(BaseDetector):
         """
         This method sets self.country_code from given locale
         """
-        regex_pattern = re.compile('[-_](.*$)', re.U)
-        match = regex_pattern.findall(self.locale)
-        if match:
-            return match[0].upper()
-        else:
-            return 'IN'
+        return get_region_from_locale(self.locale)[0]
 
     def detect_entity(self, text, **kwargs):
         """Detects phone numbers in the text string
@@ -110,14 +174,14 @@ class PhoneDetector(BaseDetector):
 
                 # Get the national number and check its length is below 8 (including contry code) and \
                 # Exclude numbers that are too short to be a valid phone number (e.g., ticket numbers)
-                if national_number_len < 8:
+                if national_number_len < MIN_NATIONAL_NUMBER_LENGTH:
                     self.original_phone_text.append(self.text)
                     continue
             except Exception:
                 # Not logging exception object as structlog.exception() will print entire traceback
                 ner_logger.exception('Error in detect_entity function', text=self.text)
 
-            if match.number.country_code == phonenumbers.country_code_for_region(self.country_code):
+            if match.number.country_code == self.country_calling_code:
                 self.phone.append(self.check_for_country_code(str(match.number.national_number)))
                 self.original_phone_text.append(self.text[match.start:match.end])
             else:
@@ -129,6 +193,59 @@ class PhoneDetector(BaseDetector):
 
         return self.phone, self.original_phone_text
 
+    def may_contain_phone_number(self, text):
+        """
+        Cheap check for texts that can not contain a phone number detect_entity would return, i.e. texts with fewer
+        digits than MIN_NATIONAL_NUMBER_LENGTH
+
+        Args:
+            text (str): text to check
+
+        Returns:
+            bool: False if detect_entity is sure to find no phone number in text
+        """
+        digits = 0
+        for _ in _DIGIT_PATTERN.finditer(text):
+            digits += 1
+            if digits >= MIN_NATIONAL_NUMBER_LENGTH:
+                return True
+        return False
+
+    def detect_entity_bulk(self, texts, **kwargs):
+        """
+        Detects phone numbers in many texts. Texts with too few digits to contain a phone number are skipped and if
+        there are at least PHONE_BULK_PROCESS_MIN_MESSAGES other texts and PHONE_BULK_PROCESSES > 1 they are split
+        across a process pool.
+
+        Args:
+            texts (list of str): texts to extract phone numbers from
+            **kwargs: passed on to detect_entity
+
+        Returns:
+            tuple: two lists with the phone numbers and original texts detect_entity returns for each text
+        """
+        results = [([], []) for _ in texts]
+        candidate_indices = [index for index, text in enumerate(texts) if self.may_contain_phone_number(text)]
+
+        if PHONE_BULK_PROCESSES > 1 and len(candidate_indices) >= PHONE_BULK_PROCESS_MIN_MESSAGES:
+            detector_args = (type(self), self.entity_name, self.language, self.locale)
+            chunk_size = -(-len(candidate_indices) // (PHONE_BULK_PROCESSES * 4))
+            chunks = [candidate_indices[start:start + chunk_size]
+                      for start in range(0, len(candidate_indices), chunk_size)]
+            process_pool = _get_process_pool()
+            futures = [process_pool.submit(_detect_entity_in_worker, detector_args, [texts[index] for index in chunk])
+                       for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                for index, result in zip(chunk, future.result()):
+                    results[index] = result
+        else:
+            for index in candidate_indices:
+                results[index] = self.detect_entity(texts[index], **kwargs)
+
+        bulk_phone_list = [list(phone) for phone, _ in results]
+        bulk_original_text_list = [list(original_text) for _, original_text in results]
+        return bulk_phone_list, bulk_original_text_list
+
     def check_for_alphas(self):
         """
         checks if any leading or trailing alphabets in the detected phone numbers and removes those numbers
@@ -153,18 +270,15 @@ class PhoneDetector(BaseDetector):
         phone_dict = {}
 
         if len(phone_num) > 10:
-            check_country_regex = re.compile(r'^({country_code})\d{length}$'.
-                                             format(country_code='911|1|011 91|91', length='{10}'), re.U)
-            p = check_country_regex.findall(phone_num)
+            p = _COUNTRY_CALLING_CODE_PREFIX_PATTERN.findall(phone_num)
             if len(p) == 1:
                 phone_dict['country_calling_code'] = p[0]
-                country_code_sub_regex = re.compile(r'^{detected_code}'.format(detected_code=p[0]))
-                phone_dict['value'] = country_code_sub_regex.sub(string=phone_num, repl='')
+                phone_dict['value'] = phone_num[len(p[0]):]
             else:
-                phone_dict['country_calling_code'] = str(phonenumbers.country_code_for_region(self.country_code))
+                phone_dict['country_calling_code'] = str(self.country_calling_code)
                 phone_dict['value'] = phone_num
         else:
-            phone_dict['country_calling_code'] = str(phonenumbers.country_code_for_region(self.country_code))
+            phone_dict['country_calling_code'] = str(self.country_calling_code)
             phone_dict['value'] = phone_num
 
         return phone_dict
@@ -186,9 +300,15 @@ class ChinesePhoneDetector(PhoneDetector):
         self._supported_languages = NumberDetector.get_supported_languages()
         super(ChinesePhoneDetector, self).__init__(entity_name, language, locale)
 
-        # Using Chinese number detector here
-        self.number_detector = NumberDetector(self.entity_name, language=self.language)
-        self.language_number_detector = self.number_detector.get_language_number_detector()
+        # Using Chinese number detector here, only its read only helpers are used so the shared one is enough
+        self.number_detector = get_shared_number_detector(language=self.language)
+        self.language_number_detector = self.number_detector.language_number_detector
+
+    def may_contain_phone_number(self, text):
+        """
+        Chinese numerals are not counted as digits, so every text is handed to detect_entity
+        """
+        return True
 
     def _text_list_for_detection(self, text=None):
         """
@@ -222,7 +342,7 @@ class ChinesePhoneDetector(PhoneDetector):
             original_text = " " + _text.lower().strip() + " "
             sanitized_text = self._sanitize_text(original_text)
             for match in phonenumbers.PhoneNumberMatcher(sanitized_text, self.country_code, leniency=0):
-                if match.number.country_code == phonenumbers.country_code_for_region(self.country_code):
+                if match.number.country_code == self.country_calling_code:
                     self.phone.append(self.check_for_country_code(str(match.number.national_number)))
                     self.original_phone_text.append(original_text[match.start:match.end])
                 else:
@@ -3,7 +3,6 @@ from __future__ import absolute_import
 
 import copy
 import datetime
-import importlib
 import os
 import re
 
@@ -13,12 +12,15 @@ from six.moves import zip
 import ner_v2.detectors.temporal.constant as temporal_constant
 from language_utilities.constant import ENGLISH_LANG, TRANSLATED_TEXT
 from language_utilities.utils import translate_text
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
 from ner_constants import (FROM_MESSAGE, FROM_STRUCTURE_VALUE_VERIFIED,
                            FROM_STRUCTURE_VALUE_NOT_VERIFIED, FROM_FALLBACK_VALUE)
+from ner_v2.detectors import language_registry
 from ner_v2.detectors.base_detector import BaseDetector
 from ner_v2.detectors.temporal.constant import (TYPE_EXACT, TYPE_EVERYDAY, TYPE_PAST,
                                                 TYPE_NEXT_DAY, TYPE_REPEAT_DAY)
-from ner_v2.detectors.temporal.utils import get_timezone
+from ner_v2.detectors.temporal.date import standard_date_regex
+from ner_v2.detectors.temporal.utils import Clock
 from ner_v2.detectors.utils import get_lang_data_path
 
 
@@ -40,6 +42,9 @@ class DateAdvancedDetector(BaseDetector):
         tag: entity_name prepended and appended with '__'
         date_detector_object: DateDetector object used to detect dates in the given text
         bot_message: str, set as the outgoing bot text/message
+        date_detector_calls: number of times the language date detector ran on the last text passed to
+                             detect_entity(). The range, return, departure and any date passes parse overlapping
+                             substrings, each distinct substring is parsed once per text and looked up after that
     """
 
     @staticmethod
@@ -49,16 +54,10 @@ class DateAdvancedDetector(BaseDetector):
         Returns:
             (list): supported languages
         """
-        supported_languages = []
-        cwd = os.path.dirname(os.path.abspath(__file__))
-        cwd_dirs = [x for x in os.listdir(cwd) if os.path.isdir(os.path.join(cwd, x))]
-        for _dir in cwd_dirs:
-            if len(_dir.rstrip(os.sep)) == 2:
-                supported_languages.append(_dir)
-        return supported_languages
+        return language_registry.get_supported_languages(language_registry.DATE)
 
     def __init__(self, entity_name='date', locale=None, language=ENGLISH_LANG, timezone='UTC',
-                 past_date_referenced=False, bot_message=None):
+                 past_date_referenced=False, bot_message=None, clock=None):
         """
         Initializes the DateDetector object with given entity_name and pytz timezone object
 
@@ -69,6 +68,8 @@ class DateAdvancedDetector(BaseDetector):
             timezone (Optional, str): timezone identifier string that is used to create a pytz timezone object
                                       default is UTC
             past_date_referenced (bool): to know if past or future date is referenced for date text like 'kal', 'parso'
+            clock (Optional, Clock): timezone and current time to detect dates with, created from timezone if not
+                                     given
         """
         self.locale = locale
         self._supported_languages = self.get_supported_languages()
@@ -80,12 +81,18 @@ class DateAdvancedDetector(BaseDetector):
         self.original_date_text = []
         self.entity_name = entity_name
         self.tag = '__' + entity_name + '__'
+        self.clock = clock or Clock(timezone=timezone)
         self.date_detector_object = DateDetector(entity_name=entity_name,
                                                  language=language,
                                                  timezone=timezone,
                                                  past_date_referenced=past_date_referenced,
-                                                 locale=locale)
+                                                 locale=locale,
+                                                 clock=self.clock)
+        # normalized substring -> (date_list, original_list) detected in it, reset for every text
+        self._date_values = {}
+        self.date_detector_calls = 0
         self.bot_message = None
+        self.bot_context = NO_BOT_CONTEXT
         if bot_message:
             self.set_bot_message(bot_message)
 
@@ -136,6 +143,8 @@ class DateAdvancedDetector(BaseDetector):
         self.text = ' ' + text.lower() + ' '
         self.processed_text = self.text
         self.tagged_text = self.text
+        self._date_values = {}
+        self.date_detector_calls = 0
         date_data = self._detect_date()
         return self.unzip_convert_date_dictionaries(date_data)
 
@@ -372,25 +381,8 @@ class DateAdvancedDetector(BaseDetector):
             Whereas for arrival date the key "to" will be set to True.
             Otherwise the normal date with the key 'normal' will be set to True
         """
-        departure_date_flag = False
-        return_date_flag = False
-        if self.bot_message:
-            departure_regex_string = r'traveling on|going on|starting on|departure date|date of travel|' + \
-                                     r'check in date|check-in date|date of check-in|' \
-                                     r'date of departure\.|'
-            hinglish_departure = u'जाने|जाऊँगा|जाना'
-            departure_regex_string = departure_regex_string + hinglish_departure
-            arrival_regex_string = r'traveling back|coming back|returning back|returning on|return date' + \
-                                   r'|arrival date|check out date|check-out date|date of check-out' \
-                                   r'|check out|'
-            hinglish_arrival = u'आने|आगमन|अनेका|रिटर्न'
-            arrival_regex_string = arrival_regex_string + hinglish_arrival
-            departure_regexp = re.compile(departure_regex_string, flags=re.UNICODE)
-            arrival_regexp = re.compile(arrival_regex_string, flags=re.UNICODE)
-            if departure_regexp.search(self.bot_message) is not None:
-                departure_date_flag = True
-            elif arrival_regexp.search(self.bot_message) is not None:
-                return_date_flag = True
+        departure_date_flag = self.bot_context.departure_date
+        return_date_flag = self.bot_context.return_date
 
         date_dict_list = self._date_dict_from_text(text=self.processed_text)
         if date_dict_list:
@@ -428,6 +420,8 @@ class DateAdvancedDetector(BaseDetector):
             bot_message: is the previous message that is sent by the bot
         """
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
+        self._date_values = {}
         self.date_detector_object.set_bot_message(self.bot_message)
 
     def _date_dict_from_text(self, text, from_property=False, to_property=False, start_range_property=False,
@@ -487,7 +481,9 @@ class DateAdvancedDetector(BaseDetector):
 
     def _date_value(self, text):
         """
-        Detects date from text by running DateDetector class.
+        Detects date from text by running DateDetector class. Results are memoized per text passed to detect_entity()
+        on the substring as DateDetector normalizes it (stripped and lower cased), the passes of _detect_date() parse
+        the same substrings more than once. Copies are returned because callers update the date dicts
 
         Args:
             text: date to process
@@ -500,7 +496,13 @@ class DateAdvancedDetector(BaseDetector):
 
                 (['friday'], ['friday'])
         """
-        date_list, original_list = self.date_detector_object.detect_entity(text)
+        key = text.strip().lower()
+        date_values = self._date_values.get(key)
+        if date_values is None:
+            date_values = self.date_detector_object.detect_entity(text)
+            self.date_detector_calls += 1
+            self._date_values[key] = date_values
+        date_list, original_list = copy.deepcopy(date_values)
         return date_list, original_list
 
     def unzip_convert_date_dictionaries(self, entity_dict_list):
@@ -667,12 +669,14 @@ class DateDetector(object):
         original_date_text: list to store substrings of the text detected as date entities
         tag: entity_name prepended and appended with '__'
         timezone: Optional, pytz.timezone object used for getting current time, default is pytz.timezone('UTC')
-        now_date: datetime object holding timestamp while DateDetector instantiation
+        now_date: datetime object holding current time of the clock
+        clock: Clock shared with the language date detector
         bot_message: str, set as the outgoing bot text/message
         language: source language of text
     """
 
-    def __init__(self, entity_name, locale=None, language=ENGLISH_LANG, timezone='UTC', past_date_referenced=False):
+    def __init__(self, entity_name, locale=None, language=ENGLISH_LANG, timezone='UTC', past_date_referenced=False,
+                 clock=None):
         """Initializes a DateDetector object with given entity_name and pytz timezone object
 
         Args:
@@ -682,6 +686,8 @@ class DateDetector(object):
                                       default is UTC
             past_date_referenced (bool): to know if past or future date is referenced for date text like 'kal', 'parso'
             locale(Optional, str): user locale default is None
+            clock (Optional, Clock): timezone and current time to detect dates with, created from timezone if not
+                                     given
         """
         self.text = ''
         self.tagged_text = ''
@@ -690,30 +696,30 @@ class DateDetector(object):
         self.original_date_text = []
         self.entity_name = entity_name
         self.tag = '__' + entity_name + '__'
-        self.timezone = get_timezone(timezone)
-        self.now_date = datetime.datetime.now(tz=self.timezone)
+        self.clock = clock or Clock(timezone=timezone)
+        self.timezone = self.clock.timezone
+        self.now_date = self.clock.now()
         self.bot_message = None
         self.language = language
         self.locale = locale
 
-        try:
-            date_detector_module = importlib.import_module(
-                'ner_v2.detectors.temporal.date.{0}.date_detection'.format(self.language))
-            self.language_date_detector = date_detector_module.DateDetector(entity_name=self.entity_name,
-                                                                            past_date_referenced=past_date_referenced,
-                                                                            timezone=self.timezone,
-                                                                            locale=self.locale)
-        except ImportError:
-            standard_date_regex = importlib.import_module(
-                'ner_v2.detectors.temporal.date.standard_date_regex'
-            )
+        language_date_detector_class = language_registry.get_language_detector_class(language_registry.DATE,
+                                                                                     self.language)
+        if language_date_detector_class is not None:
+            self.language_date_detector = language_date_detector_class(entity_name=self.entity_name,
+                                                                       past_date_referenced=past_date_referenced,
+                                                                       timezone=self.timezone,
+                                                                       locale=self.locale,
+                                                                       clock=self.clock)
+        else:
             self.language_date_detector = standard_date_regex.DateDetector(
                 entity_name=self.entity_name,
                 data_directory_path=get_lang_data_path(detector_path=os.path.abspath(__file__),
                                                        lang_code=self.language),
                 timezone=self.timezone,
                 past_date_referenced=past_date_referenced,
-                locale=self.locale
+                locale=self.locale,
+                clock=self.clock
             )
 
     def detect_entity(self, text, **kwargs):
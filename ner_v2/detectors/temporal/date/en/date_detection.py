@@ -3,13 +3,14 @@ import copy
 import datetime
 import re
 
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
 from ner_v2.detectors.temporal.constant import (TYPE_EXACT, TYPE_EVERYDAY, TYPE_TODAY, TYPE_TOMORROW, TYPE_YESTERDAY,
                                                 TYPE_DAY_AFTER, TYPE_DAY_BEFORE, TYPE_N_DAYS_AFTER, TYPE_NEXT_DAY,
                                                 TYPE_THIS_DAY, TYPE_POSSIBLE_DAY, WEEKDAYS,
                                                 REPEAT_WEEKDAYS, WEEKENDS, REPEAT_WEEKENDS, TYPE_REPEAT_DAY,
                                                 MONTH_DICT, DAY_DICT, ORDINALS_MAP)
 from ner_v2.detectors.temporal.utils import (get_weekdays_for_month, get_next_date_with_dd, get_previous_date_with_dd,
-                                             get_timezone)
+                                             Clock)
 from six.moves import zip
 
 
@@ -31,7 +32,7 @@ class DateDetector(object):
         tag: entity_name prepended and appended with '__'
         timezone: Optional, pytz.timezone object used for getting current time, default is pytz.timezone('UTC')
         locale: Optional, locale of the user for getting country code
-        now_date: datetime object holding timestamp while DateDetector instantiation
+        now_date: datetime object holding current time of the clock
         month_dictionary: dictonary mapping month indexes to month spellings and
                           fuzzy variants(spell errors, abbreviations)
         day_dictionary: dictonary mapping day indexes to day of week spellings and
@@ -73,7 +74,7 @@ class DateDetector(object):
         text and tagged_text will have a extra space prepended and appended after calling detect_entity(text)
     """
 
-    def __init__(self, entity_name, locale=None, timezone='UTC', past_date_referenced=False):
+    def __init__(self, entity_name, locale=None, timezone='UTC', past_date_referenced=False, clock=None):
         """Initializes a DateDetector object with given entity_name and pytz timezone object
 
         Args:
@@ -83,6 +84,8 @@ class DateDetector(object):
                                       default is UTC
             past_date_referenced (bool): to know if past or future date is referenced for date text like 'kal', 'parso'
             locale (Optional, str): user locale for getting the country code.
+            clock (Optional, Clock): timezone and current time to detect dates with, created from timezone if not
+                                     given
 
         """
         self.text = ''
@@ -94,11 +97,13 @@ class DateDetector(object):
         self.day_dictionary = {}
         self.entity_name = entity_name
         self.tag = '__' + entity_name + '__'
-        self.timezone = get_timezone(timezone)
-        self.now_date = datetime.datetime.now(tz=self.timezone)
+        self.clock = clock or Clock(timezone=timezone)
+        self.timezone = self.clock.timezone
+        self.now_date = self.clock.now()
         self.month_dictionary = MONTH_DICT
         self.day_dictionary = DAY_DICT
         self.bot_message = None
+        self.bot_context = NO_BOT_CONTEXT
         self.locale = locale
         self.country_code = None
         self.past_date_referenced = past_date_referenced
@@ -1994,18 +1999,11 @@ class DateDetector(object):
         Returns:
             str: year in four digits
         """
-        past_regex = re.compile(r'birth|bday|dob|born')
-        present_regex = None
-        future_regex = None
         this_century = int(str(self.now_date.year)[:2])
         if len(year) == 2:
-            if (((self.bot_message and past_regex.search(self.bot_message))
-                 or (self.past_date_referenced is True)) and (int(year) > int(str(self.now_date.year)[2:]))):
+            if ((self.bot_context.date_of_birth or self.past_date_referenced is True)
+                    and int(year) > int(str(self.now_date.year)[2:])):
                 return str(this_century - 1) + year
-            elif present_regex and present_regex.search(self.bot_message):
-                return str(this_century) + year
-            elif future_regex and future_regex.search(self.bot_message):
-                return str(this_century + 1) + year
 
         # if patterns didn't match or no bot message set, fallback to current century
         if len(year) == 2:
@@ -2021,3 +2019,4 @@ class DateDetector(object):
             bot_message: is the previous message that is sent by the bot
         """
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
@@ -11,11 +11,12 @@ class DateDetector(BaseRegexDate):
     data_directory_path = os.path.join((os.path.dirname(os.path.abspath(__file__)).rstrip(os.sep)),
                                        LANGUAGE_DATA_DIRECTORY)
 
-    def __init__(self, entity_name, locale=None, timezone='UTC', past_date_referenced=False):
+    def __init__(self, entity_name, locale=None, timezone='UTC', past_date_referenced=False, clock=None):
         super(DateDetector, self).__init__(entity_name,
                                            data_directory_path=DateDetector.data_directory_path,
                                            timezone=timezone,
-                                           past_date_referenced=past_date_referenced)
+                                           past_date_referenced=past_date_referenced,
+                                           clock=clock)
         self.detector_preferences = [
             self._gregorian_day_month_year_format,
             self._detect_relative_date,
@@ -8,11 +8,12 @@ from ner_v2.detectors.temporal.constant import (DATE_CONSTANT_FILE, DATETIME_CON
                                                 RELATIVE_DATE, DATE_LITERAL_TYPE, MONTH_LITERAL_TYPE, WEEKDAY_TYPE,
                                                 MONTH_TYPE, ADD_DIFF_DATETIME_TYPE, MONTH_DATE_REF_TYPE,
                                                 NUMERALS_CONSTANT_FILE, TYPE_EXACT)
-from ner_v2.detectors.temporal.utils import next_weekday, nth_weekday, get_tuple_dict, get_timezone
+from ner_v2.detectors.temporal.utils import next_weekday, nth_weekday, get_tuple_dict, Clock
 
 
 class BaseRegexDate(object):
-    def __init__(self, entity_name, data_directory_path, locale=None, timezone='UTC', past_date_referenced=False):
+    def __init__(self, entity_name, data_directory_path, locale=None, timezone='UTC', past_date_referenced=False,
+                 clock=None):
         """
         Base Regex class which will be imported by language date class by giving their data folder path
         This will create standard regex and their parser to detect date for given language.
@@ -22,6 +23,8 @@ class BaseRegexDate(object):
             past_date_referenced (boolean): if the date reference is in past, this is helpful for text like 'kal',
                                           'parso' to know if the reference is past or future.
             locale (Optional, str): user locale default None
+            clock (Optional, Clock): timezone and current time to detect dates with, created from timezone if not
+                                     given
         """
         self.text = ''
         self.tagged_text = ''
@@ -30,9 +33,9 @@ class BaseRegexDate(object):
         self.original_date_text = []
         self.entity_name = entity_name
         self.tag = '__' + entity_name + '__'
-        self.timezone = get_timezone(timezone)
-
-        self.now_date = datetime.datetime.now(tz=self.timezone)
+        self.clock = clock or Clock(timezone=timezone)
+        self.timezone = self.clock.timezone
+        self.now_date = self.clock.now()
         self.bot_message = None
 
         self.past_date_referenced = past_date_referenced
@@ -667,8 +670,11 @@ class BaseRegexDate(object):
 
 
 class DateDetector(BaseRegexDate):
-    def __init__(self, entity_name, data_directory_path, timezone='UTC', past_date_referenced=False):
+    def __init__(self, entity_name, data_directory_path, locale=None, timezone='UTC', past_date_referenced=False,
+                 clock=None):
         super(DateDetector, self).__init__(entity_name=entity_name,
                                            data_directory_path=data_directory_path,
+                                           locale=locale,
                                            timezone=timezone,
-                                           past_date_referenced=past_date_referenced)
+                                           past_date_referenced=past_date_referenced,
+                                           clock=clock)
@@ -2,14 +2,15 @@ from __future__ import absolute_import
 import re
 import datetime
 import collections
-import pandas as pd
 import os
 import pytz
 from ner_v2.detectors.temporal.constant import AM_MERIDIEM, PM_MERIDIEM, TWELVE_HOUR, EVERY_TIME_TYPE,\
     TIMEZONES_CONSTANT_FILE, TIMEZONE_VARIANTS_VARIANTS_COLUMN_NAME, \
     TIMEZONES_CODE_COLUMN_NAME, TIMEZONES_ALL_REGIONS_COLUMN_NAME, \
     TIMEZONES_PREFERRED_REGION_COLUMN_NAME
-from ner_v2.detectors.temporal.utils import get_timezone, get_list_from_pipe_sep_string
+from ner_v2.detectors.language_data import load_csv_records
+from ner_v2.detectors.temporal.utils import get_timezone, get_list_from_pipe_sep_string, Clock
+from lib.nlp.bot_context import NO_BOT_CONTEXT, classify_bot_message
 from ner_v2.constant import LANGUAGE_DATA_DIRECTORY
 
 TimezoneVariants = collections.namedtuple('TimezoneVariant', ['value', 'preferred'])
@@ -68,7 +69,7 @@ class TimeDetector(object):
         text and tagged_text will have a extra space prepended and appended after calling detect_entity(text)
     """
 
-    def __init__(self, entity_name, timezone=None):
+    def __init__(self, entity_name, timezone=None, clock=None):
         """Initializes a TimeDetector object with given entity_name and timezone
 
         Args:
@@ -76,6 +77,8 @@ class TimeDetector(object):
                         detect_entity()
             timezone (str): timezone identifier string that is used to create a pytz timezone object
                             default is UTC
+            clock (Optional, Clock): timezone and current time to detect times with, created from timezone if not
+                                     given
         """
         # assigning values to superclass attributes
         self.entity_name = entity_name
@@ -88,10 +91,9 @@ class TimeDetector(object):
         self.original_time_text = []
         self.tag = '__' + entity_name + '__'
         self.bot_message = None
-        if timezone:
-            self.timezone = get_timezone(timezone)
-        else:
-            self.timezone = None
+        self.bot_context = NO_BOT_CONTEXT
+        self.clock = clock or Clock(timezone=timezone)
+        self.timezone = self.clock.timezone
         self.timezones_map = {}
 
         self.init_regex_and_parser(os.path.join((os.path.dirname(os.path.abspath(__file__)).rstrip(os.sep)),
@@ -107,14 +109,12 @@ class TimeDetector(object):
             bot_message (str): previous message that is sent by the bot
         """
         self.bot_message = bot_message
+        self.bot_context = classify_bot_message(bot_message)
 
     def init_regex_and_parser(self, data_directory_path):
         timezone_variants_data_path = os.path.join(data_directory_path, TIMEZONES_CONSTANT_FILE)
-        columns = [TIMEZONE_VARIANTS_VARIANTS_COLUMN_NAME, TIMEZONES_CODE_COLUMN_NAME,
-                   TIMEZONES_PREFERRED_REGION_COLUMN_NAME]
         if os.path.exists(timezone_variants_data_path):
-            timezone_variants_df = pd.read_csv(timezone_variants_data_path, usecols=columns, encoding='utf-8')
-            for index, row in timezone_variants_df.iterrows():
+            for row in load_csv_records(timezone_variants_data_path):
                 tz_name_variants = get_list_from_pipe_sep_string(row[TIMEZONE_VARIANTS_VARIANTS_COLUMN_NAME])
                 value = row[TIMEZONES_CODE_COLUMN_NAME]
                 preferred = row[TIMEZONES_PREFERRED_REGION_COLUMN_NAME]
@@ -131,11 +131,10 @@ class TimeDetector(object):
         data_directory_path = os.path.join((os.path.dirname(os.path.abspath(__file__)).rstrip(os.sep)),
                                            LANGUAGE_DATA_DIRECTORY)
         timezone_data_path = os.path.join(data_directory_path, TIMEZONES_CONSTANT_FILE)
-        columns = [TIMEZONES_CODE_COLUMN_NAME, TIMEZONES_ALL_REGIONS_COLUMN_NAME]
         if os.path.exists(timezone_data_path):
-            timezones_df = pd.read_csv(timezone_data_path, usecols=columns, index_col=TIMEZONES_CODE_COLUMN_NAME,
-                                       encoding='utf-8')
-            if re.search(self.timezone.zone, timezones_df.loc[timezone_code][TIMEZONES_ALL_REGIONS_COLUMN_NAME]):
+            all_regions = {row[TIMEZONES_CODE_COLUMN_NAME]: row[TIMEZONES_ALL_REGIONS_COLUMN_NAME]
+                           for row in load_csv_records(timezone_data_path)}
+            if re.search(self.timezone.zone, all_regions[timezone_code]):
                 return self.timezone.zone
             else:
                 return self.timezones_map[timezone_variant].preferred
@@ -1364,7 +1363,7 @@ class TimeDetector(object):
                               r'({timezone})?)\b'.format(timezone=self.timezone_choices),
                               self.processed_text.lower())
 
-        if not patterns and self.bot_message and re.findall(r"Time|time", self.bot_message.lower()):
+        if not patterns and self.bot_context.time:
             patterns = re.findall(r'\b(({timezone})?\s*([0-2]?[0-9])'
                                   r'()\s*({timezone})?)\b'.format(timezone=self.timezone_choices),
                                   self.processed_text.lower())
@@ -1413,9 +1412,9 @@ class TimeDetector(object):
             new_timezone = get_timezone(timezone)
         else:
             # If no TZ(neither from api call not from the user message) is given, use 'UTC'
-            new_timezone = self.timezone or pytz.timezone('UTC')
+            new_timezone = self.timezone or pytz.UTC
 
-        current_datetime = datetime.datetime.now(new_timezone)
+        current_datetime = self.clock.now(new_timezone)
         current_hour = current_datetime.hour
         current_min = current_datetime.minute
         if hours == 0 or hours >= TWELVE_HOUR:
@@ -12,28 +12,28 @@ from ner_v2.detectors.temporal.constant import (DATETIME_CONSTANT_FILE, ADD_DIFF
                                                 TIME_CONSTANT_FILE, REF_DATETIME_TYPE, HOUR_TIME_TYPE,
                                                 MINUTE_TIME_TYPE, DAYTIME_MERIDIEM, AM_MERIDIEM, PM_MERIDIEM,
                                                 TWELVE_HOUR)
-from ner_v2.detectors.temporal.utils import get_tuple_dict, get_hour_min_diff, get_timezone
+from ner_v2.detectors.temporal.utils import get_tuple_dict, get_hour_min_diff, Clock
 
 
 class BaseRegexTime(object):
-    def __init__(self, entity_name, data_directory_path, timezone=None):
+    def __init__(self, entity_name, data_directory_path, timezone=None, clock=None):
         """
         Base Regex class which will be imported by language date class by giving their data folder path
         This will create standard regex and their parser to detect date for given language.
         Args:
             data_directory_path (str): path of data folder for given language
             timezone (str): user timezone default UTC
+            clock (Optional, Clock): timezone and current time to detect times with, created from timezone if not
+                                     given
         """
         self.text = ''
         self.tagged_text = ''
         self.processed_text = ''
         self.entity_name = entity_name
         self.tag = '__' + entity_name + '__'
-        if timezone:
-            self.timezone = get_timezone(timezone)
-        else:
-            self.timezone = None
-        self.now_date = datetime.datetime.now(tz=self.timezone)
+        self.clock = clock or Clock(timezone=timezone)
+        self.timezone = self.clock.timezone
+        self.now_date = self.clock.now()
         self.bot_message = None
 
         # dict to store words for time, numerals and words which comes in reference to some date
@@ -195,8 +195,8 @@ class BaseRegexTime(object):
             str: returns the meridiem type whether its am and pm
         """
         # If no TZ(neither from api call not from the user message) is given, use 'UTC'
-        new_timezone = self.timezone or pytz.timezone('UTC')
-        current_datetime = datetime.datetime.now(new_timezone)
+        new_timezone = self.timezone or pytz.UTC
+        current_datetime = self.clock.now(new_timezone)
         current_hour = current_datetime.hour
         current_min = current_datetime.minute
         if hours == 0 or hours >= TWELVE_HOUR:
@@ -356,7 +356,8 @@ class BaseRegexTime(object):
 
 
 class TimeDetector(BaseRegexTime):
-    def __init__(self, entity_name, data_directory_path, timezone='UTC'):
+    def __init__(self, entity_name, data_directory_path, timezone='UTC', clock=None):
         super(TimeDetector, self).__init__(entity_name=entity_name,
                                            data_directory_path=data_directory_path,
-                                           timezone=timezone)
+                                           timezone=timezone,
+                                           clock=clock)
@@ -1,11 +1,12 @@
 # coding=utf-8
 from __future__ import absolute_import
-import importlib
 import os
 
 from language_utilities.constant import ENGLISH_LANG
+from ner_v2.detectors import language_registry
 from ner_v2.detectors.base_detector import BaseDetector
-from ner_v2.detectors.temporal.utils import get_timezone
+from ner_v2.detectors.temporal.time import standard_time_regex
+from ner_v2.detectors.temporal.utils import Clock
 from ner_v2.detectors.utils import get_lang_data_path
 
 
@@ -25,6 +26,7 @@ class TimeDetector(BaseDetector):
         original_time_text: list to store substrings of the text detected as time entities
         tag: entity_name prepended and appended with '__'
         timezone: Optional, timezone identifier string that is used to create a pytz timezone object
+        clock: Clock shared with the language time detector
     """
 
     @staticmethod
@@ -34,15 +36,9 @@ class TimeDetector(BaseDetector):
         Returns:
             (list): supported languages
         """
-        supported_languages = []
-        cwd = os.path.dirname(os.path.abspath(__file__))
-        cwd_dirs = [x for x in os.listdir(cwd) if os.path.isdir(os.path.join(cwd, x))]
-        for _dir in cwd_dirs:
-            if len(_dir.rstrip(os.sep)) == 2:
-                supported_languages.append(_dir)
-        return supported_languages
-
-    def __init__(self, entity_name='time', timezone=None, language=ENGLISH_LANG):
+        return language_registry.get_supported_languages(language_registry.TIME)
+
+    def __init__(self, entity_name='time', timezone=None, language=ENGLISH_LANG, clock=None):
         """Initializes a TimeDetector object with given entity_name and timezone
 
         Args:
@@ -51,6 +47,8 @@ class TimeDetector(BaseDetector):
             timezone(str): timezone identifier string that is used to create a pytz timezone object
                             default is UTC
             language(str): ISO 639 code for language of entities to be detected by the instance of this class
+            clock(Clock, optional): timezone and current time to detect times with, created from timezone if not
+                                    given
         """
         # assigning values to superclass attributes
         self._supported_languages = self.get_supported_languages()
@@ -62,27 +60,24 @@ class TimeDetector(BaseDetector):
         self.time = []
         self.original_time_text = []
         self.tag = '__' + entity_name + '__'
-        if timezone:
-            self.timezone = get_timezone(timezone)
-        else:
-            self.timezone = None
+        self.clock = clock or Clock(timezone=timezone)
+        self.timezone = self.clock.timezone
         self.language = language
 
-        try:
-            time_detector_module = importlib.import_module(
-                'ner_v2.detectors.temporal.time.{0}.time_detection'.format(self.language))
-            self.language_time_detector = time_detector_module.TimeDetector(entity_name=self.entity_name,
-                                                                            timezone=self.timezone)
+        language_time_detector_class = language_registry.get_language_detector_class(language_registry.TIME,
+                                                                                     self.language)
+        if language_time_detector_class is not None:
+            self.language_time_detector = language_time_detector_class(entity_name=self.entity_name,
+                                                                       timezone=self.timezone,
+                                                                       clock=self.clock)
 
-        except ImportError:
-            standard_time_regex = importlib.import_module(
-                'ner_v2.detectors.temporal.time.standard_time_regex'
-            )
+        else:
             self.language_time_detector = standard_time_regex.TimeDetector(
                 entity_name=self.entity_name,
                 data_directory_path=get_lang_data_path(detector_path=os.path.abspath(__file__),
                                                        lang_code=self.language),
                 timezone=self.timezone,
+                clock=self.clock,
             )
 
     @property
@@ -1,15 +1,27 @@
 from __future__ import absolute_import
 import calendar
+import collections
+import threading
 from datetime import datetime, timedelta, tzinfo  # FIXME: Change import to `import datetime`
 
-import pandas as pd
 import pytz
 import six
 
 from chatbot_ner.config import ner_logger
+from ner_v2.detectors.language_data import load_csv_records
 from ner_v2.detectors.temporal.constant import POSITIVE_TIME_DIFF, NEGATIVE_TIME_DIFF, CONSTANT_FILE_KEY
 from six.moves import range
 
+# Max number of timezone names whose pytz timezone objects are kept in memory
+TIMEZONE_CACHE_SIZE = 512
+
+# Stored in the timezone cache for names that are not valid timezones
+_INVALID_TIMEZONE = object()
+
+_timezone_cache = collections.OrderedDict()
+_timezone_cache_lock = threading.Lock()
+
+
 def nth_weekday(weekday, n, ref_date):
     """
     Method to return python datetime object for given nth weekday w.r.t ref_date (reference date)
@@ -81,15 +93,13 @@ def get_tuple_dict(csv_file):
     Returns:
         (dict): dict containing key as csv index key and all other rows values as tuple
     """
-    data_df = pd.read_csv(csv_file, encoding='utf-8')
-    data_df = data_df.set_index(CONSTANT_FILE_KEY)
-    records = data_df.to_records()
     tuple_records = {}
-    for record in records:
-        keys = record[0]
+    for record in load_csv_records(csv_file):
+        keys = record[CONSTANT_FILE_KEY]
         keys = [x.strip().lower() for x in keys.split("|") if x.strip() != ""]
+        values = tuple(value for column, value in record.items() if column != CONSTANT_FILE_KEY)
         for key in keys:
-            tuple_records[key] = tuple(list(record)[1:])
+            tuple_records[key] = values
     return tuple_records
 
 
@@ -287,16 +297,91 @@ def get_timezone(timezone, ignore_errors=False):
             hasattr(timezone, 'localize')):
         return timezone
 
-    try:
-        timezone = pytz.timezone(timezone)
-    except Exception as e:
+    timezone_object = _get_cached_timezone(timezone)
+    if timezone_object is _INVALID_TIMEZONE:
         if ignore_errors:
-            ner_logger.debug('Timezone error: %s ' % e)
-            timezone = pytz.timezone('UTC')
+            ner_logger.debug('Timezone error: unknown timezone %r ' % timezone)
+            timezone_object = pytz.UTC
             ner_logger.debug('Using "UTC" as default timezone')
         else:
             return None
-    return timezone
+    return timezone_object
+
+
+def _get_cached_timezone(timezone):
+    """
+    Get pytz timezone object for timezone name, pytz timezone objects of the last TIMEZONE_CACHE_SIZE names used are
+    kept in memory
+
+    Args:
+        timezone (str): timezone name, e.g. 'Asia/Kolkata'
+
+    Returns:
+        datetime.tzinfo or object: pytz timezone object, _INVALID_TIMEZONE if timezone is not a valid timezone name
+    """
+    try:
+        hash(timezone)
+    except TypeError:
+        return _INVALID_TIMEZONE
+
+    with _timezone_cache_lock:
+        timezone_object = _timezone_cache.get(timezone)
+        if timezone_object is not None:
+            _timezone_cache.move_to_end(timezone)
+            return timezone_object
+
+    try:
+        timezone_object = pytz.timezone(timezone)
+    except Exception:
+        timezone_object = _INVALID_TIMEZONE
+
+    with _timezone_cache_lock:
+        _timezone_cache[timezone] = timezone_object
+        if len(_timezone_cache) > TIMEZONE_CACHE_SIZE:
+            _timezone_cache.popitem(last=False)
+    return timezone_object
+
+
+class Clock(object):
+    """
+    Timezone and current time of one detection request. A detector creates a Clock (or takes one passed in) and hands
+    it to the detectors it builds, so that the timezone is resolved once and all of them see the same "now". Passing
+    a fixed `now` makes relative dates and times ("tomorrow", "in 2 hours") reproducible in tests and benchmarks.
+
+    Attributes:
+        timezone (datetime.tzinfo or None): pytz timezone object, None if no or an invalid timezone was given
+    """
+
+    def __init__(self, timezone=None, now=None):
+        """
+        Args:
+            timezone (str or datetime.tzinfo, optional): timezone name or pytz timezone object. Defaults to None
+            now (datetime, optional): fixed current time. Naive datetimes are taken to be in `timezone` (UTC if
+                timezone is not given). Defaults to None, which uses the time of the first `now()` call
+        """
+        self.timezone = get_timezone(timezone) if timezone else None
+        if now is not None and now.tzinfo is None:
+            now = (self.timezone or pytz.UTC).localize(now)
+        self._now = now
+
+    def now(self, timezone=None):
+        """
+        Current time of the clock, the same instant on every call
+
+        Args:
+            timezone (datetime.tzinfo, optional): pytz timezone object to get the time in. Defaults to the timezone of
+                the clock
+
+        Returns:
+            datetime: current time, aware in the timezone or naive local time if neither the clock nor the call has
+                a timezone (same as datetime.now())
+        """
+        if self._now is None:
+            self._now = datetime.now(tz=pytz.UTC)
+        timezone = timezone or self.timezone
+        if timezone is None:
+            return self._now.astimezone(tz=None).replace(tzinfo=None)
+        return self._now.astimezone(timezone)
 
 
 def get_list_from_pipe_sep_string(text_string):
@@ -3,17 +3,29 @@ from __future__ import absolute_import
 import json
 
 import six
-from elasticsearch import Elasticsearch
 from elasticsearch import exceptions as es_exceptions
 
-from chatbot_ner.config import ner_logger, CHATBOT_NER_DATASTORE
+from chatbot_ner.config import (ner_logger, CHATBOT_NER_DATASTORE, ES_MSEARCH_BATCH_MAX_QUERIES,
+                                ES_MSEARCH_BATCH_WAIT_MS, ES_SINGLE_FLIGHT)
+from chatbot_ner.payload_logging import payload_logger
 from datastore import constants
+from datastore.circuit_breaker import es_guarded
+from datastore.elastic_search.transport import get_client
 from datastore.exceptions import (EngineConnectionException, DataStoreSettingsImproperlyConfiguredException,
-                                  DataStoreRequestException)
+                                  DataStoreRequestException, CircuitBreakerOpenException)
+from datastore.single_flight import SingleFlight, single_flight_key, wait_timeout
 from language_utilities.constant import ENGLISH_LANG
 from lib.singleton import Singleton
+from ner_v2.detectors.textual.msearch_batching import MsearchBatcher
 from ner_v2.detectors.textual.queries import _generate_multi_entity_es_query, _parse_multi_entity_es_results
 
+# concurrent identical multi entity lookups share one msearch, see datastore/single_flight.py
+_multi_entity_results_flights = SingleFlight(name='multi entity')
+
+# msearch requests of concurrent multi entity lookups are merged if enabled, see msearch_batching.py
+msearch_batcher = (MsearchBatcher(max_wait_ms=ES_MSEARCH_BATCH_WAIT_MS, max_queries=ES_MSEARCH_BATCH_MAX_QUERIES)
+                   if ES_MSEARCH_BATCH_WAIT_MS > 0 else None)
+
 
 # NOTE: connection is a misleading term for this implementation, rather what we have are clients that manage
 # any real connections on their own
@@ -128,25 +140,28 @@ class ElasticSearchDataStore(six.with_metaclass(Singleton, object)):
                 'restaurant': OrderedDict([
                     ('TMOS', 'TMOS'), ('G.', 'G  Pulla Reddy Sweets')])}
             ]
+
+        Concurrent calls with the same arguments in a process share one msearch (unless `ES_SINGLE_FLIGHT` is off),
+        see `datastore.single_flight.SingleFlight`. While the circuit breaker of the datastore is open
+        (`datastore.circuit_breaker`) no query is sent and nothing is found for any text
         """
-        ner_logger.info(f'[get_multi_entity_results] entities {entities}')
-        # entities for which es results need to be logged for debugging purposes
-        log_results_for_entities = ['nsdc_language_select',
-                                    'nsdc_choose_topik',
-                                    'test_giftcard_user_amount',
-                                    'pvr_giftcard_user_amount']
-        # this boolean will determine if the es result needs to be logged
-        # this will be set to true only if one of or all names mentioned in log_results_for_entities list
-        # are present in the entities list
-        log_es_result = False
-        if len(entities) > 0:
-            entities_list = entities[0]
-            for entity_name in log_results_for_entities:
-                if entity_name in entities_list:
-                    # if we find at least one entity name for which the es results need to be logged
-                    # we set the value for the boolean and break the loop
-                    log_es_result = True
-                    break
+        payload_logger.info('[get_multi_entity_results] entities', entities)
+        try:
+            if not ES_SINGLE_FLIGHT:
+                return self._get_multi_entity_results(entities, texts, fuzziness_threshold, search_language_script)
+
+            key = single_flight_key(self._index_name, entities, texts, fuzziness_threshold, search_language_script)
+            return _multi_entity_results_flights.do(
+                key,
+                lambda: self._get_multi_entity_results(entities, texts, fuzziness_threshold, search_language_script),
+                timeout=wait_timeout(self._connection_settings))
+        except CircuitBreakerOpenException as e:
+            ner_logger.debug(f'Skipped datastore query, {e}')
+            return [{} for text_list in texts for _ in ([text_list] if isinstance(text_list, str) else text_list)]
+
+    def _get_multi_entity_results(self, entities, texts, fuzziness_threshold, search_language_script):
+        # es results are logged in full for entities on the debug allow-list (NER_LOG_DEBUG_ENTITIES)
+        log_es_result = len(entities) > 0 and payload_logger.debug_entities_in(entities[0])
         request_timeout = self._connection_settings.get('request_timeout', 20)
         index_name = self._index_name
 
@@ -159,17 +174,20 @@ class ElasticSearchDataStore(six.with_metaclass(Singleton, object)):
         kwargs = dict(body=query_data, doc_type=self._doc_type, index=index_name, request_timeout=request_timeout)
         response = None
         try:
-            response = self._run_es_search(self._default_connection, **kwargs)
+            if msearch_batcher is not None:
+                response = {'responses': msearch_batcher.submit(data, self._run_batched_es_search,
+                                                                timeout=request_timeout)}
+            else:
+                response = es_guarded(lambda: self._run_es_search(self._default_connection, **kwargs))
             results = _parse_multi_entity_es_results(response.get("responses"))
-            ner_logger.info(f'[ES Result for Entities] log_es_result: {log_es_result}')
             if log_es_result:
-                ner_logger.info(f'[ES Result for Entities] result: {results}')
-                ner_logger.info(f'[ES Result for Entities] kwargs: {kwargs}')
+                payload_logger.info('[ES Result for Entities] result', results, full=True)
+                payload_logger.info('[ES Result for Entities] kwargs', kwargs, full=True)
         except es_exceptions.NotFoundError as e:
             raise DataStoreRequestException(f'NotFoundError in datastore query on index: {index_name}',
                                             engine='elasticsearch', request=json.dumps(data),
                                             response=json.dumps(response)) from e
-        except es_exceptions.ConnectionError as e:
+        except (es_exceptions.ConnectionError, CircuitBreakerOpenException) as e:
             raise e
         except Exception as e:
             raise DataStoreRequestException(f'Error in datastore query on index: {index_name}', engine='elasticsearch',
@@ -192,23 +210,27 @@ class ElasticSearchDataStore(six.with_metaclass(Singleton, object)):
             kwargs: any additional arguments will be passed on to the Transport class and, subsequently,
                     to the Connection instances.
         Returns:
-            Elasticsearch client connection object or None
+            Elasticsearch client connection object or None. Clients are shared by the process,
+            see datastore.elastic_search.transport
 
         """
         # TODO: This does not account for ES_SCHEME unless the connection is being made via `connection_url`
-        connection = None
-        if user and password:
-            kwargs = dict(kwargs, http_auth=(user, password))
+        return get_client(connection_url=connection_url, host=host, port=port, user=user, password=password,
+                          **kwargs)
 
-        if connection_url:
-            connection = Elasticsearch(hosts=[connection_url], **kwargs)
-        elif host and port:
-            connection = Elasticsearch(hosts=[{'host': host, 'port': int(port)}], **kwargs)
+    def _run_batched_es_search(self, body):
+        """
+        Execute the msearch of a batch of multi entity lookups, see `msearch_batching.MsearchBatcher`
 
-        if connection and not connection.ping():
-            connection = None
+        Args:
+            body (str): msearch body of the batch
 
-        return connection
+        Returns:
+            dictionary, search results from elasticsearch.ElasticSearch.msearch
+        """
+        request_timeout = self._connection_settings.get('request_timeout', 20)
+        return es_guarded(lambda: self._run_es_search(self._default_connection, body=body, doc_type=self._doc_type,
+                                                      index=self._index_name, request_timeout=request_timeout))
 
     @staticmethod
     def _run_es_search(connection, **kwargs):
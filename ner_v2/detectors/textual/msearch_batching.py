@@ -0,0 +1,155 @@
+"""
+Micro-batching of the msearch requests of concurrent text detections.
+
+Every text detection sends its own msearch with one query per text. When many requests arrive within a few
+milliseconds on a worker (threads of uwsgi or the ASGI executor), `MsearchBatcher` merges their queries into one
+msearch and hands every caller back its own part of the `responses`. Fewer, larger msearch requests are cheaper for
+the cluster than many small ones.
+
+Batching is opt-in (`ES_MSEARCH_BATCH_WAIT_MS` > 0) since it trades latency for fewer requests: the first caller of a
+batch waits up to `ES_MSEARCH_BATCH_WAIT_MS` for others to join, or until the batch holds
+`ES_MSEARCH_BATCH_MAX_QUERIES` queries, and then sends the msearch for the whole batch. There is no background thread,
+the first caller sends it.
+"""
+from __future__ import absolute_import
+
+import collections
+import threading
+import time
+
+
+class _Batch(object):
+    __slots__ = ('query_parts', 'offsets', 'queries', 'closed', 'done', 'responses', 'error')
+
+    def __init__(self):
+        self.query_parts = []
+        self.offsets = []
+        self.queries = 0
+        self.closed = False
+        self.done = threading.Event()
+        self.responses = None
+        self.error = None
+
+    def add(self, query_parts):
+        self.offsets.append(self.queries)
+        self.query_parts.extend(query_parts)
+        self.queries += len(query_parts) // 2
+        return len(self.offsets) - 1
+
+
+def _size_bucket(size):
+    """Power of two bucket of a batch size, e.g. 1, 2-3, 4-7, ..."""
+    low = 1 << (size.bit_length() - 1)
+    return str(low) if low == 1 else f'{low}-{2 * low - 1}'
+
+
+class MsearchBatcher(object):
+    """
+    Merges the msearch queries of concurrent callers into one msearch, see module docstring
+    """
+
+    def __init__(self, max_wait_ms, max_queries):
+        """
+        Args:
+            max_wait_ms (float): latency budget, max time the first caller of a batch waits for others to join
+            max_queries (int): max number of queries (texts) in one msearch
+        """
+        self.max_wait_seconds = max_wait_ms / 1000.0
+        self.max_queries = max_queries
+        self._condition = threading.Condition()
+        self._open_batch = None
+        self._batches = 0
+        self._callers = 0
+        self._queries = 0
+        self._callers_per_batch = collections.Counter()
+        self._queries_per_batch = collections.Counter()
+
+    def _close(self, batch):
+        # must hold self._condition
+        batch.closed = True
+        if self._open_batch is batch:
+            self._open_batch = None
+        self._condition.notify_all()
+
+    def submit(self, query_parts, run_msearch, timeout=None):
+        """
+        Add msearch queries to the open batch (or open one) and wait for their responses
+
+        Args:
+            query_parts (list of str): msearch body lines, a header and a query per text, see
+                `ElasticSearchDataStore.generate_query_data`
+            run_msearch (callable): function that sends an msearch body (str) and returns the msearch response. The
+                one of the first caller of a batch is used for the batch
+            timeout (float, optional): max seconds to wait for the batch after it was closed, None to wait until it
+                is done
+
+        Returns:
+            list of dict: the `responses` of the queries in `query_parts`, in order
+
+        Raises:
+            TimeoutError: if the msearch of the batch did not finish within `timeout`
+            Exception: whatever `run_msearch` raised, in every caller of the batch
+        """
+        queries = len(query_parts) // 2
+        with self._condition:
+            batch = self._open_batch
+            if batch is not None and batch.queries + queries > self.max_queries:
+                self._close(batch)
+                batch = None
+            is_first = batch is None
+            if is_first:
+                batch = self._open_batch = _Batch()
+            index = batch.add(query_parts)
+            if batch.queries >= self.max_queries:
+                self._close(batch)
+            if is_first:
+                deadline = time.monotonic() + self.max_wait_seconds
+                remaining = self.max_wait_seconds
+                while not batch.closed and remaining > 0:
+                    self._condition.wait(remaining)
+                    remaining = deadline - time.monotonic()
+                self._close(batch)
+                self._batches += 1
+                self._callers += len(batch.offsets)
+                self._queries += batch.queries
+                self._callers_per_batch[_size_bucket(len(batch.offsets))] += 1
+                self._queries_per_batch[_size_bucket(max(batch.queries, 1))] += 1
+
+        if is_first:
+            try:
+                responses = run_msearch('\n'.join(batch.query_parts)).get('responses')
+                if responses is None or len(responses) != batch.queries:
+                    raise ValueError(f'msearch returned {len(responses or [])} responses for {batch.queries} queries')
+                batch.responses = responses
+            except BaseException as e:
+                batch.error = e
+            finally:
+                batch.done.set()
+        elif not batch.done.wait(timeout):
+            raise TimeoutError(f'Timed out after {timeout}s waiting for a batched msearch')
+
+        if batch.error is not None:
+            raise batch.error
+        start = batch.offsets[index]
+        return batch.responses[start:start + queries]
+
+    def stats(self):
+        """
+        Counters and size distributions of the batches sent so far
+
+        Returns:
+            dict: with keys
+                max_wait_ms, max_queries: configured limits
+                batches, callers, queries: number of msearch requests sent, callers and queries they answered
+                callers_per_batch, queries_per_batch: number of batches by size bucket (1, 2-3, 4-7, ...)
+        """
+        with self._condition:
+            return {
+                'max_wait_ms': self.max_wait_seconds * 1000,
+                'max_queries': self.max_queries,
+                'batches': self._batches,
+                'callers': self._callers,
+                'queries': self._queries,
+                'callers_per_batch': dict(self._callers_per_batch),
+                'queries_per_batch': dict(self._queries_per_batch),
+            }
@@ -7,9 +7,12 @@ import re
 from six.moves import zip
 from six import string_types
 
+from chatbot_ner.config import ES_NORMALIZED_VARIANTS
 from datastore import constants
+from datastore.utils import get_normalized_variants
 from language_utilities.constant import ENGLISH_LANG
 from lib.nlp.const import TOKENIZER
+from lib.nlp.token_cache import cache_normalized_variant
 
 
 def _generate_multi_entity_es_query(entities, text,
@@ -98,8 +101,12 @@ def _generate_multi_entity_es_query(entities, text,
 
     should_terms.append(query)
 
+    source_fields = ['value', 'entity_data']
+    if ES_NORMALIZED_VARIANTS:
+        source_fields.extend(['variants', constants.NORMALIZED_VARIANTS_FIELD])
+
     data = {
-        '_source': ['value', 'entity_data'],
+        '_source': source_fields,
         'query': {
             'bool': {
                 'filter': filter_terms,
@@ -130,6 +137,9 @@ def _parse_multi_entity_es_results(results_list):
     This will parse highlighted results returned from elasticsearch query and
     generate a variants to values dictionary mapped to each entity for each
     search text terms.
+    Normalized forms of the variants in the results (see `ES_NORMALIZED_VARIANTS`)
+    are put in the variant token cache of `lib.nlp.token_cache` so that detectors
+    don't tokenize the variants again.
 
     Args:
         results_list (list of dict):
@@ -206,27 +216,39 @@ def _parse_multi_entity_es_results(results_list):
 
                     value = hit['_source']['value']
                     entity_name = hit['_source']['entity_data']
+                    normalized_variants = get_normalized_variants(hit['_source'])
 
                     if entity_name not in entity_dict:
-                        entity_dict[entity_name] = {'value': [], 'variant': []}
+                        entity_dict[entity_name] = {'value': [], 'variant': [], 'normalized': []}
 
                     entity_dict[entity_name]['value'].extend(
                         [value for _ in hit['highlight']['variants']])
                     entity_dict[entity_name]['variant'].extend(
                         [variant for variant in hit['highlight']['variants']])
+                    entity_dict[entity_name]['normalized'].extend(
+                        [normalized_variants for _ in hit['highlight']['variants']])
 
                 for each_entity in entity_dict.keys():
                     entity_values = entity_dict[each_entity]['value']
                     entity_variants = entity_dict[each_entity]['variant']
+                    entity_normalized_variants = entity_dict[each_entity]['normalized']
                     entity_variants_to_values = collections.OrderedDict()
 
-                    for value, variant in zip(entity_values, entity_variants):
+                    for value, variant, normalized_variants in zip(entity_values, entity_variants,
+                                                                   entity_normalized_variants):
                         variant = re.sub(r'\s+', ' ', variant.strip())
                         variant_no_highlight_tags = variant.replace('<em>', '').replace('</em>', '').strip()
-                        if variant.count('<em>') == len(TOKENIZER.tokenize(variant_no_highlight_tags)):
+                        normalized = normalized_variants.get(variant_no_highlight_tags)
+                        if normalized is None:
+                            tokens_count = len(TOKENIZER.tokenize(variant_no_highlight_tags))
+                        else:
+                            tokens_count = len(normalized.split())
+                        if variant.count('<em>') == tokens_count:
                             variant = variant_no_highlight_tags
                             if variant not in entity_variants_to_values:
                                 entity_variants_to_values[variant] = value
+                                if normalized is not None:
+                                    cache_normalized_variant(variant, normalized)
                     entity_variants_to_values_dict[each_entity] = entity_variants_to_values
             entity_variants_to_values_list.append(entity_variants_to_values_dict)
     return entity_variants_to_values_list
@@ -7,6 +7,7 @@ from django.test import TestCase
 from elasticsearch import Elasticsearch
 
 from chatbot_ner.config import ES_SEARCH_SIZE, ES_ALIAS, ES_DOC_TYPE
+from datastore.elastic_search.transport import clear_clients
 from datastore.exceptions import EngineConnectionException
 from ner_v2.detectors.textual.elastic_search import ElasticSearchDataStore
 
@@ -27,14 +28,15 @@ class TestESDataStore(TestCase):
         }
         self.esds = ElasticSearchDataStore()
         self.esds._clear_connections()  # Needed because `ElasticSearchDataStore` is a singleton instance
+        clear_clients()  # and clients are shared by the process
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_default_connection(self, mocked_es_ping):
         """Test default connection on `ElasticSearchDataStore`"""
         mocked_es_ping.return_value = True
         self.assertIsInstance(self.esds._default_connection, Elasticsearch)
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_reconnection(self, mocked_es_ping):
         """Test that `ElasticSearchDataStore` recovers connection after a ping fails"""
         mocked_es_ping.return_value = False
@@ -44,35 +46,35 @@ class TestESDataStore(TestCase):
         mocked_es_ping.return_value = True
         self.assertIsInstance(self.esds._default_connection, Elasticsearch)
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_connect_ping_success(self, mocked_es_ping):
         """Test `ElasticSearchDataStore.connect` when ping succeeds"""
         mocked_es_ping.return_value = True
         connection = ElasticSearchDataStore.connect(**self.elasticsearch_engine_settings)
         self.assertIsInstance(connection, Elasticsearch)
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_connect_ping_fail(self, mocked_es_ping):
         """Test `ElasticSearchDataStore.connect` when ping fails"""
         mocked_es_ping.return_value = False
         connection = ElasticSearchDataStore.connect(**self.elasticsearch_engine_settings)
         self.assertIs(connection, None)
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_get_connection_ping_success(self, mocked_es_ping):
         """Test `ElasticSearchDataStore._get_or_create_new_connection` when ping succeeds"""
         mocked_es_ping.return_value = True
         connection = self.esds._get_or_create_new_connection(alias='test', **self.elasticsearch_engine_settings)
         self.assertIsInstance(connection, Elasticsearch)
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_get_connection_ping_fail(self, mocked_es_ping):
         """Test `ElasticSearchDataStore._get_or_create_new_connection` when ping fails"""
         mocked_es_ping.return_value = False
         with self.assertRaises(EngineConnectionException):
             self.esds._get_or_create_new_connection(alias='test', **self.elasticsearch_engine_settings)
 
-    @mock.patch('ner_v2.detectors.textual.elastic_search.Elasticsearch.ping')
+    @mock.patch('datastore.elastic_search.transport.Elasticsearch.ping')
     def test_elasticsearch_add_connection(self, mocked_es_ping):
         """Test `ElasticSearchDataStore._get_or_create_new_connection` with multiple connections"""
         self.assertEqual(len(self.esds._conns), 0)
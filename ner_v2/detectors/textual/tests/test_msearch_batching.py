@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+
+import json
+import threading
+
+from django.test import SimpleTestCase
+from mock import patch
+
+from ner_v2.detectors.textual import elastic_search
+from ner_v2.detectors.textual.elastic_search import ElasticSearchDataStore
+from ner_v2.detectors.textual.msearch_batching import MsearchBatcher
+
+
+def _query_parts(*texts):
+    parts = []
+    for text in texts:
+        parts.extend([json.dumps({'index': 'entity_data'}), json.dumps({'text': text})])
+    return parts
+
+
+def _echo_msearch(body, calls):
+    """msearch that answers every query with its text"""
+    calls.append(body)
+    lines = body.split('\n')
+    return {'responses': [json.loads(query)['text'] for query in lines[1::2]]}
+
+
+class TestMsearchBatcher(SimpleTestCase):
+
+    def _submit_concurrently(self, batcher, texts_per_caller, run_msearch):
+        results = {}
+
+        def submit(caller, texts):
+            results[caller] = batcher.submit(_query_parts(*texts), run_msearch)
+
+        threads = [threading.Thread(target=submit, args=(caller, texts))
+                   for caller, texts in enumerate(texts_per_caller)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_concurrent_queries_share_one_msearch(self):
+        batcher = MsearchBatcher(max_wait_ms=200, max_queries=100)
+        calls = []
+        texts_per_caller = [['mumbai', 'delhi'], ['yes'], ['pizza', 'burger', 'pune']]
+        results = self._submit_concurrently(batcher, texts_per_caller, lambda body: _echo_msearch(body, calls))
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([results[caller] for caller in range(3)], texts_per_caller)
+        stats = batcher.stats()
+        self.assertEqual((stats['batches'], stats['callers'], stats['queries']), (1, 3, 6))
+        self.assertEqual((stats['callers_per_batch'], stats['queries_per_batch']), ({'2-3': 1}, {'4-7': 1}))
+
+    def test_batch_is_sent_when_max_queries_is_reached(self):
+        batcher = MsearchBatcher(max_wait_ms=5000, max_queries=2)
+        calls = []
+        results = self._submit_concurrently(batcher, [['a'], ['b'], ['c', 'd']],
+                                            lambda body: _echo_msearch(body, calls))
+
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(results, {0: ['a'], 1: ['b'], 2: ['c', 'd']})
+
+    def test_error_is_raised_in_all_callers(self):
+        batcher = MsearchBatcher(max_wait_ms=200, max_queries=100)
+        errors = []
+
+        def run_msearch(body):
+            raise ValueError('msearch failed')
+
+        def submit():
+            try:
+                batcher.submit(_query_parts('yes'), run_msearch)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=submit) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(errors), 3)
+
+    @patch.object(ElasticSearchDataStore, '_run_batched_es_search')
+    def test_get_multi_entity_results_with_batching(self, mock_es_search):
+        hit = {'_source': {'value': 'Mumbai', 'entity_data': 'city'}, 'highlight': {'variants': ['<em>mumbai</em>']}}
+        # one response per query, the body has a header and a query line per text
+        mock_es_search.side_effect = lambda body: {
+            'responses': [{'hits': {'total': 1, 'hits': [hit]}}] * ((body.count('\n') + 1) // 2)}
+
+        with patch.object(elastic_search, 'msearch_batcher', MsearchBatcher(max_wait_ms=200, max_queries=100)):
+            results = {}
+
+            def get_multi_entity_results(text):
+                results[text] = ElasticSearchDataStore().get_multi_entity_results(entities=[['city']],
+                                                                                   texts=[[text]])
+
+            threads = [threading.Thread(target=get_multi_entity_results, args=(text,)) for text in ['a', 'b']]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_es_search.assert_called_once()
+        self.assertEqual(len(mock_es_search.call_args[0][0].split('\n')), 4)
+        self.assertEqual(results['a'], results['b'])
+        self.assertEqual(list(results['a'][0]['city'].items()), [('mumbai', 'Mumbai')])
@@ -1,12 +1,16 @@
 from __future__ import absolute_import
 
+import collections
 import json
 import os
+
+import mock
 from django.test import TestCase
 
 from ner_v2.detectors.textual.queries import _parse_multi_entity_es_results, \
     _generate_multi_entity_es_query
 from chatbot_ner.config import ES_SEARCH_SIZE
+from lib.nlp import token_cache
 
 
 es_tests_directory = os.path.dirname(os.path.abspath(__file__))
@@ -69,3 +73,26 @@ class TestESDataStoreQueries(TestCase):
         self.maxDiff = None
 
         self.assertDictEqual(result, output_data)
+
+    @mock.patch('ner_v2.detectors.textual.queries.ES_NORMALIZED_VARIANTS', True)
+    def test_generate_multi_entity_es_query_with_normalized_variants(self):
+        result = _generate_multi_entity_es_query('city', "I want to go to mumbai")
+        self.assertEqual(result['_source'], ['value', 'entity_data', 'variants', 'normalized_variants'])
+
+    def test_parse_multi_entity_es_results_with_normalized_variants(self):
+        hits = [
+            {'_source': {'value': 'New Delhi', 'entity_data': 'city', 'variants': ['New  Delhi', 'Delhi'],
+                         'normalized_variants': ['new delhi', 'delhi']},
+             'highlight': {'variants': ['<em>New</em> <em>Delhi</em>', '<em>Delhi</em>']}},
+            {'_source': {'value': 'Mumbai', 'entity_data': 'city', 'variants': ['Mumbai']},
+             'highlight': {'variants': ['<em>Mumbai</em>']}},
+        ]
+        results_list = [{'hits': {'total': len(hits), 'hits': hits}}]
+        with mock.patch.object(token_cache, '_variant_cache', token_cache.collections.OrderedDict()):
+            result = _parse_multi_entity_es_results(results_list)
+            self.assertEqual(list(token_cache._variant_cache.items()),
+                             [('new delhi', ('new', 'delhi')), ('delhi', ('delhi',))])
+
+        self.assertEqual(result, [{'city': collections.OrderedDict([('New Delhi', 'New Delhi'),
+                                                                     ('Delhi', 'New Delhi'),
+                                                                     ('Mumbai', 'Mumbai')])}])
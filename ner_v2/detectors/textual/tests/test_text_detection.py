@@ -1,12 +1,18 @@
 from __future__ import absolute_import
 
 import os
+import threading
+import time
 
 from collections import OrderedDict
 from mock import patch
 
 from django.test import TestCase
+from elasticsearch import exceptions as es_exceptions
 
+from datastore import circuit_breaker
+from datastore.circuit_breaker import CircuitBreaker
+from ner_v2.detectors.textual.elastic_search import ElasticSearchDataStore
 from ner_v2.detectors.textual.text_detection import TextDetector
 
 tests_directory = os.path.dirname(os.path.abspath(__file__))
@@ -186,3 +192,47 @@ class TestTextualUtils(TestCase):
         substring = text_detector._get_entity_substring_from_text('Mmsbai', 'Mumbai', 'city')
 
         self.assertEqual(substring, 'Mmsbai')
+
+    @patch('ner_v2.detectors.textual.elastic_search.'
+           'ElasticSearchDataStore._get_multi_entity_results')
+    def test_concurrent_identical_es_queries_are_coalesced(self, mock_es_query):
+        def es_query(*args):
+            time.sleep(0.2)
+            return [{'city': OrderedDict([('mumbai', 'Mumbai')])}]
+
+        mock_es_query.side_effect = es_query
+        results = []
+
+        def get_multi_entity_results():
+            results.append(ElasticSearchDataStore().get_multi_entity_results(entities=[['city']], texts=[['yes']]))
+
+        threads = [threading.Thread(target=get_multi_entity_results) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        mock_es_query.assert_called_once_with([['city']], [['yes']], 1, 'en')
+        self.assertEqual(results, [[{'city': OrderedDict([('mumbai', 'Mumbai')])}]] * 3)
+
+    @patch('ner_v2.detectors.textual.elastic_search.'
+           'ElasticSearchDataStore._run_es_search')
+    def test_text_detection_falls_back_while_circuit_breaker_is_open(self, mock_es_search):
+        breaker = CircuitBreaker(name='test', min_calls=1, failure_ratio=1, open_seconds=60)
+
+        def query():
+            raise es_exceptions.ConnectionError('N/A', 'connection refused', None)
+
+        with self.assertRaises(es_exceptions.ConnectionError):
+            breaker.call(query)
+        entity_dict = {'city': {'structured_value': None, 'fallback_value': 'Mumbai'},
+                       'restaurant': {'structured_value': None, 'fallback_value': None}}
+
+        with patch.object(circuit_breaker, 'es_circuit_breaker', breaker):
+            text_detector = TextDetector(entity_dict=entity_dict)
+            result = text_detector.detect(message='I want to go to Delhi')
+
+        mock_es_search.assert_not_called()
+        self.assertEqual(result[0]['restaurant'], [])
+        self.assertEqual(result[0]['city'][0]['entity_value']['value'], 'Mumbai')
+        self.assertEqual(result[0]['city'][0]['detection'], 'fallback_value')
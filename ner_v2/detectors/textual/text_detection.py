@@ -8,8 +8,10 @@ from six.moves import range
 
 import language_utilities.constant as lang_constant
 from chatbot_ner.config import ner_logger
+from chatbot_ner.payload_logging import payload_logger
 from language_utilities.constant import ENGLISH_LANG
-from lib.nlp.const import TOKENIZER, whitespace_tokenizer
+from lib.nlp.span_rewrite import replace_words
+from lib.nlp.token_cache import TokenCache, find_token_sequence
 from lib.nlp.text_normalization import edit_distance
 from ner_constants import (FROM_STRUCTURE_VALUE_VERIFIED, FROM_STRUCTURE_VALUE_NOT_VERIFIED,
                            FROM_MESSAGE, FROM_FALLBACK_VALUE, ORIGINAL_TEXT, ENTITY_VALUE,
@@ -27,6 +29,9 @@ except ImportError:
 
     _re_flags = re.UNICODE
 
+# Leading and trailing punctuation, stripped from detected original texts before tagging them
+_BOUNDARY_PUNCT_PATTERN = re.compile(r'(^[{0}]+)|([{0}]+$)'.format(re.escape(string.punctuation)))
+
 
 class TextDetector(object):
     """
@@ -66,6 +71,7 @@ class TextDetector(object):
         self.processed_text = None
         self.__texts = []
         self.__processed_texts = []
+        self._token_cache = TokenCache()
 
         # defaults for auto mode
         self._fuzziness = "4,7"
@@ -92,6 +98,7 @@ class TextDetector(object):
         self.processed_text = None
         self.__texts = []
         self.__processed_texts = []
+        self._token_cache = TokenCache()
 
     def set_fuzziness_low_high_threshold(self, fuzziness):
         """
@@ -163,8 +170,7 @@ class TextDetector(object):
             self.__texts.append(text)
             self.__processed_texts.append(u' ' + text + u' ')
 
-    @staticmethod
-    def _get_substring_from_processed_text(text, matched_tokens):
+    def _get_substring_from_processed_text(self, text, matched_tokens):
         """
         Get part of original text that was detected as some entity value.
 
@@ -193,65 +199,11 @@ class TextDetector(object):
         we recover it from processed text
         """
 
-        def _get_tokens_and_indices(txt):
-            """
-            Args:
-                txt (str or unicode): text to get tokens from and indicies of those tokens in the given text
-
-            Returns:
-                tuple:
-                    list: containing tokens, direct results from tokenizer.tokenize
-                    list: containing (int, int) indicating start and end position of ith token (of first list)
-                          in given text
-
-            E.g.
-            In: text = u'i want to order 1 pc hot & crispy'
-            Out: ([u'i', u'want', u'to', u'order', u'1', u'pc', u'hot', u'crispy'],
-                  [(1, 2), (3, 7), (8, 10), (11, 16), (17, 18), (19, 21), (22, 25), (28, 34)])
-
-            """
-            txt = txt.rstrip() + ' __eos__'
-            processed_text_tokens = TOKENIZER.tokenize(txt)
-            processed_text_tokens_indices = []
-
-            offset = 0
-            for token in processed_text_tokens:
-                st = txt.index(token)
-                en = st + len(token)
-
-                # Small block to handle tricky cases like '(A B) C'
-                # It extends the previous token's end boundary if there are special characters except whitespace
-                # towards the end of previous token
-                prefix = txt[:en]
-                prefix_tokens = whitespace_tokenizer.tokenize(prefix)
-                if prefix and len(prefix_tokens) > 1 and prefix_tokens[0]:
-                    if processed_text_tokens_indices:
-                        s, e = processed_text_tokens_indices.pop()
-                        e += len(prefix_tokens[0])
-                        processed_text_tokens_indices.append((s, e))
-
-                txt = txt[en:]
-                processed_text_tokens_indices.append((offset + st, offset + en))
-                offset += en
-
-            # remove eos parts
-            processed_text_tokens.pop()
-            processed_text_tokens_indices.pop()
-
-            return processed_text_tokens, processed_text_tokens_indices
-
-        try:
-            n = len(matched_tokens)
-            tokens, indices = _get_tokens_and_indices(text)
-            for i in range(len(tokens) - n + 1):
-                if tokens[i:i + n] == matched_tokens:
-                    start = indices[i][0]
-                    end = indices[i + n - 1][1]
-                    return text[start:end]
-        except (ValueError, IndexError):
-            ner_logger.exception('Error getting original text (%s, %s)' % (matched_tokens, text))
-
-        return u' '.join(matched_tokens)
+        original_text = find_token_sequence(text, matched_tokens, aligned=self._token_cache.align(text))
+        if original_text is None:
+            ner_logger.debug('Could not find original text (%s, %s)' % (matched_tokens, text))
+            return u' '.join(matched_tokens)
+        return original_text
 
     def _process_es_result(self, entity_result, entity_list, text,
                            processed_text):
@@ -299,13 +251,13 @@ class TextDetector(object):
             exact_matches, fuzzy_variants = [], []
 
             for variant in variants_list:
-                if u' '.join(TOKENIZER.tokenize(variant)) in text:
+                if self._token_cache.normalize_variant(variant) in text:
                     exact_matches.append(variant)
                 else:
                     fuzzy_variants.append(variant)
 
-            exact_matches.sort(key=lambda s: len(TOKENIZER.tokenize(s)), reverse=True)
-            fuzzy_variants.sort(key=lambda s: len(TOKENIZER.tokenize(s)), reverse=True)
+            exact_matches.sort(key=lambda s: len(self._token_cache.tokenize_variant(s)), reverse=True)
+            fuzzy_variants.sort(key=lambda s: len(self._token_cache.tokenize_variant(s)), reverse=True)
 
             variants_list = exact_matches + fuzzy_variants
             for variant in variants_list:
@@ -315,13 +267,10 @@ class TextDetector(object):
                 if original_text:
                     value_final_list.append(variants_to_values[variant])
                     original_final_list.append(original_text)
-                    boundary_punct_pattern = re.compile(
-                        r'(^[{0}]+)|([{0}]+$)'.format(re.escape(string.punctuation)))
-                    original_text_ = boundary_punct_pattern.sub("", original_text)
+                    original_text_ = _BOUNDARY_PUNCT_PATTERN.sub("", original_text)
 
-                    _pattern = re.compile(r'\b%s\b' % re.escape(original_text_), flags=_re_flags)
                     tag = '__' + each_key + '__'
-                    _processed_text = _pattern.sub(tag, _processed_text)
+                    _processed_text = replace_words(_processed_text, original_text_, tag)
 
             value_final_list_.append(value_final_list)
             original_final_list_.append(original_final_list)
@@ -372,7 +321,7 @@ class TextDetector(object):
 
         # pre-process text
         self._process_text(texts)
-        texts = [u' '.join(TOKENIZER.tokenize(processed_text)) for
+        texts = [u' '.join(self._token_cache.tokenize(processed_text)) for
                  processed_text in self.__processed_texts]
 
         # fetch ES datastore search result
@@ -416,7 +365,7 @@ class TextDetector(object):
 
         self._process_text(messages)
 
-        texts = [u' '.join(TOKENIZER.tokenize(processed_text)) for
+        texts = [u' '.join(self._token_cache.tokenize(processed_text)) for
                  processed_text in self.__processed_texts]
 
         entity_list = list(self.entities_dict)
@@ -442,7 +391,7 @@ class TextDetector(object):
                                                   entity_list=entity_list,
                                                   text=text, processed_text=processed_text)
             final_list.append(result_list)
-        ner_logger.debug(f'[bulk_text_detection_with_variants] final_list: {final_list}')
+        payload_logger.debug('[bulk_text_detection_with_variants] final_list', final_list)
         return final_list
 
     def _get_entity_substring_from_text(self, text, variant, entity_name):
@@ -466,8 +415,8 @@ class TextDetector(object):
               >>> text_detector._get_entity_substring_from_text(variant='delhi')
               'delehi'
         """
-        variant_tokens = TOKENIZER.tokenize(variant)
-        text_tokens = TOKENIZER.tokenize(text)
+        variant_tokens = self._token_cache.tokenize_variant(variant)
+        text_tokens = self._token_cache.tokenize(text)
         original_text_tokens = []
         variant_token_i = 0
         for text_token in text_tokens:
@@ -617,7 +566,8 @@ class TextDetector(object):
         """
 
         res_list = self._get_single_text_detection_with_variants(message)
-        ner_logger.info(f"[detect] method res_list - {res_list}")
+        payload_logger.info('[detect] method res_list', res_list,
+                            full=payload_logger.debug_entities_in(self.entities_dict))
         data_list = []
 
         for index, res in enumerate(res_list):
@@ -669,7 +619,8 @@ class TextDetector(object):
 
                 entities[entity] = out
             data_list.append(entities)
-        ner_logger.info(f"[detect] method data_list - {data_list}")
+        payload_logger.info('[detect] method data_list', data_list,
+                            full=payload_logger.debug_entities_in(self.entities_dict))
         return data_list
 
     def detect_bulk(self, messages=None, **kwargs):
@@ -729,7 +680,8 @@ class TextDetector(object):
         """
 
         res_list = self._get_bulk_text_detection_with_variants(messages)
-        ner_logger.info(f"[detect_bulk] method res_list - {res_list}")
+        payload_logger.info('[detect_bulk] method res_list', res_list,
+                            full=payload_logger.debug_entities_in(self.entities_dict))
         data_list = []
 
         for index, res in enumerate(res_list):
@@ -771,7 +723,8 @@ class TextDetector(object):
                 entities[entity] = out
             data_list.append(entities)
 
-        ner_logger.info(f"[detect_bulk] method data_list - {data_list}")
+        payload_logger.info('[detect_bulk] method data_list', data_list,
+                            full=payload_logger.debug_entities_in(self.entities_dict))
         return data_list
 
     @staticmethod
@@ -4,6 +4,7 @@ import json
 import six
 
 from chatbot_ner.config import ner_logger
+from chatbot_ner.payload_logging import payload_logger
 from language_utilities.constant import ENGLISH_LANG
 from ner_constants import (DATASTORE_VERIFIED, MODEL_VERIFIED,
                            FROM_FALLBACK_VALUE, ORIGINAL_TEXT, ENTITY_VALUE, DETECTION_METHOD,
@@ -72,16 +73,18 @@ def get_detection(message, entity_dict, bot_message=None, language=ENGLISH_LANG,
 
         detected entity output
     """
-    ner_logger.debug(f'[get_detection] message: {message}')
+    payload_logger.debug('[get_detection] message', message)
     text_detector = TextDetector(entity_dict=entity_dict, source_language_script=language,
                                  target_language_script=target_language_script)
     if isinstance(message, six.string_types):
         entity_output = text_detector.detect(message=message,
                                              bot_message=bot_message)
-        ner_logger.info(f'[Single Message Detection] Entity Output {entity_output}')
+        payload_logger.info('[Single Message Detection] Entity Output', entity_output,
+                            full=payload_logger.debug_entities_in(entity_dict))
     elif isinstance(message, (list, tuple)):
         entity_output = text_detector.detect_bulk(messages=message)
-        ner_logger.info(f'[Multiple Message Detection] Entity Output {entity_output}')
+        payload_logger.info('[Multiple Message Detection] Entity Output', entity_output,
+                            full=payload_logger.debug_entities_in(entity_dict))
     else:
         raise TypeError('`message` argument must be either of type `str`, `unicode`, `list` or `tuple`.')
 
@@ -161,12 +164,12 @@ def get_text_entity_detection_data(request):
     """
     request_data = json.loads(request.body)
     messages = request_data.get("messages", [])
-    ner_logger.debug(f"Request message data {messages}")
+    payload_logger.debug('Request message data', messages)
     bot_message = request_data.get("bot_message")
     entities = request_data.get("entities", {})
     target_language_script = request_data.get('language_script') or ENGLISH_LANG
     source_language = request_data.get('source_language') or ENGLISH_LANG
-    ner_logger.info(f"Request entity data {entities}")
+    payload_logger.info('Request entity data', entities, full=payload_logger.debug_entities_in(entities))
 
     data = []
 
@@ -193,12 +196,12 @@ def get_text_entity_detection_data(request):
         # get detection for text entities which has ignore_message flag
         if fallback_value_entities:
             output = get_output_for_fallback_entities(fallback_value_entities, source_language)
-            ner_logger.debug(f'[output_for_fallback_entities] output: {output}')
+            payload_logger.debug('[output_for_fallback_entities] output', output)
             data[0]["entities"].update(output)
 
         # get detection for text entities
         if text_value_entities:
-            ner_logger.debug(f'[output_for_fallback_entities] text_value_entities {text_value_entities}')
+            payload_logger.debug('[output_for_fallback_entities] text_value_entities', text_value_entities)
             output = get_detection(message=message_str, entity_dict=text_value_entities,
                                    structured_value=None, bot_message=bot_message,
                                    language_script=source_language,
@@ -215,7 +218,7 @@ def get_text_entity_detection_data(request):
         ner_logger.debug("No valid message provided")
         raise InvalidTextRequest(f"Key `messages` is required to be a non-empty List[str], "
                                  f"but got a list with length {message_len}")
-    ner_logger.debug(f"Final data {data}")
+    payload_logger.debug('Final data', data)
     return data
 
 
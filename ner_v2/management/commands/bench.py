@@ -0,0 +1,52 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from chatbot_ner.bench import BENCH_SUITES, find_regressions, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark detectors on the test corpora, optionally comparing the results against a baseline run'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--suites', nargs='+', choices=list(BENCH_SUITES), default=None,
+                            help='suites to run, defaults to all')
+        parser.add_argument('--languages', nargs='+', default=None,
+                            help='only run cases in these languages, defaults to all')
+        parser.add_argument('--repeat', type=int, default=5, help='timed passes over the cases, default 5')
+        parser.add_argument('--limit', type=int, default=None, help='max cases per suite and language')
+        parser.add_argument('--no-memory', action='store_true', help='skip the peak memory measurement pass')
+        parser.add_argument('--output', default=None, help='path to write the results to as JSON')
+        parser.add_argument('--baseline', default=None, help='path to JSON results of a previous run to compare to')
+        parser.add_argument('--max-regression', type=float, default=0.2,
+                            help='allowed relative change for the worse of p50, p95 and msgs/sec compared to the '
+                                 'baseline, default 0.2')
+
+    def handle(self, *args, **options):
+        results = run_benchmarks(suites=options['suites'], languages=options['languages'],
+                                 repeat=options['repeat'], limit=options['limit'],
+                                 measure_memory=not options['no_memory'])
+
+        self.stdout.write('{:<14} {:<6} {:>5} {:>7} {:>9} {:>9} {:>9} {:>10} {:>10}'.format(
+            'suite', 'lang', 'msgs', 'errors', 'p50 ms', 'p95 ms', 'p99 ms', 'msgs/sec', 'peak KB'))
+        for result in results['results']:
+            self.stdout.write('{suite:<14} {language:<6} {messages:>5} {errors:>7} {p50_ms:>9.3f} {p95_ms:>9.3f} '
+                              '{p99_ms:>9.3f} {msgs_per_sec:>10.1f} {peak_memory_kb!s:>10}'.format(**result))
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(results, f, indent=2)
+            self.stdout.write('Wrote results to {}'.format(options['output']))
+
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+            regressions = find_regressions(baseline, results, max_regression=options['max_regression'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(
+                    '{suite} ({language}) {metric}: {baseline:.3f} -> {current:.3f} ({change:+.0%})'.format(
+                        **regression)))
+            if regressions:
+                raise CommandError('{} metrics regressed by more than {:.0%}'.format(len(regressions),
+                                                                                      options['max_regression']))
+            self.stdout.write(self.style.SUCCESS('No regressions compared to {}'.format(options['baseline'])))
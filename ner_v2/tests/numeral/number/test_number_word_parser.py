@@ -0,0 +1,194 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import io
+import os
+import random
+import re
+
+import yaml
+from django.test import TestCase
+from six.moves import range
+
+from ner_v2.constant import LANGUAGE_DATA_DIRECTORY
+from ner_v2.detectors.numeral.number.standard_number_detector import NumberDetector
+from ner_v2.detectors.numeral.utils import NumberWordParser
+
+NUMBER_DETECTORS_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))), 'detectors', 'numeral', 'number')
+YAML_TESTS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'en', 'number_ner_tests.yaml')
+
+
+def _reference_get_number_from_number_word(text, number_word_dict):
+    """
+    get_number_from_number_word as it was before NumberWordParser, kept to check the parser against it.
+    Detect numbers from numerals text
+    Args:
+        text (str): text to detect number from number words
+        number_word_dict (dict): dict containing scale and increment of each number word
+    Returns:
+        detected_number_list (list): list of numeric value detected from text
+        detected_original_text_list (list): list of original text for numeric value detected
+    Examples:
+        [In]  >>  number_word_dict = {'one': NumberVariant(scale=1, increment=1),
+                                      'two': NumberVariant(scale=1, increment=2),
+                                      'three': NumberVariant(scale=1, increment=3),
+                                      'thousand': NumberVariant(scale=1000, increment=0),
+                                      'four': NumberVariant(scale=1, increment=4),
+                                      'hundred': NumberVariant(scale=100, increment=0)
+                                      }
+        [In]  >>  _get_number_from_numerals('one thousand two',  number_word_dict)
+        [Out] >> (['1002'], ['one thousand two'])
+        [In]  >> _get_number_from_numerals('one two three',  number_word_dict)
+        [Out] >> (['1', '2', '3'], ['one', 'two', 'three'])
+        [In]  >> _get_number_from_numerals('two hundred three four hundred three',  number_word_dict)
+        [Out] >> (['103', '403'], ['one hundred three', 'four hundred three'])
+    """
+    # FIXME: conversion from float -> int is lossy, consider using Decimal class
+    detected_number_list = []
+    detected_original_text_list = []
+
+    # exclude single char scales word from word number map dict
+    number_word_dict = {word: number_map for word, number_map in number_word_dict.items()
+                        if (len(word) > 1 and number_map.increment == 0) or number_map.scale == 1}
+    text = text.strip()
+    if not text:
+        return detected_number_list, detected_original_text_list
+
+    whitespace_pattern = re.compile(r'(\s+)', re.UNICODE)
+    parts = []
+    _parts = whitespace_pattern.split(u' ' + text)
+    for i in range(2, len(_parts), 2):
+        parts.append(_parts[i - 1] + _parts[i])
+
+    current = result = 0
+    current_text, result_text = '', ''
+    on_number = False
+    prev_digit_len = 0
+    prev_scale = 0
+    is_double_or_triple = False
+
+    for part in parts:
+        word = part.strip()
+
+        if word not in number_word_dict:
+            if on_number:
+                result_text += current_text
+                original = result_text.strip()
+                number_detected = result + current
+                if float(number_detected).is_integer():
+                    number_detected = int(number_detected)
+                detected_number_list.append(number_detected)
+                detected_original_text_list.append(original)
+
+            result = current = 0
+            result_text, current_text = '', ''
+            on_number = False
+        else:
+            scale, increment = number_word_dict[word].scale, number_word_dict[word].increment
+            if scale % 100 == 11:
+                is_double_or_triple = True
+                prev_scale = scale
+                continue
+            if prev_scale > 1 and not prev_scale < scale:
+                result += current
+                result_text += current_text
+                current = 0
+                current_text = ''
+
+            digit_len = max(len(str(int(increment))), len(str(scale)))
+
+            if digit_len == prev_digit_len:
+                if on_number:
+                    result_text += current_text
+                    original = result_text.strip()
+                    number_detected = result + current
+                    if float(number_detected).is_integer():
+                        number_detected = int(number_detected)
+                    detected_number_list.append(number_detected)
+                    detected_original_text_list.append(original)
+
+                result = current = 0
+                result_text, current_text = '', ''
+
+            if digit_len > prev_digit_len:
+                if on_number and prev_scale == scale:
+                    current = current * (10 ** digit_len)
+
+            if is_double_or_triple:
+                scale = prev_scale
+                current = increment
+                increment = 0
+                is_double_or_triple = False
+            # handle where only scale is mentioned without unit, for ex - thousand(for 1000), hundred(for 100)
+            current = 1 if (scale > 1 and current == 0 and increment == 0) else current
+            current = current * scale + increment
+            current_text += part
+            if scale > 1:
+                result += current
+                result_text += current_text
+                current = 0
+                current_text = ''
+            on_number = True
+            prev_digit_len = digit_len
+            prev_scale = scale
+
+    if on_number:
+        result_text += current_text
+        original = result_text.strip()
+        number_detected = result + current
+        if float(number_detected).is_integer():
+            number_detected = int(number_detected)
+        detected_number_list.append(number_detected)
+        detected_original_text_list.append(original)
+
+    return detected_number_list, detected_original_text_list
+
+
+class NumberWordParserTest(TestCase):
+
+    def setUp(self):
+        self.number_word_maps = {}
+        for language in sorted(os.listdir(NUMBER_DETECTORS_DIRECTORY)):
+            data_directory_path = os.path.join(NUMBER_DETECTORS_DIRECTORY, language, LANGUAGE_DATA_DIRECTORY)
+            if os.path.isdir(data_directory_path):
+                detector = NumberDetector(entity_name='number', data_directory_path=data_directory_path)
+                self.number_word_maps[language] = detector.numbers_word_map
+
+    def assert_same_as_reference(self, parser, number_word_map, text):
+        parsed_numbers = parser.parse(text)
+        numbers, original_texts = _reference_get_number_from_number_word(text, number_word_map)
+        self.assertEqual([parsed.value for parsed in parsed_numbers], numbers, repr(text))
+        self.assertEqual([parsed.original_text for parsed in parsed_numbers], original_texts, repr(text))
+        for parsed in parsed_numbers:
+            start, end = parsed.span
+            # original text is only discontiguous when a double/triple word is skipped in the middle of it
+            if u' '.join(text[start:end].split()) == u' '.join(parsed.original_text.split()):
+                self.assertEqual(text[start:end], parsed.original_text, repr(text))
+
+    def test_parse_examples(self):
+        parser = NumberWordParser(self.number_word_maps['en'])
+        self.assertEqual([(parsed.value, parsed.original_text, parsed.span)
+                          for parsed in parser.parse(u'one thousand  two and three hundred')],
+                         [(1002, u'one thousand  two', (0, 17)), (300, u'three hundred', (22, 35))])
+        parser = NumberWordParser(self.number_word_maps['hi'])
+        self.assertEqual([(parsed.value, parsed.original_text) for parsed in parser.parse(u'मुझे दो सौ पचास रुपये दो')],
+                         [(250, u'दो सौ पचास'), (2, u'दो')])
+
+    def test_parse_matches_reference_on_yaml_messages(self):
+        parser = NumberWordParser(self.number_word_maps['en'])
+        with io.open(YAML_TESTS_PATH, 'r', encoding='utf-8') as f:
+            test_data = yaml.load(f, Loader=yaml.SafeLoader)
+        for testcase in test_data['tests']['en']:
+            for numeral_text in re.split(r'[\-\:]', testcase['message'].lower()):
+                self.assert_same_as_reference(parser, self.number_word_maps['en'], numeral_text)
+
+    def test_parse_matches_reference_on_random_texts(self):
+        rng = random.Random(20340)
+        for language, number_word_map in self.number_word_maps.items():
+            parser = NumberWordParser(number_word_map)
+            words = sorted(number_word_map) + [u'apple', u'rs', u'and', u'5']
+            for _ in range(300):
+                separators = [rng.choice([u' ', u'  ', u'\t', u' \n ']) for _ in range(8)]
+                text = u''.join(rng.choice(words) + separator for separator in separators[:rng.randint(0, 8)])
+                self.assert_same_as_reference(parser, number_word_map, rng.choice([u'', u' ']) + text)
@@ -0,0 +1,72 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import threading
+
+import mock
+from django.test import TestCase
+
+from lib.nlp.text_normalization import resolve_numerals
+from ner_v2.detectors import language_data
+from ner_v2.detectors.numeral.number import number_detection, standard_number_detector
+from ner_v2.detectors.numeral.number.number_detection import NumberDetector, get_shared_number_detector
+from ner_v2.detectors.numeral.number_range.number_range_detection import NumberRangeDetector
+from ner_v2.detectors.pattern.phone_number.phone_number_detection import ChinesePhoneDetector
+
+
+class SharedNumberDetectorTest(TestCase):
+
+    def detect_all(self):
+        return (
+            NumberDetector(entity_name='number', language='en').detect_entity(u'i want two thousand rupees'),
+            NumberRangeDetector(entity_name='number_range', language='en').detect_entity(u'between 2 to 3 pcs'),
+            ChinesePhoneDetector(entity_name='phone_number', language='zh-TW').detect_entity(u'電話 0912-345-678'),
+            resolve_numerals(u'my pin is one two three', language='en'),
+        )
+
+    def test_no_csv_reads_after_warm_up(self):
+        expected = self.detect_all()
+        with mock.patch.object(language_data, 'parse_csv', wraps=language_data.parse_csv) as parse_csv, \
+                mock.patch.object(language_data, 'open', create=True, side_effect=open) as open_, \
+                mock.patch.object(standard_number_detector, 'load_csv_records',
+                                  wraps=standard_number_detector.load_csv_records) as load_csv_records:
+            self.assertEqual(self.detect_all(), expected)
+        parse_csv.assert_not_called()
+        open_.assert_not_called()
+        load_csv_records.assert_not_called()
+
+    def test_shared_detector_is_reused_and_keeps_no_state(self):
+        shared = get_shared_number_detector(language='en', unit_type='currency')
+        self.assertIs(get_shared_number_detector(language='en', unit_type='currency'), shared)
+        self.assertIsNot(get_shared_number_detector(language='en'), shared)
+
+        result = shared.detect_entity(u'i need 1 thousand rupees', entity_name='amount')
+        self.assertEqual(result.numbers, [{'value': '1000', 'unit': 'rupees'}])
+        self.assertEqual(result.original_texts, ['1 thousand rupees'])
+        self.assertEqual(result.tagged_text, u' i need __amount__ ')
+
+    def test_shared_detector_reuses_number_detector_per_entity(self):
+        shared = number_detection.SharedNumberDetector(language='en')
+        with mock.patch.object(NumberDetector, '__init__', autospec=True,
+                               side_effect=NumberDetector.__init__) as number_detector_init:
+            self.assertEqual(shared.detect_entity(u'25 apples', max_digit=1).numbers, [])
+            self.assertEqual(shared.detect_entity(u'25 apples').numbers, [{'value': '25', 'unit': None}])
+            result = shared.detect_entity(u'2 apples', entity_name='count')
+        self.assertEqual(result.tagged_text, u' __count__ apples ')
+        self.assertEqual(number_detector_init.call_count, 2)
+
+    def test_shared_detector_from_many_threads(self):
+        texts = [u'{} apples'.format(i) for i in range(1, 41)]
+        results = {}
+
+        def detect(text):
+            results[text] = get_shared_number_detector(language='en').detect_entity(text).numbers
+
+        with mock.patch.object(number_detection, '_shared_number_detectors', {}):
+            threads = [threading.Thread(target=detect, args=(text,)) for text in texts]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        for i, text in enumerate(texts, start=1):
+            self.assertEqual(results[text], [{'value': str(i), 'unit': None}])
@@ -0,0 +1,59 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import io
+import os
+
+import mock
+import yaml
+from django.test import SimpleTestCase
+
+from ner_v2.detectors.pattern.phone_number import phone_number_detection
+from ner_v2.detectors.pattern.phone_number.phone_number_detection import ChinesePhoneDetector, PhoneDetector
+
+
+class PhoneNumberBulkDetectionTest(SimpleTestCase):
+
+    def setUp(self):
+        yaml_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'phone_number_ner_tests.yaml')
+        test_data = yaml.load(io.open(yaml_path, 'r', encoding='utf-8'), Loader=yaml.SafeLoader)
+        self.testcases = [testcase for testcases in test_data['tests'].values() for testcase in testcases]
+
+    def _assert_bulk_matches_single(self, locale):
+        texts = [testcase['message'] for testcase in self.testcases] + [u'', u'call me at 123', u'1 2 3 4 5 6 7 8']
+        detector = PhoneDetector(entity_name='phone_number', locale=locale)
+        expected = ([], [])
+        for text in texts:
+            phone_numbers, original_texts = detector.detect_entity(text)
+            expected[0].append(phone_numbers)
+            expected[1].append(original_texts)
+        self.assertEqual(detector.detect_entity_bulk(texts), expected)
+
+    def test_bulk_detection_matches_single_message_detection(self):
+        for locale in ['en-IN', 'en-US', 'en-GB']:
+            self._assert_bulk_matches_single(locale)
+
+    def test_bulk_detection_in_process_pool_matches_single_message_detection(self):
+        with mock.patch.object(phone_number_detection, 'PHONE_BULK_PROCESSES', 2), \
+                mock.patch.object(phone_number_detection, 'PHONE_BULK_PROCESS_MIN_MESSAGES', 1), \
+                mock.patch.object(phone_number_detection, '_process_pool', None):
+            self._assert_bulk_matches_single('en-IN')
+            phone_number_detection._process_pool.shutdown()
+
+    def test_texts_with_too_few_digits_skip_matcher(self):
+        detector = PhoneDetector(entity_name='phone_number', locale='en-IN')
+        with mock.patch.object(phone_number_detection.phonenumbers, 'PhoneNumberMatcher',
+                               wraps=phone_number_detection.phonenumbers.PhoneNumberMatcher) as matcher:
+            detector.detect_entity_bulk([u'hello', u'my pin is 1234', u'call 9820334455'])
+        self.assertEqual(matcher.call_count, 1)
+        self.assertTrue(ChinesePhoneDetector(entity_name='phone_number').may_contain_phone_number(u'零九一二'))
+
+    def test_region_metadata_is_resolved_once_per_locale(self):
+        with mock.patch.object(phone_number_detection, '_locale_regions', {}):
+            with mock.patch.object(phone_number_detection.phonenumbers.PhoneMetadata, 'metadata_for_region',
+                                   wraps=phone_number_detection.phonenumbers.PhoneMetadata.metadata_for_region) \
+                    as metadata_for_region:
+                PhoneDetector(entity_name='phone_number', locale='en-US')
+                PhoneDetector(entity_name='phone_number', locale='en-US')
+            self.assertEqual(metadata_for_region.call_count, 1)
+            self.assertEqual(phone_number_detection._locale_regions, {'en-US': ('US', 1)})
@@ -9,6 +9,7 @@ import pytz
 from django.test import TestCase
 
 from ner_v2.detectors.temporal.date.date_detection import DateAdvancedDetector
+from ner_v2.detectors.temporal.utils import Clock
 
 
 class DateDetectionTest(TestCase):
@@ -273,4 +274,25 @@ class DateDetectionTest(TestCase):
             'value': {'dd': day1, 'mm': month, 'yy': year1, 'type': 'date'}
         }, date_dicts)
 
-        self.assertEqual(original_texts.count(message.lower()), 1)
\ No newline at end of file
+        self.assertEqual(original_texts.count(message.lower()), 1)
+
+    def test_en_date_detection_parses_each_substring_once(self):
+        """
+        Range pairs share their middle part, it should be parsed by the language detector only once
+        """
+        message = 'go to goa to mumbai on monday to friday'
+        clock = Clock(timezone='UTC', now=datetime.datetime(2020, 1, 18, 10, 30))
+        date_detector_object = DateAdvancedDetector(entity_name=self.entity_name, language='en', clock=clock)
+        with mock.patch.object(date_detector_object.date_detector_object, 'detect_entity',
+                               wraps=date_detector_object.date_detector_object.detect_entity) as detect_entity:
+            date_dicts, original_texts = date_detector_object.detect_entity(message)
+
+        self.assertEqual(original_texts, ['monday', 'friday'])
+        self.assertEqual([(date_dict['value']['dd'], date_dict['start_range'], date_dict['end_range'])
+                          for date_dict in date_dicts], [(20, True, False), (24, False, True)])
+        parsed_texts = [call[0][0].strip() for call in detect_entity.call_args_list]
+        self.assertEqual(len(parsed_texts), len(set(parsed_texts)))
+        self.assertEqual(date_detector_object.date_detector_calls, len(parsed_texts))
+
+        date_detector_object.detect_entity(message)
+        self.assertEqual(date_detector_object.date_detector_calls, len(parsed_texts))
@@ -0,0 +1,60 @@
+# coding=utf-8
+from __future__ import absolute_import
+
+import datetime
+
+import mock
+import pytz
+from django.test import SimpleTestCase
+
+from ner_v2.detectors.temporal import utils
+from ner_v2.detectors.temporal.date.date_detection import DateAdvancedDetector
+from ner_v2.detectors.temporal.time.time_detection import TimeDetector
+from ner_v2.detectors.temporal.utils import Clock, get_timezone
+
+
+class ClockTest(SimpleTestCase):
+    now = datetime.datetime(2019, 12, 31, 22, 30)
+
+    def test_fixed_now_makes_relative_dates_reproducible(self):
+        clock = Clock(timezone='Asia/Kolkata', now=self.now)
+        texts = [('en', 'book it for tomorrow'), ('hi', u'कल का टिकट बुक करो'), ('bn', u'আগামীকাল')]
+        for language, text in texts:
+            detector = DateAdvancedDetector(entity_name='date', language=language, clock=clock)
+            date_dicts, _ = detector.detect_entity(text)
+            value = date_dicts[0]['value']
+            self.assertEqual((value['dd'], value['mm'], value['yy']), (1, 1, 2020), language)
+
+    def test_nested_detectors_share_one_clock(self):
+        with mock.patch.object(utils, 'datetime', wraps=datetime.datetime) as datetime_:
+            date_detector = DateAdvancedDetector(entity_name='date', timezone='Asia/Kolkata')
+            time_detector = TimeDetector(entity_name='time', timezone='Asia/Kolkata')
+            time_detector.detect_entity('at 5:30 and 6:30')
+        self.assertEqual(datetime_.now.call_count, 2)
+        self.assertIs(date_detector.date_detector_object.language_date_detector.clock, date_detector.clock)
+        self.assertEqual(date_detector.date_detector_object.language_date_detector.now_date,
+                         date_detector.date_detector_object.now_date)
+        self.assertIs(time_detector.language_time_detector.clock, time_detector.clock)
+
+    def test_time_meridiem_uses_clock(self):
+        for hour, meridiem in [(13, 'pm'), (3, 'am')]:
+            clock = Clock(timezone='UTC', now=datetime.datetime(2020, 1, 1, hour, 0))
+            time_dicts, _ = TimeDetector(entity_name='time', clock=clock).detect_entity('call me at 5:30')
+            self.assertEqual(time_dicts, [{'hh': 5, 'mm': 30, 'nn': meridiem, 'tz': 'UTC'}])
+
+    def test_now_without_timezone_is_naive_local_time(self):
+        clock = Clock(now=pytz.UTC.localize(self.now))
+        self.assertEqual(clock.now(), pytz.UTC.localize(self.now).astimezone(tz=None).replace(tzinfo=None))
+        self.assertEqual(clock.now(get_timezone('Asia/Kolkata')).hour, 4)
+
+    def test_timezones_are_cached(self):
+        with mock.patch.object(utils, '_timezone_cache', utils.collections.OrderedDict()), \
+                mock.patch.object(utils, 'TIMEZONE_CACHE_SIZE', 2):
+            with mock.patch.object(utils.pytz, 'timezone', wraps=pytz.timezone) as timezone_:
+                self.assertIs(get_timezone('Asia/Kolkata'), get_timezone('Asia/Kolkata'))
+                self.assertIsNone(get_timezone('Mars/Olympus'))
+                self.assertIsNone(get_timezone('Mars/Olympus'))
+                self.assertEqual(get_timezone('Mars/Olympus', ignore_errors=True), pytz.UTC)
+                self.assertEqual(timezone_.call_count, 2)
+                get_timezone('UTC')
+            self.assertEqual(list(utils._timezone_cache), ['Mars/Olympus', 'UTC'])
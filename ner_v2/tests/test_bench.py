@@ -0,0 +1,68 @@
+import json
+import os
+import shutil
+import tempfile
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase
+from six import StringIO
+
+from chatbot_ner import bench
+
+
+class BenchTest(SimpleTestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(bench.percentile(values, 0.5), 50)
+        self.assertEqual(bench.percentile(values, 0.99), 99)
+        self.assertEqual(bench.percentile([3.0], 0.95), 3.0)
+        self.assertEqual(bench.percentile([1.0, 2.0], 0.0), 1.0)
+
+    def test_suites_detect_corpora_without_errors(self):
+        results = bench.run_benchmarks(suites=['number', 'number_range', 'time', 'phone_number'], repeat=1, limit=3)
+        self.assertEqual({result['suite'] for result in results['results']},
+                         {'number', 'number_range', 'time', 'phone_number'})
+        for result in results['results']:
+            self.assertEqual(result['errors'], 0, result['error'])
+            self.assertLessEqual(result['messages'], 3)
+            self.assertLessEqual(result['p50_ms'], result['p95_ms'])
+            self.assertLessEqual(result['p95_ms'], result['p99_ms'])
+            self.assertGreater(result['msgs_per_sec'], 0)
+            self.assertIsNotNone(result['peak_memory_kb'])
+
+    def test_find_regressions(self):
+        baseline = {'results': [{'suite': 'time', 'language': 'en', 'p50_ms': 1.0, 'p95_ms': 2.0,
+                                 'msgs_per_sec': 1000.0}]}
+        current = {'results': [{'suite': 'time', 'language': 'en', 'p50_ms': 1.1, 'p95_ms': 3.0,
+                                'msgs_per_sec': 700.0},
+                               {'suite': 'time', 'language': 'hi', 'p50_ms': 9.0, 'p95_ms': 9.0,
+                                'msgs_per_sec': 1.0}]}
+        regressions = bench.find_regressions(baseline, current, max_regression=0.2)
+        self.assertEqual([(regression['metric'], round(regression['change'], 2)) for regression in regressions],
+                         [('p95_ms', 0.5), ('msgs_per_sec', 0.3)])
+
+    def test_bench_command_writes_json_and_checks_baseline(self):
+        output_path = os.path.join(self.tmp_dir, 'bench.json')
+        call_command('bench', suites=['phone_number'], languages=['en'], repeat=1, limit=2, no_memory=True,
+                     output=output_path, stdout=StringIO())
+        with open(output_path) as f:
+            results = json.load(f)
+        self.assertEqual([(result['suite'], result['language'], result['messages'])
+                          for result in results['results']], [('phone_number', 'en', 2)])
+        self.assertIsNone(results['results'][0]['peak_memory_kb'])
+
+        for result in results['results']:
+            result['p50_ms'] = result['p95_ms'] = 1e-9
+        with open(output_path, 'w') as f:
+            json.dump(results, f)
+        with self.assertRaises(CommandError):
+            call_command('bench', suites=['phone_number'], languages=['en'], repeat=1, limit=2, no_memory=True,
+                         baseline=output_path, stdout=StringIO())
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import structlog
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from django.views.decorators.csrf import csrf_exempt
+
+from chatbot_ner import urls_async, urls_detection
+from chatbot_ner.config import ner_logger
+from chatbot_ner.executor import BoundedExecutor, ExecutorQueueFullException, async_view
+
+
+class BoundedExecutorTest(SimpleTestCase):
+
+    async def test_run(self):
+        executor = BoundedExecutor(max_workers=2, max_queue=2)
+        self.assertEqual(await executor.run(sum, [1, 2], start=3), 6)
+        stats = executor.stats()
+        self.assertEqual((stats['completed'], stats['running'], stats['queued'], stats['rejected']), (1, 0, 0, 0))
+
+    async def test_calls_beyond_queue_are_rejected(self):
+        executor = BoundedExecutor(max_workers=1, max_queue=1)
+        release = threading.Event()
+        calls = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        self.assertEqual((executor.stats()['running'], executor.stats()['queued']), (1, 1))
+        with self.assertRaises(ExecutorQueueFullException):
+            await executor.run(release.wait)
+        release.set()
+        await asyncio.gather(*calls)
+        stats = executor.stats()
+        self.assertEqual((stats['completed'], stats['rejected'], stats['max_queued']), (2, 1, 1))
+
+    async def test_async_view(self):
+        executor = BoundedExecutor(max_workers=1, max_queue=0)
+        release = threading.Event()
+
+        @csrf_exempt
+        def view(request):
+            release.wait()
+            return HttpResponse(threading.current_thread().name)
+
+        wrapped_view = async_view(view, executor=executor)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped_view))
+        self.assertTrue(wrapped_view.csrf_exempt)
+        request = RequestFactory().get('/v2/date/')
+        first = asyncio.ensure_future(wrapped_view(request))
+        await asyncio.sleep(0.05)
+        self.assertEqual((await wrapped_view(request)).status_code, 503)
+        release.set()
+        response = await first
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.content.decode(), threading.current_thread().name)
+
+    async def test_async_view_binds_request_id_on_executor_thread(self):
+        def view(request):
+            return HttpResponse(structlog.get_context(ner_logger.bind()).get('request_id'))
+
+        wrapped_view = async_view(view, executor=BoundedExecutor(max_workers=1, max_queue=0))
+        response = await wrapped_view(RequestFactory().get('/v2/date/', HTTP_X_REQUEST_ID='abc'))
+        self.assertEqual(response.content, b'abc')
+
+    def test_all_detection_routes_are_async(self):
+        self.assertEqual([str(urlpattern.pattern) for urlpattern in urls_async.urlpatterns[:-1]],
+                         [str(urlpattern.pattern) for urlpattern in urls_detection.urlpatterns])
+        for urlpattern in urls_async.urlpatterns:
+            self.assertTrue(asyncio.iscoroutinefunction(urlpattern.callback))
@@ -0,0 +1,76 @@
+from __future__ import absolute_import
+
+import math
+import os
+import pickle
+import shutil
+import tempfile
+
+from django.test import TestCase
+from mock import patch
+
+from ner_v2.detectors import language_data
+
+
+class TestLanguageData(TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir)
+
+    def test_parse_csv_infers_types_like_pandas(self):
+        content = (u'key,key,count,ratio,flag,meridiem\n'
+                   u'a|b,x,1,0.5,TRUE,NA\n'
+                   u'\n'
+                   u'১,y,2,,FALSE,am\n').encode('utf-8')
+        records = language_data.parse_csv(content)
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(list(records[0].keys()), ['key', 'key.1', 'count', 'ratio', 'flag', 'meridiem'])
+        self.assertEqual(records[0]['count'], 1)
+        self.assertIsInstance(records[0]['count'], int)
+        self.assertEqual(records[0]['ratio'], 0.5)
+        self.assertTrue(math.isnan(records[1]['ratio']))
+        self.assertIs(records[0]['flag'], True)
+        self.assertIs(records[1]['flag'], False)
+        self.assertTrue(math.isnan(records[0]['meridiem']))
+        self.assertEqual(records[1]['meridiem'], 'am')
+        # non ascii digits must stay strings
+        self.assertEqual(records[1]['key'], u'১')
+
+    def test_build_language_data_matches_csv_files(self):
+        artifact_path = os.path.join(self.tmp_dir, 'language_data.pickle')
+        count = language_data.build_language_data(artifact_path=artifact_path)
+        csv_paths = language_data.find_language_data_files()
+        self.assertEqual(count, len(csv_paths))
+
+        with open(artifact_path, 'rb') as f:
+            artifact = pickle.load(f)
+        self.assertEqual(artifact['version'], language_data.LANGUAGE_DATA_FORMAT_VERSION)
+        for csv_path in csv_paths:
+            with open(csv_path, 'rb') as f:
+                expected = language_data.parse_csv(f.read())
+            compiled = artifact['files'][language_data._relative_path(csv_path)]['records']
+            self.assertEqual(repr(compiled), repr(expected), csv_path)
+
+    def test_load_csv_records_falls_back_to_csv_when_stale(self):
+        csv_path = language_data.find_language_data_files()[0]
+        stale_records = [{'stale': True}]
+        artifact_files = {language_data._relative_path(csv_path): {'sha1': 'outdated', 'records': stale_records}}
+        with patch.object(language_data, '_artifact_files', artifact_files), \
+                patch.object(language_data, '_loaded_records', {}):
+            records = language_data.load_csv_records(csv_path)
+            self.assertNotEqual(records, stale_records)
+            self.assertIs(language_data.load_csv_records(csv_path), records)
+
+    def test_load_csv_records_uses_fresh_artifact(self):
+        csv_path = language_data.find_language_data_files()[0]
+        with open(csv_path, 'rb') as f:
+            sha1 = language_data._sha1(f.read())
+        compiled_records = [{'compiled': True}]
+        artifact_files = {language_data._relative_path(csv_path): {'sha1': sha1, 'records': compiled_records}}
+        with patch.object(language_data, '_artifact_files', artifact_files), \
+                patch.object(language_data, '_loaded_records', {}):
+            self.assertIs(language_data.load_csv_records(csv_path), compiled_records)
@@ -0,0 +1,46 @@
+from __future__ import absolute_import
+
+from django.test import SimpleTestCase
+from mock import patch
+
+from ner_v2.detectors import language_registry
+from ner_v2.detectors.numeral.number.number_detection import NumberDetector
+from ner_v2.detectors.numeral.number_range.number_range_detection import NumberRangeDetector
+from ner_v2.detectors.temporal.date import standard_date_regex
+from ner_v2.detectors.temporal.date.date_detection import DateAdvancedDetector, DateDetector
+from ner_v2.detectors.temporal.date.hi.date_detection import DateDetector as HindiDateDetector
+from ner_v2.detectors.temporal.time.time_detection import TimeDetector
+
+
+class TestLanguageRegistry(SimpleTestCase):
+
+    def test_language_modules_are_resolved(self):
+        self.assertIs(language_registry.get_language_detector_class(language_registry.DATE, 'hi'), HindiDateDetector)
+        self.assertIsNone(language_registry.get_language_detector_class(language_registry.DATE, 'bn'))
+        self.assertIsNone(language_registry.get_language_detector_class(language_registry.TIME, 'xx'))
+        self.assertIn('zh-TW', NumberDetector.get_supported_languages())
+        self.assertNotIn('zh-TW', DateAdvancedDetector.get_supported_languages())
+
+        self.assertIsInstance(DateDetector(entity_name='date', language='hi').language_date_detector,
+                              HindiDateDetector)
+        language_date_detector = DateDetector(entity_name='date', language='bn').language_date_detector
+        self.assertIs(type(language_date_detector), standard_date_regex.DateDetector)
+
+    def test_lookups_are_cached(self):
+        language_registry.warm_up_language_registry()
+        with patch.object(language_registry.importlib, 'import_module') as import_module, \
+                patch.object(language_registry.os, 'listdir') as listdir:
+            for detector_class, entity_name in ((DateAdvancedDetector, 'date'), (TimeDetector, 'time'),
+                                                (NumberDetector, 'number'), (NumberRangeDetector, 'number_range')):
+                for language in ['en', 'hi', 'bn', 'mr']:
+                    if language in detector_class.get_supported_languages():
+                        detector_class(entity_name=entity_name, language=language)
+        import_module.assert_not_called()
+        listdir.assert_not_called()
+
+    def test_warm_up_language_registry(self):
+        with patch.object(language_registry, '_language_detector_classes', {}):
+            language_modules = language_registry.warm_up_language_registry(languages=['en', 'bn'])
+            self.assertEqual(language_modules[language_registry.DATE], ['en'])
+            self.assertEqual(language_modules[language_registry.NUMBER], ['en'])
+            self.assertIn((language_registry.TIME, 'bn'), language_registry._language_detector_classes)
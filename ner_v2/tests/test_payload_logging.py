@@ -0,0 +1,43 @@
+import logging
+
+import mock
+from django.test import SimpleTestCase
+
+from chatbot_ner.payload_logging import PayloadLogger
+
+
+class PayloadLoggerTest(SimpleTestCase):
+
+    def setUp(self):
+        self.stdlib_logger = logging.getLogger('ner_v2.tests.payload_logging')
+        self.stdlib_logger.setLevel(logging.INFO)
+        self.logger = mock.Mock()
+
+    def _payload_logger(self, **kwargs):
+        return PayloadLogger(self.logger, 'ner_v2.tests.payload_logging', **kwargs)
+
+    def test_payload_is_not_formatted_if_level_is_disabled(self):
+        payload = mock.MagicMock()
+        self._payload_logger().debug('Finished date', payload)
+        payload.__str__.assert_not_called()
+        self.logger.log.assert_not_called()
+
+    def test_payload_is_logged_truncated(self):
+        self._payload_logger(max_chars=5).info('res_list', 'abcdefghij')
+        self.logger.log.assert_called_once_with(logging.INFO, 'res_list', payload='abcde... (10 chars)')
+
+    def test_sampling_is_deterministic_by_key(self):
+        payload_logger = self._payload_logger(sample_rate=0.5)
+        sampled = [payload_logger.is_sampled(key) for key in range(1000)]
+        self.assertEqual(sampled, [payload_logger.is_sampled(key) for key in range(1000)])
+        self.assertTrue(400 < sum(sampled) < 600)
+        self.assertFalse(self._payload_logger(sample_rate=0).is_sampled('request'))
+        self.assertTrue(self._payload_logger(sample_rate=1).is_sampled('request'))
+
+    def test_full_payloads_are_not_sampled_or_truncated(self):
+        payload_logger = self._payload_logger(sample_rate=0, max_chars=5, debug_entities=['restaurant'])
+        payload_logger.info('res_list', 'abcdefghij')
+        self.logger.log.assert_not_called()
+        payload_logger.info('res_list', 'abcdefghij', full=payload_logger.debug_entities_in(['restaurant', 'city']))
+        self.logger.log.assert_called_once_with(logging.INFO, 'res_list', payload='abcdefghij')
+        self.assertFalse(payload_logger.debug_entities_in(['city']))
@@ -0,0 +1,94 @@
+import json
+
+import structlog
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import re_path
+
+from chatbot_ner import settings_detection, urls_detection
+from chatbot_ner.config import ner_logger
+from chatbot_ner.route_table import RouteTableASGIHandler, RouteTableWSGIHandler, build_route_table
+from ner_v2 import api as api_v2
+
+
+def _view(request):
+    pass
+
+
+def _request_id_view(request):
+    return HttpResponse(structlog.get_context(ner_logger.bind()).get('request_id') or '')
+
+
+class RouteTableTest(SimpleTestCase):
+
+    def test_build_route_table(self):
+        routes = build_route_table([
+            re_path(r'^v2/number/$', _view, name='first'),
+            re_path(r'^v2/number/$', _view, name='second'),
+            re_path(r'^api\.v1/ping-pong/$', _view),
+            re_path(r'^v2/num.er/$', _view),
+            re_path(r'^entities/data/v1/(?P<entity_name>.+)$', _view),
+            re_path(r'^entities/update_dictionary', _view),
+        ])
+        self.assertEqual(sorted(routes), ['/api.v1/ping-pong/', '/v2/number/'])
+        self.assertEqual(routes['/v2/number/'].name, 'first')
+
+    def test_all_detection_routes_are_in_the_route_table(self):
+        self.assertEqual(len(build_route_table(urls_detection.urlpatterns)), len(urls_detection.urlpatterns))
+
+    def test_resolve_request(self):
+        handler = RouteTableWSGIHandler()
+        request_factory = RequestFactory()
+
+        resolver_match = handler.resolve_request(request_factory.get('/v2/number_bulk/'))
+        self.assertIs(resolver_match.func, api_v2.number)
+        self.assertEqual(resolver_match.route, r'^v2/number_bulk/$')
+
+        resolver_match = handler.resolve_request(request_factory.get('/entities/data/v1/city'))
+        self.assertEqual(resolver_match.kwargs, {'entity_name': 'city'})
+
+    def test_detect_through_handler(self):
+        handler = RouteTableWSGIHandler()
+        environ = RequestFactory().get('/v2/number/', {'message': 'i want 5 apples', 'entity_name': 'number'}).environ
+        status = []
+        body = b''.join(handler(environ, lambda status_line, headers: status.append(status_line)))
+        self.assertEqual(status, ['200 OK'])
+        self.assertEqual(json.loads(body.decode('utf-8'))['data'][0]['entity_value']['value'], '5')
+
+    @override_settings(MIDDLEWARE=[])
+    def test_request_id_is_bound_without_middleware(self):
+        handler = RouteTableWSGIHandler()
+        handler.routes['/request_id/'] = re_path(r'^request_id/$', _request_id_view)
+        request_factory = RequestFactory()
+
+        body = b''.join(handler(request_factory.get('/request_id/', HTTP_X_REQUEST_ID='abc').environ,
+                                lambda status_line, headers: None))
+        self.assertEqual(body, b'abc')
+        body = b''.join(handler(request_factory.get('/request_id/').environ, lambda status_line, headers: None))
+        self.assertTrue(body)
+        self.assertNotIn('request_id', structlog.get_context(ner_logger.bind()))
+
+    @override_settings(ROOT_URLCONF='chatbot_ner.urls_async')
+    async def test_detect_through_asgi_handler(self):
+        handler = RouteTableASGIHandler()
+        self.assertIn('/v2/number/', handler.routes)
+        scope = {'type': 'http', 'method': 'GET', 'path': '/v2/number/', 'headers': [],
+                 'query_string': b'message=i+want+5+apples&entity_name=number'}
+        messages = []
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            messages.append(message)
+
+        await handler(scope, receive, send)
+        self.assertEqual(messages[0]['status'], 200)
+        body = b''.join(message.get('body', b'') for message in messages[1:])
+        self.assertEqual(json.loads(body.decode('utf-8'))['data'][0]['entity_value']['value'], '5')
+
+    def test_detection_settings(self):
+        self.assertNotIn('django.contrib.sessions', settings_detection.INSTALLED_APPS)
+        self.assertIn('ner_v2', settings_detection.INSTALLED_APPS)
+        self.assertFalse([middleware for middleware in settings_detection.MIDDLEWARE
+                          if not middleware.startswith('elasticapm.')])